@@ -0,0 +1,107 @@
+"""デバッグウィンドウの起動時間ベンチマークスクリプト
+
+``n_line.gui.debug_window`` と各タブモジュールの読み込み時間（新しい
+インタープリタでのコールドインポート）と、DebugWindowを開いてから
+表示されるまでの時間、各タブの初回構築時間を計測します。
+
+使用方法:
+    python scripts/bench_debug_window.py [--repeat 5] [--skip-open]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from n_line.gui.debug_window import TABS  # noqa: E402
+
+# WindowsでUTF-8出力を保証するための設定
+if sys.platform == "win32":
+    import io
+
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+IMPORT_SNIPPET = (
+    "import sys, time; sys.path.insert(0, {src!r}); t = time.perf_counter(); "
+    "import {module}; print(time.perf_counter() - t)"
+)
+
+
+def cold_import(module: str, repeat: int) -> float:
+    """新しいインタープリタでモジュールを読み込み、中央値（ミリ秒）を返す"""
+    samples = []
+    for _ in range(repeat):
+        code = IMPORT_SNIPPET.format(src=str(PROJECT_ROOT / "src"), module=module)
+        proc = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=False
+        )
+        if proc.returncode != 0:
+            return float("nan")
+        samples.append(float(proc.stdout.strip()) * 1000)
+    return statistics.median(samples)
+
+
+def bench_imports(repeat: int) -> None:
+    """モジュールごとのコールドインポート時間を表示"""
+    print(f"Cold import time (median of {repeat}, fresh interpreter):")
+    modules = ["n_line.gui.debug_window"] + [module for _, _, module, _ in TABS]
+    for module in modules:
+        elapsed = cold_import(module, repeat)
+        label = "failed (missing dependency?)" if elapsed != elapsed else f"{elapsed:8.1f} ms"
+        print(f"  {module:<36} {label}")
+
+
+def bench_open() -> None:
+    """DebugWindowの表示までの時間と各タブの初回構築時間を表示"""
+    import customtkinter
+
+    from n_line.gui.debug_window import DebugWindow
+
+    root = customtkinter.CTk()
+    root.withdraw()
+
+    start = time.perf_counter()
+    window = DebugWindow(root)
+    created = time.perf_counter() - start
+    while not window.winfo_viewable():
+        root.update()
+    visible = time.perf_counter() - start
+
+    print("\nDebugWindow:")
+    print(f"  constructor                          {created * 1000:8.1f} ms")
+    print(f"  visible                              {visible * 1000:8.1f} ms")
+
+    print("\nFirst build per tab:")
+    for name, _, _, _ in TABS:
+        start = time.perf_counter()
+        window.tab_view.set(name)
+        window.ensure_tab(name)
+        root.update_idletasks()
+        print(f"  {name:<36} {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    window.on_closing()
+    root.destroy()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="DebugWindow startup benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-open", action="store_true", help="only measure imports")
+    args = parser.parse_args()
+
+    bench_imports(args.repeat)
+    if not args.skip_open:
+        try:
+            bench_open()
+        except Exception as e:
+            print(f"\nSkipped window benchmark: {e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""RPCデーモンの負荷試験スクリプト
+
+疑似バックエンド（``fake_handlers``）を使用するデーモンをプロセス内で起動し、
+複数のクライアントからパイプライン化した要求を送信してスループットと
+レイテンシを計測します。LINEやWin32 APIのないLinux環境でも実行できます。
+
+使用方法:
+    python scripts/bench_rpc_daemon.py [--clients 8] [--requests 2000] [--pipeline 16]
+    python scripts/bench_rpc_daemon.py --latency 0.005 --max-concurrency 4
+    python scripts/bench_rpc_daemon.py --port 48620   # 起動済みのデーモンに接続
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from n_line.core.resource_sampler import summarize  # noqa: E402
+from n_line.core.rpc_daemon import RpcClient, RpcDaemon, fake_handlers  # noqa: E402
+
+# WindowsでUTF-8出力を保証するための設定
+if sys.platform == "win32":
+    import io
+
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+MIX = [
+    ("line.status", {}),
+    ("window.find", {"pid": 1000}),
+    ("window.rect", {"hwnd": 0x10000}),
+    ("inspector.classes", {"pid": 1000}),
+]
+
+
+def start_daemon(latency: float, max_concurrency: int) -> Tuple[int, str]:
+    """疑似バックエンドのデーモンを別スレッドで起動し、ポート番号とトークンを返す"""
+    ready = threading.Event()
+    holder = {}
+
+    def serve() -> None:
+        async def main() -> None:
+            daemon = RpcDaemon(fake_handlers(latency), port=0, max_concurrency=max_concurrency)
+            holder["port"] = (await daemon.start())[1]
+            holder["token"] = daemon.token
+            ready.set()
+            await daemon.serve_forever()
+
+        asyncio.run(main())
+
+    threading.Thread(target=serve, name="rpc-daemon", daemon=True).start()
+    ready.wait(5.0)
+    return holder["port"], holder["token"]
+
+
+def run_client(
+    port: int, token: str, requests: int, pipeline: int, latencies: list, errors: list
+) -> None:
+    """1クライアント分の要求を送信し、バッチごとのレイテンシを記録"""
+    try:
+        with RpcClient(port=port, token=token) as client:
+            sent = 0
+            while sent < requests:
+                batch = [MIX[(sent + i) % len(MIX)] for i in range(min(pipeline, requests - sent))]
+                start = time.perf_counter()
+                client.call_many(batch)
+                latencies.append((time.perf_counter() - start) / len(batch))
+                sent += len(batch)
+    except Exception as e:
+        errors.append(e)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="RPC daemon load test")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per client")
+    parser.add_argument("--pipeline", type=int, default=16, help="requests per batch")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated handler latency")
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=0, help="connect to a running daemon")
+    args = parser.parse_args()
+
+    if args.port:
+        # 起動済みのデーモンにはN_LINE_RPC_TOKENまたは保存されたトークンで接続する
+        port, token = args.port, None
+    else:
+        port, token = start_daemon(args.latency, args.max_concurrency)
+    total = args.clients * args.requests
+    print(
+        f"Clients: {args.clients}, requests/client: {args.requests}, "
+        f"pipeline: {args.pipeline}, port: {port}\n"
+    )
+
+    latencies: list = []
+    errors: list = []
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(port, token, args.requests, args.pipeline, latencies, errors),
+        )
+        for _ in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    if errors:
+        print(f"エラー: {len(errors)} client(s) failed: {errors[0]}")
+        return 1
+
+    stats = summarize(latencies)
+    print(f"  throughput            {total / elapsed:10.0f} req/s")
+    print(f"  mean latency/request  {stats['mean'] * 1000:10.3f} ms")
+    print(f"  p95 latency/request   {stats['p95'] * 1000:10.3f} ms\n")
+
+    with RpcClient(port=port, token=token) as client:
+        metrics = client.call("metrics")
+    print("Server-side metrics:")
+    for name, m in metrics["methods"].items():
+        print(
+            f"  {name:<20} calls={m['calls']:<7} errors={m['errors']:<3} "
+            f"p50={m['p50_ms']:.3f}ms p95={m['p95_ms']:.3f}ms max={m['max_ms']:.3f}ms"
+        )
+    print(f"\n✓ {total} requests in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
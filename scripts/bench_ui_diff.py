@@ -0,0 +1,82 @@
+"""UIツリー差分のベンチマークスクリプト
+
+疑似バックエンド（``FakeBackend``）上に指定した要素数のUIツリーを生成し、
+要素の追加・削除・移動・名前の変更を加えた前後のスナップショットを
+``diff_snapshots`` で比較する所要時間を計測します。
+要素数を変えて実行し、所要時間が要素数にほぼ比例することを確認できます。
+
+使用方法:
+    python scripts/bench_ui_diff.py [--nodes 25000,50000,100000] [--changes 100]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from n_line.core.backend import FakeBackend, FakeControl, set_backend  # noqa: E402
+from n_line.core.ui_diff import diff_snapshots  # noqa: E402
+from n_line.core.ui_inspector import UIInspector  # noqa: E402
+
+# WindowsでUTF-8出力を保証するための設定
+if sys.platform == "win32":
+    import io
+
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+
+def mutate(backend: FakeBackend, root: FakeControl, changes: int, seed: int) -> None:
+    """UIツリーに追加・削除・移動・名前の変更をそれぞれ ``changes`` 件ずつ加える"""
+    rnd = random.Random(seed)
+    controls = list(root.iter_subtree())[1:]
+    containers = [c for c in controls if c._children]
+    leaves = [c for c in controls if not c._children]
+    picked = rnd.sample(leaves, changes * 3)
+
+    for control in picked[:changes]:  # 削除
+        control._parent.remove_child(control)
+    for control in picked[changes : changes * 2]:  # 別の親の下へ移動
+        control._parent.remove_child(control)
+        rnd.choice(containers).add_child(control)
+    for i, control in enumerate(picked[changes * 2 :]):  # 名前の変更
+        control._name = f"Renamed_{i}"
+    for i in range(changes):  # 追加
+        rnd.choice(containers).add_child(
+            FakeControl(backend, "ButtonControl", "QPushButton", f"Added_{i}", pid=root._pid)
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="UI snapshot diff benchmark on the fake backend")
+    parser.add_argument("--nodes", default="25000,50000,100000", help="comma-separated tree sizes")
+    parser.add_argument("--changes", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>8} {'diff':>10} {'per node':>10}  result")
+    for nodes in [int(n) for n in args.nodes.split(",") if n]:
+        backend = FakeBackend()
+        proc, _ = backend.add_line_app(nodes=nodes, seed=args.seed)
+        set_backend(backend)
+        old = UIInspector.take_snapshot(proc.pid, max_nodes=None)
+        mutate(backend, UIInspector.find_app_window(proc.pid), args.changes, args.seed)
+        new = UIInspector.take_snapshot(proc.pid, max_nodes=None)
+
+        start = time.perf_counter()
+        diff = diff_snapshots(old, new)
+        elapsed = time.perf_counter() - start
+        s = diff.summary()
+        print(
+            f"{nodes:>8} {elapsed * 1000:8.1f}ms {elapsed / nodes * 1e6:8.2f}us  "
+            f"+{s['added']} -{s['removed']} >{s['moved']} ~{s['changed']}"
+        )
+    print("\n✓ 完了")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""UIツリー走査のベンチマークスクリプト
+
+疑似バックエンド（``FakeBackend``）上に指定した要素数のUIツリーを生成し、
+UIInspectorの走査処理の所要時間とAPI呼び出し回数を計測します。
+``--workers`` で指定したスレッド数ごとに並列走査の所要時間も計測します。
+LINEやWindowsのない環境でも実行できます。
+
+使用方法:
+    python scripts/bench_ui_tree.py [--nodes 20000] [--fanout 8] [--latency 0]
+    python scripts/bench_ui_tree.py --nodes 50000 --latency 0.00001 --repeat 1
+    python scripts/bench_ui_tree.py --nodes 5000 --latency 0.0001 --workers 1,2,4,8
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from n_line.core.backend import FakeBackend, set_backend  # noqa: E402
+from n_line.core.ui_inspector import UIInspector  # noqa: E402
+
+# WindowsでUTF-8出力を保証するための設定
+if sys.platform == "win32":
+    import io
+
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+
+def bench(label: str, func, backend: FakeBackend, repeat: int) -> float:
+    """関数をrepeat回実行し、最短時間（ミリ秒）とAPI呼び出し回数を表示"""
+    best = float("inf")
+    calls = 0
+    for _ in range(repeat):
+        backend.reset_calls()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+        calls = backend.calls
+    print(f"  {label:<32} {best * 1000:10.1f} ms {calls:>10} calls")
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="UI tree walk benchmark on the fake backend")
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per API call")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workers", default="1,4", help="comma-separated worker counts for take_snapshot"
+    )
+    args = parser.parse_args()
+
+    backend = FakeBackend(latency=args.latency)
+    proc, _ = backend.add_line_app(nodes=args.nodes, fanout=args.fanout, seed=args.seed)
+    set_backend(backend)
+
+    print(
+        f"Synthetic UI tree: {args.nodes} nodes, fanout {args.fanout}, "
+        f"latency {args.latency * 1e6:.0f} us/call\n"
+    )
+    bench(
+        "get_unique_style_classes",
+        lambda: UIInspector.get_unique_style_classes(proc.pid),
+        backend,
+        args.repeat,
+    )
+    bench(
+        "get_extensive_ui_tree",
+        lambda: UIInspector.get_extensive_ui_tree(proc.pid),
+        backend,
+        args.repeat,
+    )
+
+    print()
+    baseline = None
+    for workers in [int(w) for w in args.workers.split(",") if w]:
+        elapsed = bench(
+            f"take_snapshot (workers={workers})",
+            lambda w=workers: UIInspector.take_snapshot(proc.pid, workers=w),
+            backend,
+            args.repeat,
+        )
+        if baseline is None:
+            baseline = elapsed
+        else:
+            print(f"  {'':<32} {baseline / elapsed:10.1f} x")
+    print("\n✓ 完了")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""n_line.core のインポート時間をチェックするスクリプト
+
+新しいインタープリタで ``n_line.core`` のヘッドレスなモジュール（GUI・Win32 APIに
+依存しないもの）を読み込み、その時間（中央値）が予算を超えていないか確認します。
+予算を超えた場合は終了コード1を返します。
+
+使用方法:
+    python scripts/check_import_time.py [--budget-ms 250] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# WindowsでUTF-8出力を保証するための設定
+if sys.platform == "win32":
+    import io
+
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+# GUI・Win32 APIに依存しないモジュール（Win32 APIはbackend経由で遅延読み込み）
+CORE_MODULES = [
+    "n_line.core.line_manager",
+    "n_line.core.debug_tools",
+    "n_line.core.process_watcher",
+    "n_line.core.resource_sampler",
+    "n_line.core.leak_detector",
+    "n_line.core.cache_quota",
+    "n_line.core.startup_bench",
+    "n_line.core.aio",
+    "n_line.core.window_manipulator",
+    "n_line.core.ui_inspector",
+    "n_line.core.automation_manager",
+    "n_line.cli",
+]
+
+# これらが読み込まれていた場合はGUI側の依存が混入している
+FORBIDDEN_MODULES = ["customtkinter", "tkinter", "uiautomation", "keyboard", "win32gui"]
+
+SNIPPET = """
+import sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+leaked = [m for m in {forbidden!r} if m in sys.modules]
+print(elapsed, ",".join(leaked))
+"""
+
+
+def measure_once() -> tuple:
+    """新しいインタープリタで1回計測し、(秒, 混入したモジュール) を返す"""
+    code = SNIPPET.format(
+        src=str(PROJECT_ROOT / "src"), modules=CORE_MODULES, forbidden=FORBIDDEN_MODULES
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    elapsed, _, leaked = proc.stdout.strip().partition(" ")
+    return float(elapsed), [m for m in leaked.split(",") if m]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the cold import time of n_line.core")
+    parser.add_argument("--budget-ms", type=float, default=250.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{len(CORE_MODULES)}個のモジュールのコールドインポート時間を計測中...\n")
+    samples = []
+    leaked: list = []
+    try:
+        for _ in range(args.repeat):
+            elapsed, leaked = measure_once()
+            samples.append(elapsed * 1000)
+    except RuntimeError as e:
+        print(f"エラー: インポートに失敗しました: {e}")
+        return 1
+
+    median = statistics.median(samples)
+    print(f"  中央値: {median:.1f} ms（最小 {min(samples):.1f} / 最大 {max(samples):.1f}）")
+    print(f"  予算:   {args.budget_ms:.1f} ms\n")
+
+    failed = False
+    if leaked:
+        print(f"エラー: GUI側のモジュールが読み込まれています: {', '.join(leaked)}")
+        failed = True
+    if median > args.budget_ms:
+        print("エラー: インポート時間が予算を超えています")
+        print("   python -X importtime -c \"import n_line.cli\" で原因を確認してください")
+        failed = True
+    if failed:
+        return 1
+
+    print("✓ インポート時間は予算内です")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,68 @@
-"""N-LINE エントリーポイント"""
-from n_line.gui.app import NLineApp
+"""N-LINE エントリーポイント
 
+引数なしで実行するとGUIを起動し、サブコマンドを指定すると
+GUIを読み込まずに ``n_line.cli`` で処理します。
+``--profile-startup`` を指定すると起動プロファイリングを有効にします。
 
-def main() -> None:
-    """メイン関数"""
-    app = NLineApp()
+N-LINEが既に起動している場合、GUIの起動と一部のコマンド（status / launch / kill）は
+実行中のインスタンスに転送され、単独で実行した場合と同じ結果と終了コードを返します。``--new-instance`` で転送せずに実行します。
+"""
+import json
+import sys
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """メイン関数
+
+    Args:
+        argv: コマンドライン引数。省略時は ``sys.argv[1:]``
+
+    Returns:
+        終了コード
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Enable before any other n_line import so the whole timeline is recorded
+    from n_line.core import startup_profiler
+
+    argv = startup_profiler.enable_from_args(argv)
+    new_instance = "--new-instance" in argv
+    argv = [arg for arg in argv if arg != "--new-instance"]
+
+    if not new_instance:
+        from n_line.core import single_instance
+
+        command = argv[0] if argv else "show"
+        if command in single_instance.FORWARDED_COMMANDS:
+            timeout = single_instance.FORWARD_TIMEOUT
+            if argv:
+                from n_line.cli import build_parser
+
+                # 引数の誤りは転送前に単独実行と同じエラー（終了コード2）にする。
+                # 転送先は操作の完了を待ってから応答するため、その分だけ待つ
+                args = build_parser().parse_args(argv)
+                timeout = max(single_instance.OPERATION_TIMEOUT, getattr(args, "timeout", 0.0) * 2)
+            reply = single_instance.send_command(command, argv[1:], timeout=timeout)
+            if reply is not None:
+                if argv:
+                    reply["forwarded"] = True
+                    print(json.dumps(reply, ensure_ascii=False))
+                return 0 if reply.get("success") else 1
+
+    if argv:
+        from n_line.cli import main as cli_main
+
+        return cli_main(argv)
+
+    from n_line.gui.app import NLineApp
+
+    app = NLineApp(single_instance=not new_instance)
     app.protocol("WM_DELETE_WINDOW", app.on_closing)
     app.mainloop()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
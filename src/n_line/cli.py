@@ -0,0 +1,308 @@
+"""コマンドラインインターフェースモジュール
+
+GUIを起動せずにLINEを操作するサブコマンドを提供するモジュールです。
+各サブコマンドは必要な ``n_line.core`` モジュールのみを実行時に読み込み、
+customtkinterやuiautomationなどGUI側の依存は読み込みません。
+結果はすべてJSONで標準出力に出力されます。
+
+実行例:
+    n-line status
+    n-line relaunch --args="--remote-debugging-port=9222"
+    n-line proc-stats --duration 3
+    n-line leak-watch --relaunch-delay 600
+    n-line daemon --port 48620
+"""
+import argparse
+import json
+import os
+import shlex
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _message_result(message: str) -> Dict[str, Any]:
+    """``Success: ...`` / ``Error: ...`` 形式のメッセージを結果辞書に変換"""
+    return {"success": not message.startswith("Error"), "message": message}
+
+
+def cmd_status(args: argparse.Namespace) -> Dict[str, Any]:
+    """LINEの実行状態を取得"""
+    from n_line.core.line_manager import LineManager
+
+    procs = LineManager.get_line_processes(use_cache=False)
+    return {
+        "success": True,
+        "running": bool(procs),
+        "pids": [p.pid for p in procs],
+        "install_path": LineManager.get_install_path(),
+    }
+
+
+def cmd_launch(args: argparse.Namespace) -> Dict[str, Any]:
+    """LINEを起動"""
+    from n_line.core.line_manager import LineManager
+
+    return _message_result(LineManager.launch_line())
+
+
+def cmd_kill(args: argparse.Namespace) -> Dict[str, Any]:
+    """LINEと子プロセスを終了"""
+    from n_line.core.line_manager import LineManager
+
+    result = LineManager.shutdown_line(timeout=args.timeout)
+    if result is None:
+        return {"success": True, "message": "LINE is not running."}
+    result["success"] = not result["remaining"]
+    return result
+
+
+def cmd_relaunch(args: argparse.Namespace) -> Dict[str, Any]:
+    """LINEを指定された引数で再起動"""
+    from n_line.core.line_manager import LineManager
+
+    line_args = shlex.split(args.args, posix=os.name != "nt") if args.args else []
+    return LineManager.relaunch_line(line_args, timeout=args.timeout)
+
+
+def cmd_clear_cache(args: argparse.Namespace) -> Dict[str, Any]:
+    """LINEのキャッシュをクリア"""
+    from n_line.core.line_manager import LineManager
+
+    report = LineManager.clear_cache_report(dry_run=args.dry_run)
+    report["success"] = not report["message"].startswith("Error")
+    return report
+
+
+def cmd_scan_dirs(args: argparse.Namespace) -> Dict[str, Any]:
+    """LINE関連のディレクトリをスキャン"""
+    from n_line.core.debug_tools import DebugTools
+
+    return {"success": True, "directories": DebugTools.scan_line_directories()}
+
+
+def cmd_proc_stats(args: argparse.Namespace) -> Dict[str, Any]:
+    """LINEプロセスのリソース使用量を一定時間サンプリング"""
+    import psutil
+
+    from n_line.core.line_manager import LineManager
+    from n_line.core.resource_sampler import METRICS, ResourceSampler
+
+    sampler = ResourceSampler(interval=args.interval)
+    # 1回目は基準値の取得のみ。以降の差分からCPU使用率を求める
+    sampler.sample_once()
+    deadline = time.monotonic() + max(args.duration, args.interval)
+    while time.monotonic() < deadline:
+        time.sleep(args.interval)
+        sampler.sample_once()
+
+    processes = []
+    for proc in LineManager.get_line_processes():
+        entry: Dict[str, Any] = {"pid": proc.pid}
+        try:
+            entry["name"] = proc.name()
+            entry["cmdline"] = proc.cmdline()
+            entry["create_time"] = proc.create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+        if proc.pid in sampler.pids():
+            entry["latest"] = sampler.latest(proc.pid)
+            entry["stats"] = {m: sampler.stats(proc.pid, m) for m in METRICS}
+        processes.append(entry)
+    return {"success": True, "duration": args.duration, "processes": processes}
+
+
+def cmd_leak_watch(args: argparse.Namespace) -> Dict[str, Any]:
+    """RSS・ハンドル数の継続的な増加を監視（Ctrl+Cまたは ``--duration`` で終了）
+
+    検出するたびに1行のJSONを出力し、``--relaunch-delay`` が指定された場合は
+    検出時点の起動引数でLINEの再起動を予約します。
+    """
+    import math
+
+    from n_line.core.leak_detector import LeakDetector, ScheduledRelaunch
+    from n_line.core.resource_sampler import ResourceSampler
+
+    windows = [float(w) for w in args.windows.split(",") if w]
+    # 最長の判定期間を保持できる容量のサンプラーを使用する
+    sampler = ResourceSampler(
+        interval=args.sample_interval,
+        capacity=math.ceil(max(windows) / args.sample_interval) + 1,
+    )
+    action = None
+    if args.relaunch_delay is not None:
+        action = ScheduledRelaunch(delay=args.relaunch_delay)
+    detector = LeakDetector(sampler=sampler, windows=windows, action=action)
+
+    detections = 0
+    deadline = time.monotonic() + args.duration if args.duration else None
+    sampler.start()
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            wait = args.check_interval
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            time.sleep(wait)
+            findings = detector.check()
+            if findings:
+                detections += 1
+                event = {
+                    "event": "leak",
+                    "time": time.time(),
+                    "findings": findings,
+                    "relaunch_pending": bool(action and action.pending),
+                }
+                print(json.dumps(event, ensure_ascii=False, default=str))
+                sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sampler.stop()
+        if action:
+            action.cancel()
+
+    return {
+        "success": True,
+        "detections": detections,
+        "findings": detector.last_findings,
+        "relaunch": action.last_message if action else None,
+    }
+
+
+def cmd_daemon(args: argparse.Namespace) -> Dict[str, Any]:
+    """RPCデーモンとして常駐（Ctrl+Cで終了）
+
+    トークンが指定されていない場合は生成し、本人だけが読めるファイルに保存します
+    （保存先を ``token_file`` として出力）。
+    """
+    from n_line.core import rpc_daemon
+
+    token = args.token or os.environ.get(rpc_daemon.TOKEN_ENV_VAR)
+    token_file = None if token else rpc_daemon.default_token_file()
+
+    def on_ready(host: str, port: int) -> None:
+        ready = {"success": True, "host": host, "port": port, "fake": args.fake}
+        print(json.dumps({**ready, "token_file": token_file}))
+        sys.stdout.flush()
+
+    rpc_daemon.run(
+        host=args.host,
+        port=args.port,
+        max_concurrency=args.max_concurrency,
+        fake=args.fake,
+        latency=args.latency,
+        token=token,
+        on_ready=on_ready,
+    )
+    return {"success": True, "message": "Success: Daemon stopped"}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """引数パーサーを作成
+
+    Returns:
+        サブコマンドを登録したArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog="n-line",
+        description="N-LINE command line interface. Run without a command to open the GUI.",
+    )
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    p = sub.add_parser("status", help="show whether LINE is running")
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("launch", help="launch LINE")
+    p.set_defaults(func=cmd_launch)
+
+    p = sub.add_parser("kill", help="terminate LINE and its child processes")
+    p.add_argument("--timeout", type=float, default=3.0)
+    p.set_defaults(func=cmd_kill)
+
+    p = sub.add_parser("relaunch", help="restart LINE with the given arguments")
+    p.add_argument("--args", default="", help='arguments for LINE, e.g. --args="--foo --bar=1"')
+    p.add_argument("--timeout", type=float, default=5.0)
+    p.set_defaults(func=cmd_relaunch)
+
+    p = sub.add_parser("clear-cache", help="delete the LINE cache directory")
+    p.add_argument("--dry-run", action="store_true")
+    p.set_defaults(func=cmd_clear_cache)
+
+    p = sub.add_parser("scan-dirs", help="list files in the LINE install and data directories")
+    p.set_defaults(func=cmd_scan_dirs)
+
+    p = sub.add_parser("proc-stats", help="sample CPU/memory/thread/I/O usage of LINE")
+    p.add_argument("--duration", type=float, default=1.0, help="sampling period in seconds")
+    p.add_argument("--interval", type=float, default=0.5)
+    p.set_defaults(func=cmd_proc_stats)
+
+    p = sub.add_parser("leak-watch", help="watch LINE for sustained RSS/handle growth")
+    p.add_argument("--sample-interval", type=float, default=10.0, help="seconds between samples")
+    p.add_argument("--check-interval", type=float, default=60.0, help="seconds between checks")
+    p.add_argument("--windows", default="900,3600", help="comma-separated windows in seconds")
+    p.add_argument(
+        "--relaunch-delay",
+        type=float,
+        default=None,
+        help="relaunch LINE with its current arguments this many seconds after a detection",
+    )
+    p.add_argument("--duration", type=float, default=0.0, help="stop after N seconds (0: Ctrl+C)")
+    p.set_defaults(func=cmd_leak_watch)
+
+    p = sub.add_parser("daemon", help="serve n_line.core over length-prefixed JSON on localhost")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=48620, help="0 picks a free port")
+    p.add_argument("--max-concurrency", type=int, default=8)
+    p.add_argument(
+        "--token",
+        default=None,
+        help="required token (or N_LINE_RPC_TOKEN); generated into a user-only file if omitted",
+    )
+    p.add_argument("--fake", action="store_true", help="use fake backends (no LINE/Win32)")
+    p.add_argument("--latency", type=float, default=0.0, help="simulated latency with --fake")
+    p.set_defaults(func=cmd_daemon)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """サブコマンドを実行
+
+    Args:
+        argv: コマンドライン引数。省略時は ``sys.argv[1:]``
+
+    Returns:
+        終了コード（成功時は0、失敗時は1、引数エラーは2）
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "func", None) is None:
+        parser.print_help()
+        return 2
+
+    result = run(args)
+    print(json.dumps(result, ensure_ascii=False, default=str))
+    return 0 if result.get("success") else 1
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """解析済みの引数でサブコマンドを実行
+
+    実行中のGUIに転送されたコマンドもこの関数で実行するため、
+    結果の形式は単独で実行した場合と同じです。
+
+    Args:
+        args: ``build_parser()`` で解析した引数
+
+    Returns:
+        結果の辞書（例外が発生した場合は ``success`` がFalseの辞書）
+    """
+    func: Callable[[argparse.Namespace], Dict[str, Any]] = args.func
+    try:
+        return func(args)
+    except Exception as e:
+        return {"success": False, "message": f"Error: {e}"}
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""非同期APIモジュール
+
+LineManager、DebugTools、WindowManipulator、UIInspectorのブロッキングな静的メソッドを、
+上限付きのスレッドプール上で実行されるコルーチンとして提供するモジュールです。
+すべての操作はタイムアウトとキャンセルに対応します。
+
+使用例:
+    details, dirs = await asyncio.gather(
+        AsyncDebugTools.get_line_process_details(),
+        AsyncDebugTools.scan_line_directories(),
+    )
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .cache_cleaner import ProgressCallback
+from .debug_tools import DebugTools
+from .line_manager import LineManager
+
+MAX_WORKERS = 4
+"""ブロッキング処理に使用するスレッド数の上限"""
+
+DEFAULT_TIMEOUT = 30.0
+"""操作ごとの既定のタイムアウト（秒）"""
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """共有スレッドプールを取得（初回呼び出し時に作成）
+
+    Returns:
+        最大 ``MAX_WORKERS`` スレッドのThreadPoolExecutor
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_WORKERS, thread_name_prefix="n-line-aio"
+            )
+        return _executor
+
+
+async def run_blocking(
+    func: Callable[..., Any],
+    *args: Any,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    **kwargs: Any,
+) -> Any:
+    """ブロッキング関数を共有スレッドプールで実行
+
+    キャンセルやタイムアウトが発生しても実行中のスレッドは停止できないため、
+    中断に対応する処理は ``cancel_event`` などを別途受け取ります。
+
+    Args:
+        func: 実行する関数
+        *args: 関数の位置引数
+        timeout: タイムアウト（秒）。Noneの場合は無制限
+        **kwargs: 関数のキーワード引数
+
+    Returns:
+        関数の戻り値
+
+    Raises:
+        asyncio.TimeoutError: タイムアウトした場合
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+    return await asyncio.wait_for(future, timeout)
+
+
+class AsyncLineManager:
+    """LineManagerの非同期版"""
+
+    @staticmethod
+    async def is_line_running(timeout: Optional[float] = DEFAULT_TIMEOUT) -> bool:
+        return await run_blocking(LineManager.is_line_running, timeout=timeout)
+
+    @staticmethod
+    async def launch_line(timeout: Optional[float] = DEFAULT_TIMEOUT) -> str:
+        return await run_blocking(LineManager.launch_line, timeout=timeout)
+
+    @staticmethod
+    async def kill_line(timeout: Optional[float] = DEFAULT_TIMEOUT) -> bool:
+        return await run_blocking(LineManager.kill_line, timeout=timeout)
+
+    @staticmethod
+    async def shutdown_line(
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+    ) -> Optional[Dict[str, Any]]:
+        return await run_blocking(LineManager.shutdown_line, timeout=timeout)
+
+    @staticmethod
+    async def relaunch_line(
+        args: List[str], timeout: Optional[float] = DEFAULT_TIMEOUT
+    ) -> Dict[str, Any]:
+        return await run_blocking(LineManager.relaunch_line, args, timeout=timeout)
+
+    @staticmethod
+    async def get_install_path(timeout: Optional[float] = DEFAULT_TIMEOUT) -> Optional[str]:
+        return await run_blocking(LineManager.get_install_path, timeout=timeout)
+
+    @staticmethod
+    async def clear_cache(
+        dry_run: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        timeout: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> str:
+        """キャッシュをクリア
+
+        キャンセルまたはタイムアウトした場合は削除処理に中断を通知します。
+        コルーチンのキャンセルは削除スレッドの終了を待たないため、削除が
+        止まるまで待つ場合は ``cancel_event`` をセットして完了を待ちます。
+
+        Args:
+            dry_run: Trueの場合は削除せず、解放されるサイズのみ集計
+            progress_callback: 進捗を報告する関数（ワーカースレッドから呼ばれる）
+            timeout: タイムアウト（秒）。Noneの場合は無制限
+            cancel_event: セットされると削除を中断するイベント
+
+        Returns:
+            処理結果を示すメッセージ
+        """
+        cancel_event = cancel_event or threading.Event()
+        try:
+            return await run_blocking(
+                LineManager.clear_cache,
+                dry_run=dry_run,
+                progress_callback=progress_callback,
+                cancel_event=cancel_event,
+                timeout=timeout,
+            )
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            cancel_event.set()
+            raise
+
+
+class AsyncDebugTools:
+    """DebugToolsの非同期版"""
+
+    @staticmethod
+    async def get_system_info(timeout: Optional[float] = DEFAULT_TIMEOUT) -> Dict[str, str]:
+        return await run_blocking(DebugTools.get_system_info, timeout=timeout)
+
+    @staticmethod
+    async def get_line_process_details(
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+    ) -> List[Dict[str, Any]]:
+        return await run_blocking(DebugTools.get_line_process_details, timeout=timeout)
+
+    @staticmethod
+    async def scan_line_directories(
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+    ) -> Dict[str, List[str]]:
+        return await run_blocking(DebugTools.scan_line_directories, timeout=timeout)
+
+    @staticmethod
+    async def get_resource_stats(
+        window: Optional[float] = 60.0, timeout: Optional[float] = DEFAULT_TIMEOUT
+    ) -> Dict[int, Dict[str, Any]]:
+        return await run_blocking(DebugTools.get_resource_stats, window, timeout=timeout)
+
+    @staticmethod
+    async def scan_disk_usage(
+        full: bool = False, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        return await run_blocking(DebugTools.scan_disk_usage, full=full, timeout=timeout)
+
+
+class AsyncWindowManipulator:
+    """WindowManipulatorの非同期版
+
+    Win32 APIに依存するため、モジュールは最初の呼び出し時に読み込みます。
+    """
+
+    @staticmethod
+    async def find_process_window(
+        pid: int, timeout: Optional[float] = DEFAULT_TIMEOUT
+    ) -> int:
+        from .window_manipulator import WindowManipulator
+
+        return await run_blocking(WindowManipulator.find_process_window, pid, timeout=timeout)
+
+    @staticmethod
+    async def find_main_window(timeout: Optional[float] = DEFAULT_TIMEOUT) -> int:
+        from .window_manipulator import WindowManipulator
+
+        return await run_blocking(WindowManipulator.find_main_window, timeout=timeout)
+
+
+class AsyncUIInspector:
+    """UIInspectorの非同期版
+
+    UI Automationはスレッドごとに初期化が必要なため、ワーカースレッド上で
+    ``UIAutomationInitializerInThread`` の中で実行します。
+    """
+
+    @staticmethod
+    async def get_snapshot(
+        pid: int,
+        max_age: float = 10.0,
+        cancel_event: Optional[threading.Event] = None,
+        **limits: Any,
+    ) -> Any:
+        """スナップショットを取得
+
+        コルーチンがキャンセルされた場合は走査に中断を通知します。
+        ``cancel_event`` をセットした場合や時間の上限に達した場合は、途中までの結果
+        （``truncated`` が ``cancelled`` / ``timeout``）が返されます。
+
+        Args:
+            pid: プロセスID
+            max_age: この秒数以内のスナップショットがあれば再利用
+            cancel_event: 走査を中断するイベント。省略時は内部で作成
+            **limits: ``UIInspector.take_snapshot`` の ``max_depth`` / ``max_nodes`` / ``timeout`` / ``workers``
+
+        Returns:
+            UISnapshotインスタンス。ウィンドウが見つからない場合はNone
+        """
+        from .backend import get_backend
+        from .ui_inspector import UIInspector
+
+        event = cancel_event or threading.Event()
+
+        def scan() -> Any:
+            with get_backend().uia.UIAutomationInitializerInThread(debug=False):
+                return UIInspector.get_snapshot(pid, max_age, cancel_event=event, **limits)
+
+        try:
+            # 時間の上限は走査側で扱い、途中までの結果を返す
+            return await run_blocking(scan, timeout=None)
+        except asyncio.CancelledError:
+            event.set()
+            raise
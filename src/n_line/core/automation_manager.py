@@ -2,11 +2,11 @@
 
 UI Automationを使用してLINEアプリケーションのUI要素を操作する
 モジュールです。チャット入力欄へのテキスト入力や送信操作を提供します。
+UI AutomationとWin32 APIへのアクセスは ``backend.get_backend()`` を経由します。
 """
-from typing import Optional
+from typing import Any, Optional
 
-import uiautomation as auto
-import win32gui
+from .backend import get_backend
 
 
 class AutomationManager:
@@ -17,12 +17,13 @@ class AutomationManager:
     """
 
     @staticmethod
-    def _get_line_window() -> Optional[auto.WindowControl]:
+    def _get_line_window() -> Optional[Any]:
         """LINEのメインウィンドウを取得
 
         Returns:
             見つかったWindowControlオブジェクト。見つからない場合はNone
         """
+        auto = get_backend().uia
         window = auto.WindowControl(searchDepth=1, Name="LINE")
         if window.Exists(0, 0):
             return window
@@ -38,6 +39,7 @@ class AutomationManager:
         Returns:
             処理結果を示すメッセージ
         """
+        win32gui = get_backend().win32gui
         window = AutomationManager._get_line_window()
         if not window:
             return "Error: LINE window not found."
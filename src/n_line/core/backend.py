@@ -0,0 +1,1107 @@
+"""バックエンドモジュール
+
+Win32 API（``win32gui`` / ``win32process`` / ``win32con``）、UI Automation
+（``uiautomation``）、プロセステーブルへのアクセスを抽象化するモジュールです。
+実環境ではWindowsのモジュールを最初の使用時に読み込み、テストやベンチマークでは
+メモリ上の疑似ウィンドウテーブル・UIツリー・プロセステーブルに差し替えることができます。
+
+各モジュールは ``get_backend()`` から取得したオブジェクトの属性を、
+元のモジュールと同じ名前・引数で呼び出します::
+
+    win32gui = get_backend().win32gui
+    win32gui.EnumWindows(handler, None)
+
+環境変数 ``N_LINE_BACKEND`` に ``fake`` を設定すると、LINEを模した疑似環境で起動します。
+"""
+import importlib
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .process_source import FakeProcess, FakeProcessSource, ProcessSource, PsutilProcessSource
+
+ENV_VAR = "N_LINE_BACKEND"
+"""使用するバックエンド（``win32`` または ``fake``）を指定する環境変数"""
+
+FAKE_ROOT_ENV_VAR = "N_LINE_FAKE_ROOT"
+"""``FakeBackend`` が疑似LINEのインストール先などを作成するディレクトリを指定する環境変数"""
+
+DEFAULT_CLASSES = (
+    "QWidget",
+    "QLabel",
+    "QPushButton",
+    "QScrollArea",
+    "QListView",
+    "QStackedWidget",
+    "LcWidget",
+    "ChatPanel",
+    "AutoSuggestTextArea",
+    "QSplitter",
+)
+"""疑似UIツリーで使用するクラス名"""
+
+CONTROL_TYPES = {
+    "QLabel": "TextControl",
+    "QPushButton": "ButtonControl",
+    "QListView": "ListControl",
+    "QScrollArea": "PaneControl",
+    "AutoSuggestTextArea": "EditControl",
+}
+
+# UI Automationのプロパティ・定数（UIAutomationClient.h）
+UIA_BOUNDING_RECTANGLE = 30001
+UIA_PROCESS_ID = 30002
+UIA_CONTROL_TYPE = 30003
+UIA_NAME = 30005
+UIA_AUTOMATION_ID = 30011
+UIA_CLASS_NAME = 30012
+UIA_IS_INVOKE_PATTERN_AVAILABLE = 30031
+UIA_IS_TOGGLE_PATTERN_AVAILABLE = 30041
+UIA_IS_VALUE_PATTERN_AVAILABLE = 30043
+UIA_VALUE_VALUE = 30045
+UIA_IS_LEGACY_PATTERN_AVAILABLE = 30090
+UIA_LEGACY_NAME = 30092
+UIA_LEGACY_VALUE = 30093
+UIA_LEGACY_DESCRIPTION = 30094
+UIA_LEGACY_ROLE = 30095
+UIA_TREE_SCOPE_CHILDREN = 2
+
+ELEMENT_PROPERTIES = (
+    UIA_BOUNDING_RECTANGLE,
+    UIA_PROCESS_ID,
+    UIA_CONTROL_TYPE,
+    UIA_NAME,
+    UIA_AUTOMATION_ID,
+    UIA_CLASS_NAME,
+)
+"""``read_element`` / ``read_children`` が一括で読み取るプロパティ"""
+
+DETAIL_PROPERTIES = ELEMENT_PROPERTIES + (
+    UIA_IS_INVOKE_PATTERN_AVAILABLE,
+    UIA_IS_TOGGLE_PATTERN_AVAILABLE,
+    UIA_IS_VALUE_PATTERN_AVAILABLE,
+    UIA_VALUE_VALUE,
+    UIA_IS_LEGACY_PATTERN_AVAILABLE,
+    UIA_LEGACY_NAME,
+    UIA_LEGACY_VALUE,
+    UIA_LEGACY_DESCRIPTION,
+    UIA_LEGACY_ROLE,
+)
+"""``read_details`` が一括で読み取るプロパティ（パターンの有無と値を含む）"""
+
+
+class ElementInfo(NamedTuple):
+    """一括読み取りで取得したUI要素のプロパティ"""
+
+    control: Any
+    """子要素の読み取りなどに使用するUI要素"""
+    control_type: str
+    class_name: str
+    name: str
+    automation_id: str
+    rect: Tuple[int, int, int, int]
+    process_id: int
+
+
+class Backend:
+    """Win32 API・UI Automation・プロセステーブルへのアクセスを提供する基底クラス
+
+    属性 ``win32gui`` / ``win32process`` / ``win32con`` / ``uia`` は
+    同名のモジュールと同じAPIを持つオブジェクトです。
+    """
+
+    name = "base"
+
+    @property
+    def processes(self) -> ProcessSource:
+        """プロセスソース"""
+        raise NotImplementedError
+
+    @property
+    def win32gui(self) -> Any:
+        raise NotImplementedError
+
+    @property
+    def win32process(self) -> Any:
+        raise NotImplementedError
+
+    @property
+    def win32con(self) -> Any:
+        raise NotImplementedError
+
+    @property
+    def uia(self) -> Any:
+        """``uiautomation`` モジュール"""
+        raise NotImplementedError
+
+    @property
+    def install_cache_file(self) -> Optional[str]:
+        """インストールパスの保存先。Noneの場合は ``InstallPathResolver`` の既定値"""
+        return None
+
+    def launch(
+        self, exe: str, args: Optional[List[str]] = None, cwd: Optional[str] = None
+    ) -> None:
+        """実行ファイルを起動
+
+        Args:
+            exe: 実行ファイルのパス
+            args: 起動引数。Noneの場合はシェル経由（``os.startfile``）で起動
+            cwd: 作業ディレクトリ
+
+        Raises:
+            OSError: 起動できなかった場合
+        """
+        if args is None:
+            os.startfile(exe)  # type: ignore[attr-defined]
+        else:
+            subprocess.Popen([exe] + args, cwd=cwd)
+
+    # --- UI要素のプロパティの一括読み取り ---
+    #
+    # 基底クラスの実装はプロパティを1つずつ読み取ります。サブクラスは1回の
+    # プロセス間呼び出しでまとめて読み取る実装に置き換えます。
+
+    def read_element(self, control: Any) -> ElementInfo:
+        """UI要素のプロパティをまとめて読み取り
+
+        Args:
+            control: UI要素
+
+        Returns:
+            ControlTypeName・ClassName・Name・AutomationId・矩形・プロセスID
+        """
+        r = control.BoundingRectangle
+        return ElementInfo(
+            control,
+            control.ControlTypeName,
+            control.ClassName,
+            control.Name,
+            control.AutomationId,
+            (r.left, r.top, r.right, r.bottom),
+            control.ProcessId,
+        )
+
+    def read_children(self, control: Any) -> List[ElementInfo]:
+        """子要素とそのプロパティをまとめて読み取り
+
+        Args:
+            control: 親要素
+
+        Returns:
+            子要素ごとの ``ElementInfo`` のリスト（``GetChildren()`` と同じ順序）
+        """
+        return [self.read_element(child) for child in control.GetChildren()]
+
+    def read_details(self, control: Any) -> Dict[str, Any]:
+        """UI要素のプロパティと対応パターン・パターンの値をまとめて読み取り
+
+        Args:
+            control: UI要素
+
+        Returns:
+            ``Name``・``ControlType``・``ClassName``・``AutomationId``・``Rect``・
+            ``ProcessId``・``Value``・``Patterns`` を含む辞書。LegacyIAccessiblePatternに
+            対応する場合は ``LegacyName``・``LegacyDescription``・``LegacyValue``・
+            ``LegacyRole`` を追加
+        """
+        auto = self.uia
+        info: Dict[str, Any] = {
+            "Name": control.Name,
+            "ControlType": control.ControlTypeName,
+            "ClassName": control.ClassName,
+            "AutomationId": control.AutomationId,
+            "Rect": control.BoundingRectangle,
+            "ProcessId": control.ProcessId,
+            "Value": "",
+            "Patterns": [],
+        }
+
+        if control.GetPattern(auto.PatternId.ValuePattern):
+            info["Patterns"].append("Value")
+            try:
+                p = control.GetValuePattern()
+                if p:
+                    info["Value"] = p.Value
+            except Exception:
+                pass
+
+        if control.GetPattern(auto.PatternId.InvokePattern):
+            info["Patterns"].append("Invoke (Clickable)")
+
+        if control.GetPattern(auto.PatternId.TogglePattern):
+            info["Patterns"].append("Toggle")
+
+        if control.GetPattern(auto.PatternId.LegacyIAccessiblePattern):
+            info["Patterns"].append("LegacyIAccessible")
+            try:
+                legacy = control.GetLegacyIAccessiblePattern()
+                if legacy:
+                    info["LegacyName"] = legacy.Name
+                    info["LegacyDescription"] = legacy.Description
+                    info["LegacyValue"] = legacy.Value
+                    info["LegacyRole"] = legacy.Role
+            except Exception:
+                pass
+        return info
+
+
+class Win32Backend(Backend):
+    """実環境のWindowsモジュールを使用するバックエンド
+
+    各モジュールは最初にアクセスしたときに読み込みます（``uiautomation`` の読み込みは
+    COMの初期化を伴い時間がかかるため、必要になるまで遅らせます）。
+    """
+
+    name = "win32"
+
+    def __init__(self) -> None:
+        self._modules: Dict[str, Any] = {}
+        self._processes = PsutilProcessSource()
+
+    def _module(self, name: str) -> Any:
+        module = self._modules.get(name)
+        if module is None:
+            module = self._modules[name] = importlib.import_module(name)
+        return module
+
+    @property
+    def processes(self) -> ProcessSource:
+        return self._processes
+
+    @property
+    def win32gui(self) -> Any:
+        return self._module("win32gui")
+
+    @property
+    def win32process(self) -> Any:
+        return self._module("win32process")
+
+    @property
+    def win32con(self) -> Any:
+        return self._module("win32con")
+
+    @property
+    def uia(self) -> Any:
+        return self._module("uiautomation")
+
+    # --- CacheRequestによる一括読み取り ---
+
+    def _cache_request(self, properties: Sequence[int]) -> Any:
+        """指定したプロパティを読み取る ``IUIAutomationCacheRequest`` を作成
+
+        キャッシュ要求の作成はプロセス内で完結するため、呼び出しごとに作成します
+        （スレッドごとのCOMアパートメントをまたいで共有しないため）。
+        """
+        client = self.uia._AutomationClient.instance().IUIAutomation
+        request = client.CreateCacheRequest()
+        request.TreeFilter = client.RawViewCondition  # GetChildren() と同じRaw View
+        for property_id in properties:
+            request.AddProperty(property_id)
+        return request
+
+    def _element_info(self, element: Any) -> ElementInfo:
+        auto = self.uia
+        r = element.CachedBoundingRectangle
+        return ElementInfo(
+            auto.Control.CreateControlFromElement(element),
+            auto.ControlTypeNames.get(element.CachedControlType, ""),
+            element.CachedClassName or "",
+            element.CachedName or "",
+            element.CachedAutomationId or "",
+            (r.left, r.top, r.right, r.bottom),
+            element.CachedProcessId,
+        )
+
+    def read_element(self, control: Any) -> ElementInfo:
+        element = control.Element.BuildUpdatedCache(self._cache_request(ELEMENT_PROPERTIES))
+        return self._element_info(element)
+
+    def read_children(self, control: Any) -> List[ElementInfo]:
+        client = self.uia._AutomationClient.instance().IUIAutomation
+        elements = control.Element.FindAllBuildCache(
+            UIA_TREE_SCOPE_CHILDREN,
+            client.CreateTrueCondition(),
+            self._cache_request(ELEMENT_PROPERTIES),
+        )
+        if not elements:
+            return []
+        return [self._element_info(elements.GetElement(i)) for i in range(elements.Length)]
+
+    def read_details(self, control: Any) -> Dict[str, Any]:
+        auto = self.uia
+        element = control.Element.BuildUpdatedCache(self._cache_request(DETAIL_PROPERTIES))
+        info = self._element_info(element)
+        cached = element.GetCachedPropertyValue
+        details: Dict[str, Any] = {
+            "Name": info.name,
+            "ControlType": info.control_type,
+            "ClassName": info.class_name,
+            "AutomationId": info.automation_id,
+            "Rect": auto.Rect(*info.rect),
+            "ProcessId": info.process_id,
+            "Value": "",
+            "Patterns": [],
+        }
+        if cached(UIA_IS_VALUE_PATTERN_AVAILABLE):
+            details["Patterns"].append("Value")
+            details["Value"] = cached(UIA_VALUE_VALUE) or ""
+        if cached(UIA_IS_INVOKE_PATTERN_AVAILABLE):
+            details["Patterns"].append("Invoke (Clickable)")
+        if cached(UIA_IS_TOGGLE_PATTERN_AVAILABLE):
+            details["Patterns"].append("Toggle")
+        if cached(UIA_IS_LEGACY_PATTERN_AVAILABLE):
+            details["Patterns"].append("LegacyIAccessible")
+            details["LegacyName"] = cached(UIA_LEGACY_NAME)
+            details["LegacyDescription"] = cached(UIA_LEGACY_DESCRIPTION)
+            details["LegacyValue"] = cached(UIA_LEGACY_VALUE)
+            details["LegacyRole"] = cached(UIA_LEGACY_ROLE)
+        return details
+
+
+class FakeRect:
+    """``uiautomation.Rect`` を模倣した矩形"""
+
+    __slots__ = ("left", "top", "right", "bottom")
+
+    def __init__(self, left: int, top: int, right: int, bottom: int) -> None:
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+    def width(self) -> int:
+        return self.right - self.left
+
+    def height(self) -> int:
+        return self.bottom - self.top
+
+    def contains(self, x: int, y: int) -> bool:
+        return self.left <= x < self.right and self.top <= y < self.bottom
+
+    def __repr__(self) -> str:
+        return f"({self.left},{self.top},{self.right},{self.bottom})"
+
+
+class FakeWindow:
+    """疑似ウィンドウテーブル上のウィンドウ"""
+
+    def __init__(
+        self,
+        hwnd: int,
+        pid: int,
+        title: str = "",
+        class_name: str = "",
+        rect: Tuple[int, int, int, int] = (0, 0, 800, 600),
+        visible: bool = True,
+        parent: int = 0,
+    ) -> None:
+        self.hwnd = hwnd
+        self.pid = pid
+        self.title = title
+        self.class_name = class_name
+        self.rect = rect
+        self.visible = visible
+        self.parent = parent
+        self.ex_style = 0
+        self.topmost = False
+        self.alpha = 255
+        self.iconic = False
+
+
+class FakeControl:
+    """``uiautomation.Control`` の一部APIを模倣した疑似UI要素
+
+    プロパティの読み取りと子要素の取得は、実環境のCOM呼び出しと同様に
+    バックエンドの呼び出し回数に数えられ、``latency`` 秒の遅延が発生します。
+    """
+
+    def __init__(
+        self,
+        backend: "FakeBackend",
+        control_type: str = "PaneControl",
+        class_name: str = "",
+        name: str = "",
+        automation_id: str = "",
+        rect: Tuple[int, int, int, int] = (0, 0, 0, 0),
+        pid: int = 0,
+        hwnd: int = 0,
+        value: Optional[str] = None,
+    ) -> None:
+        self._backend = backend
+        self._control_type = control_type
+        self._class_name = class_name
+        self._name = name
+        self._automation_id = automation_id
+        self._rect = FakeRect(*rect)
+        self._pid = pid
+        self._hwnd = hwnd
+        self._value = value
+        self._parent: Optional[FakeControl] = None
+        self._children: List[FakeControl] = []
+        self.sent_keys: List[str] = []
+
+    # --- ツリーの構築（遅延なし） ---
+
+    def add_child(self, child: "FakeControl") -> "FakeControl":
+        """子要素を追加
+
+        Args:
+            child: 追加する要素
+
+        Returns:
+            追加した要素
+        """
+        child._parent = self
+        self._children.append(child)
+        return child
+
+    def remove_child(self, child: "FakeControl") -> None:
+        """子要素を取り除く"""
+        self._children.remove(child)
+        child._parent = None
+
+    def iter_subtree(self) -> Iterator["FakeControl"]:
+        """この要素以下のすべての要素を深さ優先で列挙（遅延なし）"""
+        stack = [self]
+        while stack:
+            control = stack.pop()
+            yield control
+            stack.extend(reversed(control._children))
+
+    def set_process(self, pid: int) -> None:
+        """この要素以下のすべての要素のプロセスIDを設定"""
+        for control in self.iter_subtree():
+            control._pid = pid
+
+    # --- uiautomation.Control 互換API ---
+
+    @property
+    def Name(self) -> str:
+        self._backend._tick()
+        return self._name
+
+    @property
+    def ControlTypeName(self) -> str:
+        self._backend._tick()
+        return self._control_type
+
+    @property
+    def ClassName(self) -> str:
+        self._backend._tick()
+        return self._class_name
+
+    @property
+    def AutomationId(self) -> str:
+        self._backend._tick()
+        return self._automation_id
+
+    @property
+    def BoundingRectangle(self) -> FakeRect:
+        self._backend._tick()
+        return self._rect
+
+    @property
+    def ProcessId(self) -> int:
+        self._backend._tick()
+        return self._pid
+
+    @property
+    def NativeWindowHandle(self) -> int:
+        self._backend._tick()
+        return self._hwnd
+
+    def GetChildren(self) -> List["FakeControl"]:
+        self._backend._tick()
+        return list(self._children)
+
+    def GetParentControl(self) -> Optional["FakeControl"]:
+        self._backend._tick()
+        return self._parent
+
+    def GetPattern(self, pattern_id: int) -> Any:
+        self._backend._tick()
+        if pattern_id == FakePatternId.ValuePattern and self._value is not None:
+            return self
+        if pattern_id == FakePatternId.InvokePattern and self._control_type == "ButtonControl":
+            return self
+        if pattern_id == FakePatternId.LegacyIAccessiblePattern:
+            return self
+        return None
+
+    def GetValuePattern(self) -> Any:
+        self._backend._tick()
+        return _FakePattern(Value=self._value or "")
+
+    def GetLegacyIAccessiblePattern(self) -> Any:
+        self._backend._tick()
+        return _FakePattern(
+            Name=self._name, Description=self._class_name, Value=self._value or "", Role=0
+        )
+
+    def Exists(self, maxSearchSeconds: float = 0, searchIntervalSeconds: float = 0) -> bool:
+        return True
+
+    def SetFocus(self) -> bool:
+        self._backend._tick()
+        return True
+
+    def Click(self, *args: Any, **kwargs: Any) -> None:
+        self._backend._tick()
+
+    def SendKeys(self, text: str, *args: Any, **kwargs: Any) -> None:
+        self._backend._tick()
+        self.sent_keys.append(text)
+
+    def EditControl(self, searchDepth: int = 0xFFFFFFFF, **conditions: Any) -> Any:
+        return self._backend._search(self, "EditControl", searchDepth, conditions)
+
+    def WindowControl(self, searchDepth: int = 0xFFFFFFFF, **conditions: Any) -> Any:
+        return self._backend._search(self, "WindowControl", searchDepth, conditions)
+
+    def __repr__(self) -> str:
+        return f"FakeControl({self._control_type}, ClassName={self._class_name!r})"
+
+
+class _FakePattern:
+    def __init__(self, **attrs: Any) -> None:
+        self.__dict__.update(attrs)
+
+
+class _MissingControl:
+    """検索で見つからなかった要素（``Exists()`` がFalseを返す）"""
+
+    NativeWindowHandle = 0
+
+    def Exists(self, maxSearchSeconds: float = 0, searchIntervalSeconds: float = 0) -> bool:
+        return False
+
+    def __bool__(self) -> bool:
+        return True  # uiautomationの検索オブジェクトと同様、真偽値は常にTrue
+
+    def __getattr__(self, name: str) -> Any:
+        raise LookupError("Find Control Timeout")
+
+
+class FakePatternId:
+    """``uiautomation.PatternId`` の疑似定数"""
+
+    InvokePattern = 10000
+    ValuePattern = 10002
+    TogglePattern = 10015
+    LegacyIAccessiblePattern = 10018
+
+
+class _FakeInitializer:
+    """``UIAutomationInitializerInThread`` の疑似実装（何もしない）"""
+
+    def __init__(self, debug: bool = False) -> None:
+        pass
+
+    def __enter__(self) -> "_FakeInitializer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+
+class FakeUIAutomation:
+    """``uiautomation`` モジュールの一部APIを模倣"""
+
+    PatternId = FakePatternId
+    Control = FakeControl
+    UIAutomationInitializerInThread = _FakeInitializer
+
+    def __init__(self, backend: "FakeBackend") -> None:
+        self._backend = backend
+
+    def GetRootControl(self) -> FakeControl:
+        self._backend._tick()
+        return self._backend.desktop
+
+    def ControlFromPoint(self, x: int, y: int) -> Optional[FakeControl]:
+        """指定座標を含む最も深い要素を取得"""
+        self._backend._tick()
+        found = None
+        candidates = list(self._backend.desktop._children)
+        while candidates:
+            for control in candidates:
+                if control._rect.contains(x, y):
+                    found = control
+                    candidates = list(control._children)
+                    break
+            else:
+                break
+        return found
+
+    def WindowControl(self, searchDepth: int = 0xFFFFFFFF, **conditions: Any) -> Any:
+        return self._backend._search(
+            self._backend.desktop, "WindowControl", searchDepth, conditions
+        )
+
+
+class FakeWin32Con:
+    """``win32con`` の疑似定数"""
+
+    HWND_TOPMOST = -1
+    HWND_NOTOPMOST = -2
+    SWP_NOSIZE = 0x0001
+    SWP_NOMOVE = 0x0002
+    GWL_EXSTYLE = -20
+    WS_EX_LAYERED = 0x00080000
+    LWA_ALPHA = 0x00000002
+    SW_RESTORE = 9
+
+
+class FakeWin32Gui:
+    """``win32gui`` モジュールの一部APIを疑似ウィンドウテーブル上で模倣"""
+
+    def __init__(self, backend: "FakeBackend") -> None:
+        self._backend = backend
+
+    def _window(self, hwnd: int) -> FakeWindow:
+        self._backend._tick()
+        window = self._backend.windows.get(hwnd)
+        if window is None:
+            raise OSError(1400, "GetWindowRect", "Invalid window handle.")
+        return window
+
+    def EnumWindows(self, callback: Callable[[int, Any], Any], extra: Any) -> None:
+        self._backend._tick()
+        for window in list(self._backend.windows.values()):
+            if window.parent == 0 and callback(window.hwnd, extra) is False:
+                break
+
+    def EnumChildWindows(
+        self, parent: int, callback: Callable[[int, Any], Any], extra: Any
+    ) -> None:
+        self._backend._tick()
+        children = [w.hwnd for w in self._backend.windows.values() if w.parent == parent]
+        while children:
+            hwnd = children.pop(0)
+            if callback(hwnd, extra) is False:
+                break
+            children.extend(
+                w.hwnd for w in self._backend.windows.values() if w.parent == hwnd
+            )
+
+    def IsWindow(self, hwnd: int) -> bool:
+        self._backend._tick()
+        return hwnd in self._backend.windows
+
+    def IsWindowVisible(self, hwnd: int) -> bool:
+        self._backend._tick()
+        window = self._backend.windows.get(hwnd)
+        return bool(window and window.visible)
+
+    def IsIconic(self, hwnd: int) -> bool:
+        return self._window(hwnd).iconic
+
+    def ShowWindow(self, hwnd: int, cmd: int) -> None:
+        window = self._window(hwnd)
+        if cmd == FakeWin32Con.SW_RESTORE:
+            window.iconic = False
+
+    def GetWindowRect(self, hwnd: int) -> Tuple[int, int, int, int]:
+        return self._window(hwnd).rect
+
+    def MoveWindow(
+        self, hwnd: int, x: int, y: int, width: int, height: int, repaint: bool
+    ) -> None:
+        self._window(hwnd).rect = (x, y, x + width, y + height)
+
+    def GetClassName(self, hwnd: int) -> str:
+        return self._window(hwnd).class_name
+
+    def GetWindowText(self, hwnd: int) -> str:
+        return self._window(hwnd).title
+
+    def SetWindowText(self, hwnd: int, text: str) -> None:
+        self._window(hwnd).title = text
+
+    def GetParent(self, hwnd: int) -> int:
+        return self._window(hwnd).parent
+
+    def SetWindowPos(
+        self, hwnd: int, insert_after: int, x: int, y: int, cx: int, cy: int, flags: int
+    ) -> None:
+        window = self._window(hwnd)
+        if insert_after in (FakeWin32Con.HWND_TOPMOST, FakeWin32Con.HWND_NOTOPMOST):
+            window.topmost = insert_after == FakeWin32Con.HWND_TOPMOST
+
+    def GetWindowLong(self, hwnd: int, index: int) -> int:
+        return self._window(hwnd).ex_style
+
+    def SetWindowLong(self, hwnd: int, index: int, value: int) -> None:
+        self._window(hwnd).ex_style = value
+
+    def SetLayeredWindowAttributes(self, hwnd: int, key: int, alpha: int, flags: int) -> None:
+        self._window(hwnd).alpha = alpha
+
+    def GetCursorPos(self) -> Tuple[int, int]:
+        self._backend._tick()
+        return self._backend.cursor
+
+
+class FakeWin32Process:
+    """``win32process`` モジュールの一部APIを模倣"""
+
+    def __init__(self, backend: "FakeBackend") -> None:
+        self._backend = backend
+
+    def GetWindowThreadProcessId(self, hwnd: int) -> Tuple[int, int]:
+        self._backend._tick()
+        window = self._backend.windows.get(hwnd)
+        return (1, window.pid) if window else (0, 0)
+
+
+class FakeBackend(Backend):
+    """メモリ上の疑似ウィンドウテーブル・UIツリー・プロセステーブルを使用するバックエンド
+
+    すべてのAPI呼び出し（UI要素のプロパティ読み取りを含む）は ``calls`` に数えられ、
+    ``latency`` 秒の遅延が発生します。Windows以外の環境で処理時間や
+    API呼び出し回数を再現性のある形で計測するために使用します。
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        processes: Optional[FakeProcessSource] = None,
+        root: Optional[str] = None,
+    ) -> None:
+        """バックエンドを初期化
+
+        Args:
+            latency: API呼び出し1回あたりの遅延（秒）
+            processes: 疑似プロセステーブル。省略時は空のテーブルを作成
+            root: 疑似LINEのインストール先などを作成するディレクトリ。
+                省略時は ``N_LINE_FAKE_ROOT`` 、未設定の場合は一時ディレクトリ内の ``n-line-fake``
+        """
+        self.latency = latency
+        self.calls = 0
+        self.windows: Dict[int, FakeWindow] = {}
+        self.cursor = (0, 0)
+        self.root = (
+            root
+            or os.environ.get(FAKE_ROOT_ENV_VAR)
+            or os.path.join(tempfile.gettempdir(), "n-line-fake")
+        )
+        self.line_exe = os.path.join(self.root, "AppData", "Local", "LINE", "bin", "LINE.exe")
+        """疑似LINEの実行ファイルのパス（``add_line_app()`` で作成）"""
+
+        self._processes = processes or FakeProcessSource()
+        self._processes.on_exit.append(self._on_process_exit)
+        self._lock = threading.Lock()
+        self._next_hwnd = 0x10000
+        self._win32gui = FakeWin32Gui(self)
+        self._win32process = FakeWin32Process(self)
+        self._uia = FakeUIAutomation(self)
+        self.desktop = FakeControl(
+            self, "PaneControl", "#32769", "Desktop 1", rect=(0, 0, 1920, 1080)
+        )
+
+    @property
+    def processes(self) -> FakeProcessSource:
+        return self._processes
+
+    @property
+    def win32gui(self) -> FakeWin32Gui:
+        return self._win32gui
+
+    @property
+    def win32process(self) -> FakeWin32Process:
+        return self._win32process
+
+    @property
+    def win32con(self) -> Any:
+        return FakeWin32Con
+
+    @property
+    def uia(self) -> FakeUIAutomation:
+        return self._uia
+
+    @property
+    def install_cache_file(self) -> Optional[str]:
+        return os.path.join(self.root, "install_path.json")
+
+    def launch(
+        self, exe: str, args: Optional[List[str]] = None, cwd: Optional[str] = None
+    ) -> None:
+        """疑似LINEを起動（``add_line_app()`` と同じプロセス・ウィンドウを作成）
+
+        Raises:
+            FileNotFoundError: 実行ファイルが存在しない場合
+        """
+        self._tick()
+        if not os.path.isfile(exe):
+            raise FileNotFoundError(exe)
+        self.add_line_app(args=args)
+
+    def _on_process_exit(self, proc: FakeProcess) -> None:
+        # 終了したプロセスのウィンドウを取り除く
+        for hwnd, window in list(self.windows.items()):
+            if window.pid == proc.pid:
+                self.remove_window(hwnd)
+
+    def _tick(self) -> None:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    # --- 一括読み取り（1回の呼び出しとして数える） ---
+
+    @staticmethod
+    def _info(control: FakeControl) -> ElementInfo:
+        r = control._rect
+        return ElementInfo(
+            control,
+            control._control_type,
+            control._class_name,
+            control._name,
+            control._automation_id,
+            (r.left, r.top, r.right, r.bottom),
+            control._pid,
+        )
+
+    def read_element(self, control: FakeControl) -> ElementInfo:
+        self._tick()
+        return self._info(control)
+
+    def read_children(self, control: FakeControl) -> List[ElementInfo]:
+        self._tick()
+        return [self._info(child) for child in control._children]
+
+    def read_details(self, control: FakeControl) -> Dict[str, Any]:
+        self._tick()
+        info: Dict[str, Any] = {
+            "Name": control._name,
+            "ControlType": control._control_type,
+            "ClassName": control._class_name,
+            "AutomationId": control._automation_id,
+            "Rect": control._rect,
+            "ProcessId": control._pid,
+            "Value": "",
+            "Patterns": [],
+        }
+        if control._value is not None:
+            info["Patterns"].append("Value")
+            info["Value"] = control._value
+        if control._control_type == "ButtonControl":
+            info["Patterns"].append("Invoke (Clickable)")
+        info["Patterns"].append("LegacyIAccessible")
+        info["LegacyName"] = control._name
+        info["LegacyDescription"] = control._class_name
+        info["LegacyValue"] = control._value or ""
+        info["LegacyRole"] = 0
+        return info
+
+    def reset_calls(self) -> int:
+        """API呼び出し回数をリセット
+
+        Returns:
+            リセット前の呼び出し回数
+        """
+        with self._lock:
+            calls, self.calls = self.calls, 0
+        return calls
+
+    def _search(
+        self, root: FakeControl, control_type: str, depth: int, conditions: Dict[str, Any]
+    ) -> Any:
+        attrs = {"Name": "_name", "ClassName": "_class_name", "AutomationId": "_automation_id"}
+        level = [(c, 1) for c in root._children]
+        while level:
+            control, d = level.pop(0)
+            self._tick()
+            if control._control_type == control_type and all(
+                getattr(control, attrs[k]) == v for k, v in conditions.items() if k in attrs
+            ):
+                return control
+            if d < depth:
+                level.extend((c, d + 1) for c in control._children)
+        return _MissingControl()
+
+    # --- 疑似環境の構築 ---
+
+    def add_window(
+        self,
+        pid: int,
+        title: str = "",
+        class_name: str = "",
+        rect: Tuple[int, int, int, int] = (0, 0, 800, 600),
+        visible: bool = True,
+        parent: int = 0,
+        control: Optional[FakeControl] = None,
+    ) -> int:
+        """疑似ウィンドウを作成
+
+        Args:
+            pid: ウィンドウを所有するプロセスID
+            title: ウィンドウタイトル
+            class_name: ウィンドウクラス名
+            rect: (left, top, right, bottom)
+            visible: 表示状態
+            parent: 親ウィンドウのハンドル（トップレベルの場合は0）
+            control: ウィンドウに対応するUIツリーのルート要素。
+                指定した場合はデスクトップの子要素として登録します
+
+        Returns:
+            作成したウィンドウのハンドル
+        """
+        with self._lock:
+            hwnd = self._next_hwnd
+            self._next_hwnd += 4
+        self.windows[hwnd] = FakeWindow(hwnd, pid, title, class_name, rect, visible, parent)
+        if control is not None:
+            control._hwnd = hwnd
+            control.set_process(pid)
+            self.desktop.add_child(control)
+        return hwnd
+
+    def remove_window(self, hwnd: int) -> None:
+        """疑似ウィンドウと対応するUIツリーを取り除く
+
+        Args:
+            hwnd: ウィンドウハンドル
+        """
+        self.windows.pop(hwnd, None)
+        for control in list(self.desktop._children):
+            if control._hwnd == hwnd:
+                self.desktop.remove_child(control)
+
+    def generate_tree(
+        self,
+        nodes: int,
+        fanout: int = 8,
+        seed: int = 0,
+        classes: Sequence[str] = DEFAULT_CLASSES,
+        rect: Tuple[int, int, int, int] = (0, 0, 1280, 800),
+    ) -> FakeControl:
+        """指定した要素数の疑似UIツリーを生成
+
+        幅優先で各要素に最大 ``fanout`` 個の子要素を割り当てます（子要素の数は
+        乱数で変化させ、同じ ``seed`` では同じツリーを生成します）。
+
+        Args:
+            nodes: ルートを含む要素数
+            fanout: 1要素あたりの子要素数の上限
+            seed: 乱数のシード
+            classes: 使用するクラス名
+            rect: ルート要素の矩形
+
+        Returns:
+            ルート要素（``WindowControl``、クラス名 ``Qt5QWindowIcon``）
+        """
+        rng = random.Random(seed)
+        root = FakeControl(self, "WindowControl", "Qt5QWindowIcon", "LINE", rect=rect)
+        queue = [root]
+        created = 1
+        head = 0
+        while created < nodes and head < len(queue):
+            parent = queue[head]
+            head += 1
+            box = parent._rect
+            count = min(rng.randint(1, fanout) if head > 1 else fanout, nodes - created)
+            height = max(1, box.height() // max(count, 1))
+            for i in range(count):
+                cls = classes[rng.randrange(len(classes))]
+                child = FakeControl(
+                    self,
+                    CONTROL_TYPES.get(cls, "PaneControl"),
+                    cls,
+                    name=f"{cls}_{created}" if rng.random() < 0.3 else "",
+                    automation_id=f"id_{created}" if rng.random() < 0.1 else "",
+                    rect=(box.left, box.top + i * height, box.right, box.top + (i + 1) * height),
+                    value="" if cls == "AutoSuggestTextArea" else None,
+                )
+                parent.add_child(child)
+                queue.append(child)
+                created += 1
+        return root
+
+    def add_line_app(
+        self,
+        nodes: int = 2000,
+        fanout: int = 8,
+        seed: int = 0,
+        args: Optional[List[str]] = None,
+    ) -> Tuple[FakeProcess, int]:
+        """LINEを模した疑似プロセスとメインウィンドウ・UIツリーを作成
+
+        実行ファイル ``line_exe`` が存在しない場合は空のファイルとして作成します。
+
+        Args:
+            nodes: UIツリーの要素数
+            fanout: 1要素あたりの子要素数の上限
+            seed: 乱数のシード
+            args: 疑似プロセスのコマンドライン引数
+
+        Returns:
+            (疑似LINEプロセス, メインウィンドウのハンドル)
+        """
+        if not os.path.isfile(self.line_exe):
+            os.makedirs(os.path.dirname(self.line_exe), exist_ok=True)
+            open(self.line_exe, "ab").close()
+        proc = self.processes.spawn(
+            "LINE.exe", exe=self.line_exe, cmdline=[self.line_exe] + list(args or [])
+        )
+        tree = self.generate_tree(nodes, fanout=fanout, seed=seed)
+        hwnd = self.add_window(
+            proc.pid, "LINE", "Qt5QWindowIcon", rect=(0, 0, 1280, 800), control=tree
+        )
+        # Qtが作成する1x1のダミーウィンドウ
+        self.add_window(proc.pid, "", "Qt5QWindowIcon", rect=(0, 0, 1, 1), visible=False)
+        return proc, hwnd
+
+
+_backend: Optional[Backend] = None
+_backend_lock = threading.Lock()
+
+
+def _default_backend() -> Backend:
+    choice = os.environ.get(ENV_VAR, "").lower()
+    if choice == "fake":
+        backend = FakeBackend()
+        backend.add_line_app()
+        return backend
+    if choice == "win32" or sys.platform == "win32":
+        return Win32Backend()
+    # Windows以外では実環境のAPIが存在しないため、空の疑似環境を使用
+    return FakeBackend()
+
+
+def get_backend() -> Backend:
+    """使用中のバックエンドを取得（初回呼び出し時に作成）
+
+    ``set_backend()`` で設定されていない場合、``N_LINE_BACKEND`` が ``fake`` であれば
+    疑似LINEを含む ``FakeBackend`` 、Windowsでは ``Win32Backend`` 、
+    それ以外では空の ``FakeBackend`` を使用します。
+
+    Returns:
+        Backendインスタンス
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _default_backend()
+    return _backend
+
+
+def set_backend(backend: Optional[Backend]) -> None:
+    """使用するバックエンドを設定
+
+    Args:
+        backend: Backendインスタンス。Noneの場合は次回の ``get_backend()`` で既定値を作成
+    """
+    global _backend
+    with _backend_lock:
+        _backend = backend
@@ -0,0 +1,188 @@
+"""キャッシュクリーナーモジュール
+
+ディレクトリを ``os.scandir`` でストリーミング走査しながら、
+ファイル削除をスレッドプールで並列に実行するモジュールです。
+削除したファイル数・バイト数を進捗コールバックで報告し、
+ドライランとキャンセルに対応します。
+"""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+"""進捗コールバックの型。集計中の結果辞書を受け取ります"""
+
+
+class CacheCleaner:
+    """ディレクトリの内容を並列に削除するクラス
+
+    ディレクトリ自体は削除せず、その内容のみを削除します。
+    ファイルの削除はスレッドプールで行い、同時に処理中のタスク数は
+    ``max_pending`` に制限されるため、巨大なディレクトリでもメモリ使用量は
+    一定に保たれます。
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        dry_run: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+        progress_interval: int = 500,
+        max_pending: int = 256,
+    ) -> None:
+        """クリーナーを初期化
+
+        Args:
+            workers: 削除に使用するスレッド数
+            dry_run: Trueの場合は削除せず、削除対象の集計のみ行う
+            progress_callback: 進捗を報告するコールバック関数
+            cancel_event: セットされると処理を中断するイベント
+            progress_interval: 進捗を報告するファイル数の間隔
+            max_pending: 同時に処理待ちにできる削除タスク数の上限
+        """
+        self.workers = max(1, workers)
+        self.dry_run = dry_run
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event or threading.Event()
+        self.progress_interval = max(1, progress_interval)
+        self.max_pending = max(1, max_pending)
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._result: Dict[str, Any] = {}
+        self._last_report = 0
+
+    def cancel(self) -> None:
+        """処理の中断を要求"""
+        self.cancel_event.set()
+
+    def clean(self, path: str) -> Dict[str, Any]:
+        """ディレクトリの内容を削除
+
+        Args:
+            path: 対象ディレクトリ
+
+        Returns:
+            ``files``、``bytes``、``dirs``、``errors``、``cancelled``、
+            ``dry_run`` を含む結果辞書
+        """
+        self._result = {
+            "path": path,
+            "files": 0,
+            "bytes": 0,
+            "dirs": 0,
+            "errors": 0,
+            "error_samples": [],
+            "cancelled": False,
+            "dry_run": self.dry_run,
+        }
+        self._last_report = 0
+
+        # 走査順にディレクトリを記録し、最後に深い順に削除する
+        dirs: List[str] = []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            stack = [path]
+            while stack and not self.cancel_event.is_set():
+                current = stack.pop()
+                try:
+                    with os.scandir(current) as it:
+                        for entry in it:
+                            if self.cancel_event.is_set():
+                                break
+                            self._handle_entry(pool, entry, stack, dirs)
+                except OSError as e:
+                    self._record_error(current, e)
+
+        if not self.cancel_event.is_set():
+            for dir_path in reversed(dirs):
+                if self.cancel_event.is_set():
+                    break
+                try:
+                    if not self.dry_run:
+                        os.rmdir(dir_path)
+                    self._result["dirs"] += 1
+                except OSError as e:
+                    self._record_error(dir_path, e)
+
+        self._result["cancelled"] = self.cancel_event.is_set()
+        self._report(force=True)
+        return dict(self._result)
+
+    def _handle_entry(
+        self,
+        pool: ThreadPoolExecutor,
+        entry: "os.DirEntry[str]",
+        stack: List[str],
+        dirs: List[str],
+    ) -> None:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+                dirs.append(entry.path)
+                return
+            size = entry.stat(follow_symlinks=False).st_size
+        except OSError as e:
+            self._record_error(entry.path, e)
+            return
+
+        if self.dry_run:
+            self._add_file(size)
+            return
+
+        self._slots.acquire()
+        future = pool.submit(os.unlink, entry.path)
+        future.add_done_callback(
+            lambda f, p=entry.path, s=size: self._on_unlinked(f, p, s)
+        )
+
+    def _on_unlinked(self, future: Future, path: str, size: int) -> None:
+        self._slots.release()
+        error = future.exception()
+        if error is not None:
+            self._record_error(path, error)
+        else:
+            self._add_file(size)
+
+    def _add_file(self, size: int) -> None:
+        with self._lock:
+            self._result["files"] += 1
+            self._result["bytes"] += size
+        self._report()
+
+    def _record_error(self, path: str, error: BaseException) -> None:
+        with self._lock:
+            self._result["errors"] += 1
+            if len(self._result["error_samples"]) < 10:
+                self._result["error_samples"].append(f"{path}: {error}")
+
+    def _report(self, force: bool = False) -> None:
+        if not self.progress_callback:
+            return
+        with self._lock:
+            if not force and self._result["files"] - self._last_report < self.progress_interval:
+                return
+            self._last_report = self._result["files"]
+            snapshot = dict(self._result)
+        try:
+            self.progress_callback(snapshot)
+        except Exception:
+            pass
+
+
+def format_bytes(num_bytes: float) -> str:
+    """バイト数を読みやすい単位に変換
+
+    Args:
+        num_bytes: バイト数
+
+    Returns:
+        ``12.3 MB`` のような文字列
+    """
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
@@ -0,0 +1,241 @@
+"""キャッシュ容量管理モジュール
+
+LINEのキャッシュディレクトリを設定されたサイズ以下に保つモジュールです。
+すべてを削除する ``LineManager.clear_cache`` とは異なり、最近使用されていない
+ファイルから順に、上限を持つバッチ単位で削除します。
+
+単発実行:
+    python -m n_line.core.cache_quota --max-mb 500
+
+定期実行:
+    python -m n_line.core.cache_quota --max-mb 500 --interval 3600
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .line_manager import LineManager
+
+
+class CacheQuotaManager:
+    """LRU方式でキャッシュを容量内に保つクラス
+
+    ファイルの最終使用時刻（アクセス時刻と更新時刻の新しい方）が古い順に
+    削除します。1回のバッチで削除するファイル数は ``batch_size`` に制限され、
+    バッチごとにLINEが起動していないことを確認します。
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        cache_path: Optional[str] = None,
+        batch_size: int = 500,
+        batch_pause: float = 0.0,
+        dry_run: bool = False,
+        is_running: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """容量管理を初期化
+
+        Args:
+            max_bytes: キャッシュの上限サイズ（バイト）
+            cache_path: キャッシュディレクトリ。省略時は ``LineManager.get_cache_path()``
+            batch_size: 1回のバッチで削除するファイル数の上限
+            batch_pause: バッチ間の待機時間（秒）
+            dry_run: Trueの場合は削除せず、削除対象の集計のみ行う
+            is_running: LINEの実行状態を返す関数。省略時は ``LineManager.is_line_running``
+        """
+        self.max_bytes = max_bytes
+        self.cache_path = cache_path or LineManager.get_cache_path()
+        self.batch_size = max(1, batch_size)
+        self.batch_pause = batch_pause
+        self.dry_run = dry_run
+        self.is_running = is_running or LineManager.is_line_running
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_result: Optional[Dict[str, Any]] = None
+
+    def collect(self) -> Tuple[List[Tuple[float, int, str]], int]:
+        """キャッシュ内のファイルを列挙
+
+        Returns:
+            ``(最終使用時刻, サイズ, パス)`` のリストと合計サイズ
+        """
+        entries: List[Tuple[float, int, str]] = []
+        total = 0
+        stack = [self.cache_path]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        last_used = max(st.st_atime, st.st_mtime)
+                        entries.append((last_used, st.st_size, entry.path))
+                        total += st.st_size
+            except OSError:
+                pass
+        return entries, total
+
+    def prune(self) -> Dict[str, Any]:
+        """キャッシュが上限以下になるまで古いファイルから削除
+
+        Returns:
+            削除したファイル数・解放したバイト数・削除前後の合計サイズ、
+            および ``refused`` / ``cancelled`` / ``done`` を含む結果辞書
+        """
+        result: Dict[str, Any] = {
+            "cache_path": self.cache_path,
+            "max_bytes": self.max_bytes,
+            "total_before": 0,
+            "total_after": 0,
+            "deleted_files": 0,
+            "freed_bytes": 0,
+            "batches": 0,
+            "errors": 0,
+            "dry_run": self.dry_run,
+            "refused": False,
+            "cancelled": False,
+            "done": False,
+        }
+        self.last_result = result
+
+        if not self.cache_path or not os.path.isdir(self.cache_path):
+            result["error"] = f"Cache directory not found at: {self.cache_path}"
+            return result
+
+        if self.is_running():
+            result["refused"] = True
+            result["error"] = "LINE is running. Close LINE before pruning the cache."
+            return result
+
+        entries, total = self.collect()
+        result["total_before"] = total
+        heapq.heapify(entries)  # 最終使用時刻が古い順に取り出す
+
+        while total > self.max_bytes and entries:
+            if self._stop.is_set():
+                result["cancelled"] = True
+                break
+            if result["batches"] and self.is_running():
+                result["refused"] = True
+                result["error"] = "LINE was started during pruning."
+                break
+
+            for _ in range(self.batch_size):
+                if total <= self.max_bytes or not entries:
+                    break
+                _, size, path = heapq.heappop(entries)
+                try:
+                    if not self.dry_run:
+                        os.unlink(path)
+                    total -= size
+                    result["deleted_files"] += 1
+                    result["freed_bytes"] += size
+                except OSError:
+                    result["errors"] += 1
+            result["batches"] += 1
+
+            if self.batch_pause and total > self.max_bytes:
+                self._stop.wait(self.batch_pause)
+
+        result["total_after"] = total
+        result["done"] = total <= self.max_bytes
+        return result
+
+    def start(self, interval: float = 3600.0) -> None:
+        """バックグラウンドで定期的に容量管理を実行
+
+        LINEが実行中の回はスキップされます。
+
+        Args:
+            interval: 実行間隔（秒）
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="CacheQuotaManager"
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        """定期実行を停止
+
+        Args:
+            timeout: スレッド終了を待つ最大時間（秒）
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.is_set():
+            try:
+                self.prune()
+            except Exception:
+                pass
+            self._stop.wait(interval)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """コマンドラインから容量管理を実行
+
+    Args:
+        argv: コマンドライン引数。省略時は ``sys.argv[1:]``
+
+    Returns:
+        終了コード（LINE実行中で拒否された場合は2）
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m n_line.core.cache_quota",
+        description="Keep the LINE cache under a size quota (LRU pruning).",
+    )
+    parser.add_argument("--max-mb", type=float, required=True, help="cache quota in MB")
+    parser.add_argument("--path", help="cache directory (default: LINE cache)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0,
+        help="run repeatedly every N seconds instead of once",
+    )
+    args = parser.parse_args(argv)
+
+    manager = CacheQuotaManager(
+        max_bytes=int(args.max_mb * 1024 * 1024),
+        cache_path=args.path,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+
+    if args.interval <= 0:
+        result = manager.prune()
+        print(json.dumps(result, ensure_ascii=False))
+        return 2 if result["refused"] else 0
+
+    try:
+        while True:
+            result = manager.prune()
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,14 @@
 """
 import os
 import sys
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, List, Optional
 
 import psutil
 
+from .disk_index import DiskUsageIndex
 from .line_manager import LineManager
+from .resource_sampler import METRICS, ResourceSampler
 
 
 class DebugTools:
@@ -19,6 +22,12 @@ class DebugTools:
     取得、ディレクトリスキャンなどのデバッグ機能を提供します。
     """
 
+    RESOURCE_SAMPLE_INTERVAL = 1.0
+    RESOURCE_SAMPLE_CAPACITY = 3600
+
+    _resource_sampler: Optional[ResourceSampler] = None
+    _resource_sampler_lock = threading.Lock()
+
     @staticmethod
     def get_system_info() -> Dict[str, str]:
         """システム情報を取得
@@ -92,3 +101,74 @@ class DebugTools:
                     pass
 
         return paths
+
+    @staticmethod
+    def scan_disk_usage(full: bool = False, top: int = 10) -> Dict[str, Any]:
+        """LINEのデータディレクトリのディスク使用量をスキャン
+
+        前回のスナップショットから更新時刻が変わっていないディレクトリは
+        再走査せず、前回からの増加量と合わせて返します。
+
+        Args:
+            full: Trueの場合はすべてのディレクトリを再走査
+            top: 増加量・サイズの上位何件を返すか
+
+        Returns:
+            DiskUsageIndex.scan() の結果。データディレクトリが見つからない場合は
+            ``error`` を含む辞書
+        """
+        user_profile = os.environ.get("USERPROFILE")
+        if not user_profile:
+            return {"error": "Could not determine user profile."}
+
+        data_path = os.path.join(user_profile, "AppData", "Local", "LINE")
+        if not os.path.exists(data_path):
+            return {"error": f"Data directory not found at: {data_path}"}
+
+        return DiskUsageIndex(data_path).scan(full=full, top=top)
+
+    @staticmethod
+    def get_resource_sampler(start: bool = True) -> ResourceSampler:
+        """共有のリソースサンプラーを取得
+
+        Args:
+            start: Trueの場合はバックグラウンドでのサンプリングを開始
+
+        Returns:
+            ResourceSamplerインスタンス
+        """
+        with DebugTools._resource_sampler_lock:
+            if DebugTools._resource_sampler is None:
+                DebugTools._resource_sampler = ResourceSampler(
+                    interval=DebugTools.RESOURCE_SAMPLE_INTERVAL,
+                    capacity=DebugTools.RESOURCE_SAMPLE_CAPACITY,
+                )
+            sampler = DebugTools._resource_sampler
+        if start:
+            sampler.start()
+        return sampler
+
+    @staticmethod
+    def get_resource_stats(window: Optional[float] = 60.0) -> Dict[int, Dict[str, Any]]:
+        """LINEプロセスごとのリソース使用量の統計を取得
+
+        サンプラーが記録した値から計算するため、プロセスへの問い合わせは
+        発生しません。サンプラーが起動していない場合は起動します。
+
+        Args:
+            window: 直近何秒分を集計するか。Noneの場合は記録全体
+
+        Returns:
+            PIDをキー、メトリクス名ごとの ``min``/``mean``/``max``/``p95`` と
+            最新値 ``latest`` を値とする辞書
+        """
+        sampler = DebugTools.get_resource_sampler()
+        stats: Dict[int, Dict[str, Any]] = {}
+        for pid in sampler.pids():
+            latest = sampler.latest(pid)
+            if latest is None:
+                continue
+            entry: Dict[str, Any] = {m: sampler.stats(pid, m, window) for m in METRICS}
+            entry["latest"] = latest
+            stats[pid] = entry
+        return stats
@@ -0,0 +1,227 @@
+"""ディスク使用量インデックスモジュール
+
+ディレクトリごとのサイズ・ファイル数・更新時刻をコンパクトな
+スナップショットとしてディスクに保存し、次回のスキャンでは
+更新時刻が変わっていないディレクトリの内容の再走査を省略する
+モジュールです。前回のスキャンからの増加量を1回の呼び出しで取得できます。
+"""
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .install_resolver import app_data_dir
+
+SNAPSHOT_VERSION = 1
+"""スナップショット形式のバージョン"""
+
+ROOT_KEY = "."
+"""ルートディレクトリを表すキー"""
+
+
+class DiskUsageIndex:
+    """ディレクトリ単位のディスク使用量インデックス
+
+    スナップショットには、ディレクトリ（ルートからの相対パス）ごとに
+    ``[更新時刻(ns), 直下のファイルサイズ合計, 直下のファイル数, サブディレクトリ名]``
+    を記録します。
+
+    ディレクトリの更新時刻はエントリの追加・削除・名前変更でのみ変化するため、
+    既存ファイルがその場で書き換えられた場合の増減は ``full=True`` で
+    スキャンするまで反映されません。キャッシュのようにファイルの追加・削除が
+    中心のディレクトリを想定しています。
+    """
+
+    def __init__(self, root: str, snapshot_path: Optional[str] = None) -> None:
+        """インデックスを初期化
+
+        Args:
+            root: スキャン対象のルートディレクトリ
+            snapshot_path: スナップショットの保存先。省略時は
+                ``app_data_dir()`` 配下にルートパスごとのファイルを作成
+        """
+        self.root = os.path.abspath(root)
+        if snapshot_path is None:
+            digest = hashlib.md5(self.root.encode("utf-8")).hexdigest()[:12]
+            snapshot_path = os.path.join(app_data_dir(), f"disk_index_{digest}.json.gz")
+        self.snapshot_path = snapshot_path
+
+    def scan(self, full: bool = False, top: int = 20) -> Dict[str, Any]:
+        """ルート以下をスキャンしてスナップショットを更新
+
+        Args:
+            full: Trueの場合は更新時刻に関わらずすべてのディレクトリを再走査
+            top: 増加量・サイズの上位何件を返すか
+
+        Returns:
+            合計サイズ・ファイル数、再走査/再利用したディレクトリ数、
+            前回からの増加量 ``growth``（直下のファイルの増減が大きい順）と
+            最大ディレクトリ ``largest`` を含む辞書
+        """
+        start = time.perf_counter()
+        old_dirs = self.load()
+        previous = {} if full else old_dirs
+
+        dirs: Dict[str, List[Any]] = {}
+        scanned = 0
+        reused = 0
+        errors = 0
+
+        stack = [ROOT_KEY]
+        while stack:
+            rel = stack.pop()
+            path = self.root if rel == ROOT_KEY else os.path.join(self.root, rel)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                errors += 1
+                continue
+
+            prev = previous.get(rel)
+            if prev is not None and prev[0] == mtime_ns:
+                record = prev
+                reused += 1
+            else:
+                record = self._scan_dir(path, mtime_ns)
+                if record is None:
+                    errors += 1
+                    continue
+                scanned += 1
+
+            dirs[rel] = record
+            for name in record[3]:
+                stack.append(name if rel == ROOT_KEY else os.path.join(rel, name))
+
+        self.save(dirs)
+
+        totals = self.compute_totals(dirs)
+        old_totals = self.compute_totals(old_dirs)
+        root_size, root_files = totals.get(ROOT_KEY, (0, 0))
+        return {
+            "root": self.root,
+            "total_size": root_size,
+            "total_files": root_files,
+            "total_delta": root_size - old_totals.get(ROOT_KEY, (0, 0))[0],
+            "dirs": len(dirs),
+            "dirs_scanned": scanned,
+            "dirs_reused": reused,
+            "errors": errors,
+            "elapsed": time.perf_counter() - start,
+            "growth": self._growth(old_dirs, dirs, top),
+            "largest": self._largest(totals, top),
+        }
+
+    def load(self) -> Dict[str, List[Any]]:
+        """保存済みのスナップショットを読み込む
+
+        Returns:
+            ディレクトリごとの記録。存在しない場合は空辞書
+        """
+        try:
+            with gzip.open(self.snapshot_path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != SNAPSHOT_VERSION or data.get("root") != self.root:
+            return {}
+        return data.get("dirs", {})
+
+    def save(self, dirs: Dict[str, List[Any]]) -> None:
+        """スナップショットを保存
+
+        Args:
+            dirs: ディレクトリごとの記録
+        """
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "root": self.root,
+            "scanned_at": time.time(),
+            "dirs": dirs,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            tmp_path = self.snapshot_path + ".tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def compute_totals(dirs: Dict[str, List[Any]]) -> Dict[str, tuple]:
+        """ディレクトリごとのサブツリー合計を計算
+
+        Args:
+            dirs: ディレクトリごとの記録
+
+        Returns:
+            相対パスをキー、``(合計サイズ, 合計ファイル数)`` を値とする辞書
+        """
+        totals: Dict[str, tuple] = {}
+        # 深いディレクトリから順に集計する（ルートは最後）
+        def depth(rel: str) -> int:
+            return -1 if rel == ROOT_KEY else rel.count(os.sep)
+
+        for rel in sorted(dirs, key=depth, reverse=True):
+            _, size, files, subdirs = dirs[rel]
+            for name in subdirs:
+                child = name if rel == ROOT_KEY else os.path.join(rel, name)
+                if child in totals:
+                    child_size, child_files = totals[child]
+                    size += child_size
+                    files += child_files
+            totals[rel] = (size, files)
+        return totals
+
+    @staticmethod
+    def _scan_dir(path: str, mtime_ns: int) -> Optional[List[Any]]:
+        size = 0
+        files = 0
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        else:
+                            size += entry.stat(follow_symlinks=False).st_size
+                            files += 1
+                    except OSError:
+                        pass
+        except OSError:
+            return None
+        return [mtime_ns, size, files, subdirs]
+
+    @staticmethod
+    def _growth(
+        old_dirs: Dict[str, List[Any]], dirs: Dict[str, List[Any]], top: int
+    ) -> List[Dict[str, Any]]:
+        # 祖先ディレクトリが並ばないよう、直下のファイルの増減で比較する
+        growth = []
+        for rel in set(old_dirs) | set(dirs):
+            old_size = old_dirs[rel][1] if rel in old_dirs else 0
+            new_size = dirs[rel][1] if rel in dirs else 0
+            if new_size != old_size:
+                growth.append(
+                    {
+                        "path": rel,
+                        "old_size": old_size,
+                        "new_size": new_size,
+                        "delta": new_size - old_size,
+                    }
+                )
+        growth.sort(key=lambda g: g["delta"], reverse=True)
+        return growth[:top]
+
+    @staticmethod
+    def _largest(totals: Dict[str, tuple], top: int) -> List[Dict[str, Any]]:
+        items = [
+            {"path": rel, "size": size, "files": files}
+            for rel, (size, files) in totals.items()
+            if rel != ROOT_KEY
+        ]
+        items.sort(key=lambda i: i["size"], reverse=True)
+        return items[:top]
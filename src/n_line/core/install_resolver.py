@@ -0,0 +1,160 @@
+"""インストールパス解決モジュール
+
+LINEのインストールディレクトリと起動用実行ファイルの解決結果を
+ディスクに保存し、次回以降は1回のstatで再検証するモジュールです。
+"""
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+LAUNCHER_CANDIDATES: List[List[str]] = [
+    ["LineLauncher.exe"],
+    ["current", "LINE.exe"],
+    ["LINE.exe"],
+]
+"""起動用実行ファイルの候補（インストールディレクトリからの相対パス、優先順位順）"""
+
+
+def app_data_dir() -> str:
+    """N-LINEのデータ保存先ディレクトリを取得
+
+    Returns:
+        ``%LOCALAPPDATA%\\N-LINE``
+        （LOCALAPPDATAが未定義の場合はホームディレクトリ配下）
+    """
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "N-LINE")
+
+
+def default_cache_file() -> str:
+    """解決結果の保存先ファイルパスを取得
+
+    Returns:
+        ``app_data_dir()`` 配下の ``install_path.json``
+    """
+    return os.path.join(app_data_dir(), "install_path.json")
+
+
+def find_launcher(install_dir: str) -> Optional[str]:
+    """インストールディレクトリから起動用実行ファイルを探す
+
+    Args:
+        install_dir: インストールディレクトリ
+
+    Returns:
+        見つかった実行ファイルのパス。見つからない場合はNone
+    """
+    for parts in LAUNCHER_CANDIDATES:
+        candidate = os.path.join(install_dir, *parts)
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+class InstallPathResolver:
+    """インストールパスの解決結果を永続化するクラス
+
+    保存済みの実行ファイルの更新時刻とサイズが一致する限り、
+    プロセススキャンやパス探索を行わずに結果を返します。
+    LINEの更新などで実行ファイルが変わった場合のみ再探索します。
+    """
+
+    def __init__(
+        self,
+        discover: Callable[[], Optional[str]],
+        cache_file: Optional[str] = None,
+    ) -> None:
+        """リゾルバーを初期化
+
+        Args:
+            discover: インストールディレクトリを探索する関数（低速）
+            cache_file: 解決結果の保存先。省略時は ``default_cache_file()``
+        """
+        self.discover = discover
+        self.cache_file = cache_file or default_cache_file()
+        self._lock = threading.Lock()
+        self._entry: Optional[Dict] = None
+        self._loaded = False
+
+    def resolve(self, refresh: bool = False) -> Optional[Dict]:
+        """インストールディレクトリと起動用実行ファイルを解決
+
+        Args:
+            refresh: Trueの場合は保存済みの結果を使わずに再探索
+
+        Returns:
+            ``install_dir`` と ``launcher`` を含む辞書。
+            インストールディレクトリが見つからない場合はNone
+        """
+        with self._lock:
+            if not self._loaded:
+                self._entry = self._load()
+                self._loaded = True
+
+            if not refresh and self._entry and self._is_valid(self._entry):
+                return {
+                    "install_dir": self._entry["install_dir"],
+                    "launcher": self._entry["launcher"],
+                }
+
+            install_dir = self.discover()
+            if not install_dir:
+                self._entry = None
+                return None
+
+            launcher = find_launcher(install_dir)
+            entry = {"install_dir": install_dir, "launcher": launcher}
+            if launcher:
+                try:
+                    st = os.stat(launcher)
+                    entry["mtime_ns"] = st.st_mtime_ns
+                    entry["size"] = st.st_size
+                    self._save(entry)
+                except OSError:
+                    pass
+            self._entry = entry
+            return {"install_dir": install_dir, "launcher": launcher}
+
+    def invalidate(self) -> None:
+        """保存済みの結果を破棄"""
+        with self._lock:
+            self._entry = None
+            self._loaded = True
+            try:
+                os.remove(self.cache_file)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _is_valid(entry: Dict) -> bool:
+        launcher = entry.get("launcher")
+        if not launcher or "mtime_ns" not in entry:
+            return False
+        try:
+            st = os.stat(launcher)
+        except OSError:
+            return False
+        return st.st_mtime_ns == entry["mtime_ns"] and st.st_size == entry["size"]
+
+    def _load(self) -> Optional[Dict]:
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or "install_dir" not in entry:
+            return None
+        return entry
+
+    def _save(self, entry: Dict) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_path = self.cache_file + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError:
+            pass
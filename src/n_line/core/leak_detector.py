@@ -0,0 +1,264 @@
+"""リーク検出モジュール
+
+リソースサンプラーの記録からLINEプロセスのメモリ（RSS）とハンドル数の
+増加傾向を求め、継続的な増加を検出するモジュールです。検出時には
+再起動の予約などの処理を実行できます。
+
+使用例:
+    detector = LeakDetector(action=ScheduledRelaunch(delay=600))
+    detector.start(interval=60)
+"""
+import math
+import operator
+import threading
+import time
+from array import array
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import psutil
+
+from .debug_tools import DebugTools
+from .line_manager import LineManager
+from .resource_sampler import ResourceSampler
+
+LeakAction = Callable[[List[Dict[str, Any]]], None]
+"""検出結果のリストを受け取る処理"""
+
+DEFAULT_THRESHOLDS = {
+    "rss": 50 * 1024 * 1024,
+    "handles": 200,
+}
+"""メトリクスごとの増加量のしきい値（1時間あたり）"""
+
+
+def linear_trend(xs: array, ys: array) -> Tuple[float, float]:
+    """最小二乗法で傾きと決定係数を計算
+
+    合計は ``map`` と ``math.fsum`` でまとめて計算し、値ごとの
+    Pythonループは使用しません。桁落ちを避けるため、先頭の値を
+    原点として計算します。
+
+    Args:
+        xs: 時刻（秒）
+        ys: 値
+
+    Returns:
+        (1秒あたりの傾き, 決定係数R²)。計算できない場合は (0.0, 0.0)
+    """
+    n = len(ys)
+    if n < 2 or len(xs) != n:
+        return 0.0, 0.0
+
+    xs = array("d", map(operator.sub, xs, repeat(xs[0], n)))
+    ys = array("d", map(operator.sub, ys, repeat(ys[0], n)))
+    sx = math.fsum(xs)
+    sy = math.fsum(ys)
+    sxx = math.fsum(map(operator.mul, xs, xs))
+    syy = math.fsum(map(operator.mul, ys, ys))
+    sxy = math.fsum(map(operator.mul, xs, ys))
+
+    var_x = n * sxx - sx * sx
+    var_y = n * syy - sy * sy
+    if var_x <= 0 or var_y <= 0:
+        return 0.0, 0.0
+    cov = n * sxy - sx * sy
+    return cov / var_x, (cov * cov) / (var_x * var_y)
+
+
+def current_line_args() -> List[str]:
+    """起動中のLINEメインプロセスのコマンドライン引数を取得
+
+    ``--type=`` を持つ子プロセス（レンダラーなど）は除外します。
+
+    Returns:
+        実行ファイルを除いた引数のリスト。取得できない場合は空リスト
+    """
+    for proc in LineManager.get_line_processes():
+        try:
+            cmdline = proc.cmdline()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        if not any(arg.startswith("--type=") for arg in cmdline[1:]):
+            return cmdline[1:]
+    return []
+
+
+class ScheduledRelaunch:
+    """検出時に現在の起動引数でLINEの再起動を予約する処理
+
+    予約中に再度検出されても、予約は1件のみ保持されます。
+    """
+
+    def __init__(
+        self,
+        delay: float = 300.0,
+        relaunch: Optional[Callable[[List[str]], str]] = None,
+    ) -> None:
+        """処理を初期化
+
+        Args:
+            delay: 検出から再起動までの待機時間（秒）
+            relaunch: 再起動する関数。省略時は ``LineManager.relaunch_with_params``
+        """
+        self.delay = delay
+        self.relaunch = relaunch or LineManager.relaunch_with_params
+        self.last_message: Optional[str] = None
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def pending(self) -> bool:
+        """再起動が予約済みかどうか"""
+        return self._timer is not None and self._timer.is_alive()
+
+    def __call__(self, findings: List[Dict[str, Any]]) -> None:
+        if self.pending:
+            return
+        # 引数は検出時点のものを使用する（再起動直前にはLINEが終了している可能性がある）
+        args = current_line_args()
+        self._timer = threading.Timer(self.delay, self._run, args=(args,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def cancel(self) -> None:
+        """予約を取り消す"""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def _run(self, args: List[str]) -> None:
+        self.last_message = self.relaunch(args)
+
+
+class LeakDetector:
+    """継続的なメモリ・ハンドルの増加を検出するクラス
+
+    ``windows`` で指定したすべての期間で、増加量（1時間あたり）がしきい値を超え、
+    かつ決定係数が ``min_r2`` 以上の場合に「継続的な増加」と判定します。
+    一時的な増加やばらつきの大きい変動は検出しません。
+    """
+
+    def __init__(
+        self,
+        sampler: Optional[ResourceSampler] = None,
+        windows: Sequence[float] = (900.0, 3600.0),
+        thresholds: Optional[Dict[str, float]] = None,
+        min_r2: float = 0.6,
+        min_samples: int = 30,
+        action: Optional[LeakAction] = None,
+        cooldown: float = 3600.0,
+    ) -> None:
+        """検出器を初期化
+
+        Args:
+            sampler: 使用するサンプラー。省略時は ``DebugTools.get_resource_sampler()``
+            windows: 判定に使用する期間（秒）のリスト
+            thresholds: メトリクス名と1時間あたりの増加量しきい値の辞書
+            min_r2: 増加傾向とみなす決定係数の下限
+            min_samples: 期間内に必要なサンプル数
+            action: 検出時に実行する処理
+            cooldown: 処理を再実行するまでの最短間隔（秒）
+
+        Note:
+            サンプラーの保持期間（間隔×容量）は最長の期間以上である必要があります。
+            数時間単位で判定する場合は、間隔を長くしたサンプラーを渡してください。
+        """
+        self.sampler = sampler or DebugTools.get_resource_sampler()
+        self.windows = tuple(windows)
+        self.thresholds = dict(DEFAULT_THRESHOLDS if thresholds is None else thresholds)
+        self.min_r2 = min_r2
+        self.min_samples = min_samples
+        self.action = action
+        self.cooldown = cooldown
+
+        self.last_findings: List[Dict[str, Any]] = []
+        self.last_action_time: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def analyze(self, pid: int, metric: str) -> Optional[Dict[str, Any]]:
+        """1プロセス・1メトリクスの増加傾向を判定
+
+        Args:
+            pid: プロセスID
+            metric: メトリクス名
+
+        Returns:
+            継続的な増加を検出した場合は検出結果の辞書、それ以外はNone
+        """
+        threshold = self.thresholds[metric]
+        results = []
+        for window in self.windows:
+            # 時刻と値は同じ範囲で取得し、取得できなかったサンプル（NaN）は除外済み
+            times, values = self.sampler.get_samples(pid, metric, window)
+            # 期間の大半をカバーする記録がない場合は判定しない
+            if len(values) < self.min_samples or times[-1] - times[0] < 0.8 * window:
+                return None
+            slope, r2 = linear_trend(times, values)
+            per_hour = slope * 3600.0
+            if per_hour < threshold or r2 < self.min_r2:
+                return None
+            results.append(
+                {"window": window, "per_hour": per_hour, "r2": r2, "samples": len(values)}
+            )
+
+        return {
+            "pid": pid,
+            "metric": metric,
+            "per_hour": min(r["per_hour"] for r in results),
+            "threshold": threshold,
+            "current": values[-1],
+            "windows": results,
+        }
+
+    def check(self) -> List[Dict[str, Any]]:
+        """サンプリング中の全プロセスを判定し、必要に応じて処理を実行
+
+        Returns:
+            検出結果のリスト
+        """
+        findings = []
+        for pid in self.sampler.active_pids():
+            for metric in self.thresholds:
+                finding = self.analyze(pid, metric)
+                if finding:
+                    findings.append(finding)
+        self.last_findings = findings
+
+        if findings and self.action:
+            now = time.time()
+            if self.last_action_time is None or now - self.last_action_time >= self.cooldown:
+                self.last_action_time = now
+                self.action(findings)
+        return findings
+
+    def start(self, interval: float = 60.0) -> None:
+        """バックグラウンドで定期的に判定
+
+        Args:
+            interval: 判定間隔（秒）
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="LeakDetector")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        """定期判定を停止
+
+        Args:
+            timeout: スレッド終了を待つ最大時間（秒）
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.check()
+            except Exception:
+                pass
@@ -4,13 +4,18 @@ LINEアプリケーションの起動、終了、パス取得、キャッシュ
 基本操作を提供するモジュールです。
 """
 import os
-import shutil
-import subprocess
+import threading
 import time
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import psutil
 
+from .backend import get_backend
+from .cache_cleaner import CacheCleaner, ProgressCallback, format_bytes
+from .install_resolver import InstallPathResolver, default_cache_file
+from .process_cache import ProcessCache
+from .shutdown_engine import ShutdownEngine
+
 
 class LineManager:
     """LINEプロセスとインストールパスを管理するクラス
@@ -22,56 +27,142 @@ class LineManager:
     PROCESS_NAME = "LINE.exe"
     """LINEプロセスの実行ファイル名"""
 
+    PROCESS_CACHE_TTL = 2.0
+    """プロセス検索キャッシュの有効期間（秒）"""
+
+    _process_cache: Optional[ProcessCache] = None
+    _install_resolver: Optional[InstallPathResolver] = None
+
     @staticmethod
-    def get_line_processes() -> List[psutil.Process]:
+    def get_process_cache() -> ProcessCache:
+        """プロセス検索キャッシュを取得（初回呼び出し時に作成）
+
+        バックエンドが差し替えられた場合は、新しいプロセスソースで作り直します。
+
+        Returns:
+            LINEプロセス用のProcessCache
+        """
+        source = get_backend().processes
+        cache = LineManager._process_cache
+        if cache is None or cache.source is not source:
+            LineManager._process_cache = ProcessCache(
+                LineManager.PROCESS_NAME, source=source, ttl=LineManager.PROCESS_CACHE_TTL
+            )
+        return LineManager._process_cache
+
+    @staticmethod
+    def get_line_processes(use_cache: bool = True) -> List[psutil.Process]:
         """実行中のLINEプロセスのリストを取得
 
+        キャッシュが有効な場合はプロセステーブルを走査せずに返します。
+
+        Args:
+            use_cache: Falseの場合はキャッシュを破棄してフルスキャン
+
         Returns:
             LINEプロセスのリスト。見つからない場合は空リスト
         """
-        line_processes = []
-        for proc in psutil.process_iter(["pid", "name", "exe"]):
-            try:
-                if proc.info["name"] == LineManager.PROCESS_NAME:
-                    line_processes.append(proc)
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-        return line_processes
+        cache = LineManager.get_process_cache()
+        if not use_cache:
+            cache.invalidate()
+        return cache.get()
 
     @staticmethod
-    def is_line_running() -> bool:
+    def is_line_running(use_cache: bool = False) -> bool:
         """LINEが実行中かどうかを確認
 
+        キャッシュは既知のPIDしか再確認しないため、新しく起動したLINEを
+        TTLの間見逃します。起動やキャッシュ削除の可否判定に使われるため、
+        既定ではキャッシュを使わずにフルスキャンします。
+
+        Args:
+            use_cache: Trueの場合はプロセス検索キャッシュを使用（表示用など）
+
         Returns:
             LINEが実行中の場合はTrue、そうでなければFalse
         """
-        return len(LineManager.get_line_processes()) > 0
+        return len(LineManager.get_line_processes(use_cache=use_cache)) > 0
 
     @staticmethod
-    def kill_line() -> bool:
-        """すべてのLINEプロセスを終了
+    def kill_line(timeout: float = 3.0) -> bool:
+        """すべてのLINEプロセスを子プロセスを含めて終了
+
+        Args:
+            timeout: terminate後に終了を待つ時間の上限（秒）
 
         Returns:
             プロセスが見つかり終了処理を試みた場合はTrue、
             プロセスが見つからなかった場合はFalse
         """
-        procs = LineManager.get_line_processes()
+        return LineManager.shutdown_line(timeout=timeout) is not None
+
+    @staticmethod
+    def shutdown_line(
+        timeout: float = 3.0, kill_timeout: float = 2.0
+    ) -> Optional[Dict[str, Any]]:
+        """すべてのLINEプロセスとその子プロセスを終了し、結果を報告
+
+        Args:
+            timeout: terminate後の共通待機期限（秒）
+            kill_timeout: kill後の待機期限（秒）
+
+        Returns:
+            ShutdownEngine.shutdown() の結果。LINEが実行中でない場合はNone
+        """
+        procs = LineManager.get_line_processes(use_cache=False)
         if not procs:
-            return False
+            return None
+        return LineManager.stop_processes(procs, timeout, kill_timeout)
 
-        for proc in procs:
-            try:
-                proc.terminate()
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        return True
+    @staticmethod
+    def get_install_resolver() -> InstallPathResolver:
+        """インストールパスリゾルバーを取得（初回呼び出し時に作成）
+
+        バックエンドが差し替えられ、解決結果の保存先が変わった場合は作り直します。
+
+        Returns:
+            解決結果をディスクに保存するInstallPathResolver
+        """
+        cache_file = get_backend().install_cache_file or default_cache_file()
+        resolver = LineManager._install_resolver
+        if resolver is None or resolver.cache_file != cache_file:
+            LineManager._install_resolver = InstallPathResolver(
+                LineManager._discover_install_path, cache_file=cache_file
+            )
+        return LineManager._install_resolver
 
     @staticmethod
-    def get_install_path() -> Optional[str]:
+    def get_install_path(refresh: bool = False) -> Optional[str]:
         """LINEのインストールパスを取得
 
-        実行中のプロセスから取得を試み、失敗した場合は
-        一般的なパスを確認します。
+        保存済みの解決結果が有効であればそれを返し、無効な場合のみ
+        実行中のプロセスや一般的なパスから探索します。
+
+        Args:
+            refresh: Trueの場合は保存済みの結果を使わずに再探索
+
+        Returns:
+            インストールパス。見つからない場合はNone
+        """
+        resolved = LineManager.get_install_resolver().resolve(refresh)
+        return resolved["install_dir"] if resolved else None
+
+    @staticmethod
+    def get_launcher_path(refresh: bool = False) -> Optional[str]:
+        """LINEの起動用実行ファイルのパスを取得
+
+        Args:
+            refresh: Trueの場合は保存済みの結果を使わずに再探索
+
+        Returns:
+            実行ファイルのパス。見つからない場合はNone
+        """
+        resolved = LineManager.get_install_resolver().resolve(refresh)
+        return resolved["launcher"] if resolved else None
+
+    @staticmethod
+    def _discover_install_path() -> Optional[str]:
+        """実行中のプロセスと一般的なパスからインストールパスを探索
 
         Returns:
             インストールパス。見つからない場合はNone
@@ -97,39 +188,86 @@ class LineManager:
         return None
 
     @staticmethod
-    def clear_cache() -> str:
-        """LINEのキャッシュディレクトリをクリア
+    def get_cache_path() -> Optional[str]:
+        """LINEのキャッシュディレクトリのパスを取得
 
         Returns:
-            処理結果を示すメッセージ
+            ``%LOCALAPPDATA%\\LINE\\Cache`` のパス。ユーザープロファイルが
+            不明な場合はNone
         """
         user_profile = os.environ.get("USERPROFILE")
         if not user_profile:
-            return "Error: Could not determine user profile."
+            return None
+        return os.path.join(user_profile, "AppData", "Local", "LINE", "Cache")
 
-        # キャッシュパス: %LOCALAPPDATA%\LINE\Cache
-        cache_path = os.path.join(user_profile, "AppData", "Local", "LINE", "Cache")
+    @staticmethod
+    def clear_cache_report(
+        dry_run: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+        workers: int = 4,
+    ) -> Dict[str, Any]:
+        """LINEのキャッシュディレクトリをクリアし、結果を辞書で返す
+
+        フォルダ自体は削除せず、内容のみを削除します（安全のため）。
+
+        Args:
+            dry_run: Trueの場合は削除せず、解放されるサイズのみ集計
+            progress_callback: 進捗（ファイル数・バイト数）を報告する関数
+            cancel_event: セットされると処理を中断するイベント
+            workers: 削除に使用するスレッド数
+
+        Returns:
+            CacheCleaner.clean() の結果に ``message`` を加えた辞書
+        """
+        cache_path = LineManager.get_cache_path()
+        if not cache_path:
+            return {"message": "Error: Could not determine user profile.", "files": 0}
 
         if not os.path.exists(cache_path):
-            return f"Cache directory not found at: {cache_path}"
+            return {"message": f"Cache directory not found at: {cache_path}", "files": 0}
+
+        cleaner = CacheCleaner(
+            workers=workers,
+            dry_run=dry_run,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event,
+        )
+        result = cleaner.clean(cache_path)
+
+        summary = f"{result['files']} files ({format_bytes(result['bytes'])})"
+        if result["dry_run"]:
+            message = f"Dry run: {summary} would be freed."
+        elif result["cancelled"]:
+            message = f"Cancelled: cleared {summary} before cancellation."
+        else:
+            message = f"Successfully cleared {summary} from cache."
+        if result["errors"]:
+            message += f" ({result['errors']} errors)"
+        result["message"] = message
+        return result
 
-        try:
-            # フォルダ自体は削除せず、内容のみを削除（安全のため）
-            count = 0
-            for filename in os.listdir(cache_path):
-                file_path = os.path.join(cache_path, filename)
-                try:
-                    if os.path.isfile(file_path) or os.path.islink(file_path):
-                        os.unlink(file_path)
-                        count += 1
-                    elif os.path.isdir(file_path):
-                        shutil.rmtree(file_path)
-                        count += 1
-                except Exception as e:
-                    print(f"Failed to delete {file_path}. Reason: {e}")
-            return f"Successfully cleared {count} items from cache."
-        except Exception as e:
-            return f"Error clearing cache: {str(e)}"
+    @staticmethod
+    def clear_cache(
+        dry_run: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> str:
+        """LINEのキャッシュディレクトリをクリア
+
+        Args:
+            dry_run: Trueの場合は削除せず、解放されるサイズのみ集計
+            progress_callback: 進捗（ファイル数・バイト数）を報告する関数
+            cancel_event: セットされると処理を中断するイベント
+
+        Returns:
+            処理結果を示すメッセージ
+        """
+        return LineManager.clear_cache_report(
+            dry_run=dry_run,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event,
+        )["message"]
 
     @staticmethod
     def launch_line() -> str:
@@ -145,57 +283,111 @@ class LineManager:
         if not install_path:
             return "Error: Could not find LINE installation path."
 
-        # 実行ファイルの候補（優先順位順）
-        candidates = [
-            os.path.join(install_path, "LineLauncher.exe"),
-            os.path.join(install_path, "current", "LINE.exe"),
-            os.path.join(install_path, "LINE.exe"),
-        ]
-
-        exe_to_run = None
-        for candidate in candidates:
-            if os.path.exists(candidate):
-                exe_to_run = candidate
-                break
-
+        # 実行ファイルの候補は優先順位順に確認済み（InstallPathResolver）
+        exe_to_run = LineManager.get_launcher_path()
         if not exe_to_run:
             return f"Error: No valid LINE executable found in {install_path}"
 
         try:
-            os.startfile(exe_to_run)
+            get_backend().launch(exe_to_run)
+            LineManager.get_process_cache().invalidate()
             return "Success: LINE launching..."
         except Exception as e:
             return f"Error launching LINE: {str(e)}"
 
     @staticmethod
-    def relaunch_with_params(args: List[str]) -> str:
-        """LINEを終了し、指定された引数で再起動
+    def stop_processes(
+        procs: List[psutil.Process],
+        timeout: float = 5.0,
+        kill_timeout: float = 2.0,
+    ) -> Dict[str, Any]:
+        """プロセスツリーを終了させ、実際に終了するまで待機
+
+        子プロセスを含むツリー全体に terminate() を一斉送信して
+        ``timeout`` 秒まで終了を待ち、残ったプロセスには kill() を送信して
+        ``kill_timeout`` 秒まで待ちます。
+
+        Args:
+            procs: 終了させるプロセスのリスト
+            timeout: terminate後の待機時間の上限（秒）
+            kill_timeout: kill後の待機時間の上限（秒）
+
+        Returns:
+            各フェーズの所要時間（秒）とPIDごとの終了結果を含む辞書
+        """
+        cache = LineManager.get_process_cache()
+        engine = ShutdownEngine(cache.source)
+        result = engine.shutdown(procs, timeout=timeout, kill_timeout=kill_timeout)
+        cache.invalidate()
+        return result
+
+    @staticmethod
+    def relaunch_line(args: List[str], timeout: float = 5.0) -> Dict[str, Any]:
+        """LINEを終了し、終了を確認してから指定された引数で再起動
+
+        固定時間の待機は行わず、プロセスの終了を検出した時点で起動します。
 
         Args:
             args: 起動時に渡すコマンドライン引数のリスト
+            timeout: terminate後に終了を待つ時間の上限（秒）
 
         Returns:
-            処理結果を示すメッセージ
+            ``success``、``message``、フェーズ別の所要時間 ``timings``
+            （terminate / wait / kill / launch / total）を含む辞書
         """
-        LineManager.kill_line()
-        # クリーンアップのため少し待機
-        time.sleep(1)
+        total_start = time.perf_counter()
+        result: Dict[str, Any] = {"success": False, "message": "", "timings": {}}
 
+        # 終了後はプロセスから取得できないため、先にパスを解決しておく。
+        # 起動できない場合はLINEを終了させずにエラーを返す
+        procs = LineManager.get_line_processes(use_cache=False)
         install_path = LineManager.get_install_path()
         if not install_path:
-            return "Error: Could not find LINE installation path."
-
-        # 実行ファイルを探す
-        exe_path = os.path.join(install_path, "LineLauncher.exe")
-        if not os.path.exists(exe_path):
-            exe_path = os.path.join(install_path, "LINE.exe")
-
-        if not os.path.exists(exe_path):
-            return "Error: LINE executable not found."
+            result["message"] = "Error: Could not find LINE installation path."
+            return result
+
+        exe_path = LineManager.get_launcher_path()
+        if not exe_path:
+            result["message"] = "Error: LINE executable not found."
+            return result
+
+        stop = LineManager.stop_processes(procs, timeout=timeout)
+        timings = dict(stop["timings"])
+        timings.pop("total", None)
+        result["timings"] = timings
+        result["stopped"] = stop
+
+        if stop["remaining"]:
+            result["message"] = (
+                f"Error: LINE did not exit (PIDs: {stop['remaining']})"
+            )
+            return result
 
         try:
-            cmd = [exe_path] + args
-            subprocess.Popen(cmd, cwd=install_path, shell=False)
-            return f"Restarted LINE with: {' '.join(args)}"
+            start = time.perf_counter()
+            get_backend().launch(exe_path, list(args), cwd=install_path)
+            LineManager.get_process_cache().invalidate()
+            timings["launch"] = time.perf_counter() - start
         except Exception as e:
-            return f"Error launching LINE: {e}"
+            result["message"] = f"Error launching LINE: {e}"
+            return result
+
+        timings["total"] = time.perf_counter() - total_start
+        result["success"] = True
+        result["message"] = (
+            f"Success: Restarted LINE with: {' '.join(args)} "
+            f"({timings['total']:.2f}s)"
+        )
+        return result
+
+    @staticmethod
+    def relaunch_with_params(args: List[str]) -> str:
+        """LINEを終了し、指定された引数で再起動
+
+        Args:
+            args: 起動時に渡すコマンドライン引数のリスト
+
+        Returns:
+            処理結果を示すメッセージ
+        """
+        return LineManager.relaunch_line(args)["message"]
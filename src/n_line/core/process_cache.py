@@ -0,0 +1,100 @@
+"""プロセスキャッシュモジュール
+
+PIDと起動時刻（create_time）をキーにしたプロセス検索結果のキャッシュを
+提供するモジュールです。キャッシュが無効な場合のみプロセステーブル全体を
+スキャンします。
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .process_source import ProcessSource, PsutilProcessSource
+
+
+class ProcessCache:
+    """プロセス名で検索したプロセス一覧のキャッシュ
+
+    キャッシュは以下の場合に無効とみなされ、フルスキャンが実行されます。
+
+    - 最後のフルスキャンから ``ttl`` 秒が経過した
+    - キャッシュ済みのPIDが終了した、または別プロセスに再利用された
+    - ``invalidate()`` が呼ばれた
+    """
+
+    def __init__(
+        self,
+        process_name: str,
+        source: Optional[ProcessSource] = None,
+        ttl: float = 2.0,
+    ) -> None:
+        """キャッシュを初期化
+
+        Args:
+            process_name: 検索対象のプロセス名
+            source: プロセスソース。省略時はpsutilを使用
+            ttl: キャッシュの有効期間（秒）。0の場合は常にフルスキャン
+        """
+        self.process_name = process_name
+        self.source = source or PsutilProcessSource()
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[int, Optional[float]], Any] = {}
+        self._stamp: Optional[float] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def get(self) -> List[Any]:
+        """プロセス一覧を取得
+
+        Returns:
+            一致したプロセスのリスト
+        """
+        with self._lock:
+            if self._is_valid():
+                self.hits += 1
+                return list(self._entries.values())
+
+            self.misses += 1
+            self._entries = {}
+            for proc in self.source.find_by_name(self.process_name):
+                key = (proc.pid, proc.info.get("create_time"))
+                self._entries[key] = proc
+            self._stamp = time.monotonic()
+            return list(self._entries.values())
+
+    def invalidate(self) -> None:
+        """キャッシュを破棄し、次回の取得でフルスキャンさせる"""
+        with self._lock:
+            self._stamp = None
+
+    def stats(self) -> Dict[str, Any]:
+        """キャッシュの統計情報を取得
+
+        Returns:
+            ヒット数、ミス数、PID再利用・終了による無効化数、ヒット率
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "hit_rate": self.hits / total if total else 0.0,
+                "cached_pids": sorted(pid for pid, _ in self._entries),
+            }
+
+    def _is_valid(self) -> bool:
+        if self._stamp is None or self.ttl <= 0:
+            return False
+        if time.monotonic() - self._stamp >= self.ttl:
+            return False
+
+        # キャッシュ済みPIDの生存とPID再利用を確認
+        for pid, create_time in self._entries:
+            if not self.source.is_alive(pid, create_time):
+                self.stale += 1
+                return False
+        return True
@@ -0,0 +1,382 @@
+"""プロセスソースモジュール
+
+プロセステーブルへのアクセスを抽象化するモジュールです。
+実環境ではpsutilを使用し、テストやベンチマークでは
+メモリ上の疑似プロセステーブルに差し替えることができます。
+"""
+import contextlib
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import psutil
+
+DEFAULT_ATTRS = ["pid", "name", "exe", "create_time"]
+"""フルスキャン時に取得するプロセス属性"""
+
+
+class ProcessSource:
+    """プロセステーブルへのアクセスを提供する基底クラス
+
+    サブクラスは ``iter_processes`` と ``is_alive`` を実装します。
+    ``iter_processes`` が返すオブジェクトは ``pid`` と ``info`` 辞書を
+    持つ必要があります（``psutil.process_iter`` と同じ形式）。
+    """
+
+    def iter_processes(self, attrs: Optional[List[str]] = None) -> Iterator[Any]:
+        """プロセステーブル全体を走査
+
+        Args:
+            attrs: ``info`` 辞書に格納する属性名のリスト
+
+        Returns:
+            プロセスオブジェクトのイテレータ
+        """
+        raise NotImplementedError
+
+    def is_alive(self, pid: int, create_time: Optional[float] = None) -> bool:
+        """指定されたPIDのプロセスが生存しているかを安価に確認
+
+        Args:
+            pid: プロセスID
+            create_time: 既知の起動時刻。指定された場合はPID再利用も検出します
+
+        Returns:
+            プロセスが生存していればTrue
+        """
+        raise NotImplementedError
+
+    def wait_procs(
+        self,
+        procs: List[Any],
+        timeout: Optional[float] = None,
+        callback: Optional[Callable[[Any], None]] = None,
+    ) -> Tuple[List[Any], List[Any]]:
+        """プロセスの終了を待機（``psutil.wait_procs`` と同じ形式）
+
+        Args:
+            procs: 待機するプロセスのリスト
+            timeout: 待機時間の上限（秒）
+            callback: プロセスの終了を検出するたびに呼ばれる関数
+
+        Returns:
+            (終了したプロセスのリスト, 生存しているプロセスのリスト)
+        """
+        return psutil.wait_procs(procs, timeout=timeout, callback=callback)
+
+    def find_by_name(self, name: str) -> List[Any]:
+        """プロセス名でフルスキャンして一致するプロセスを取得
+
+        Args:
+            name: 実行ファイル名（例: ``LINE.exe``）
+
+        Returns:
+            一致したプロセスのリスト
+        """
+        found = []
+        for proc in self.iter_processes(DEFAULT_ATTRS):
+            try:
+                if proc.info["name"] == name:
+                    found.append(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+        return found
+
+
+class PsutilProcessSource(ProcessSource):
+    """psutilを使用した実環境用のプロセスソース"""
+
+    def iter_processes(self, attrs: Optional[List[str]] = None) -> Iterator[Any]:
+        return psutil.process_iter(attrs or DEFAULT_ATTRS)
+
+    def is_alive(self, pid: int, create_time: Optional[float] = None) -> bool:
+        try:
+            proc = psutil.Process(pid)
+            if create_time is not None and proc.create_time() != create_time:
+                return False  # PIDが再利用されている
+            return proc.status() != psutil.STATUS_ZOMBIE
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return False
+        except psutil.AccessDenied:
+            # 存在はしているが詳細を取得できない
+            return True
+
+
+class FakeMemoryInfo(NamedTuple):
+    """``FakeProcess.memory_info()`` の戻り値"""
+
+    rss: int
+    vms: int
+
+
+class FakeIOCounters(NamedTuple):
+    """``FakeProcess.io_counters()`` の戻り値"""
+
+    read_count: int
+    write_count: int
+    read_bytes: int
+    write_bytes: int
+
+
+class FakeProcess:
+    """疑似プロセステーブル上のプロセス
+
+    ``psutil.Process`` のうち、本アプリケーションが使用するAPIを模倣します。
+    リソース使用量は属性 ``cpu`` ・ ``rss`` ・ ``threads`` ・ ``handles`` ・
+    ``read_bytes`` ・ ``write_bytes`` の値を返すため、テストから任意に変更できます。
+    終了後の呼び出しは ``psutil.NoSuchProcess`` を送出します。
+    """
+
+    def __init__(
+        self,
+        table: "FakeProcessSource",
+        pid: int,
+        name: str,
+        exe: Optional[str] = None,
+        ppid: int = 0,
+        create_time: Optional[float] = None,
+        exit_delay: Optional[float] = 0.0,
+        cmdline: Optional[List[str]] = None,
+    ) -> None:
+        self._table = table
+        self.pid = pid
+        self.ppid_value = ppid
+        self.running = True
+        self.exit_delay = exit_delay
+        self.returncode: Optional[int] = None
+        self._exit_at: Optional[float] = None
+        self.info: Dict[str, Any] = {
+            "pid": pid,
+            "name": name,
+            "exe": exe,
+            "create_time": create_time if create_time is not None else time.time(),
+        }
+        self.cmdline_args = list(cmdline) if cmdline is not None else [exe or name]
+        self.cpu = 0.0
+        self.rss = 150 * 1024 * 1024
+        self.threads = 30
+        self.handles = 500
+        self.read_bytes = 0
+        self.write_bytes = 0
+
+    def _check(self) -> None:
+        if not self.is_running():
+            raise psutil.NoSuchProcess(self.pid)
+
+    def name(self) -> str:
+        return self.info["name"]
+
+    def exe(self) -> Optional[str]:
+        return self.info["exe"]
+
+    def create_time(self) -> float:
+        return self.info["create_time"]
+
+    def ppid(self) -> int:
+        return self.ppid_value
+
+    def cmdline(self) -> List[str]:
+        self._check()
+        return list(self.cmdline_args)
+
+    def status(self) -> str:
+        self._check()
+        return psutil.STATUS_RUNNING
+
+    def oneshot(self) -> Any:
+        return contextlib.nullcontext()
+
+    def cpu_percent(self, interval: Optional[float] = None) -> float:
+        self._check()
+        return self.cpu
+
+    def memory_info(self) -> FakeMemoryInfo:
+        self._check()
+        return FakeMemoryInfo(self.rss, self.rss * 2)
+
+    def num_threads(self) -> int:
+        self._check()
+        return self.threads
+
+    def num_handles(self) -> int:
+        self._check()
+        return self.handles
+
+    def io_counters(self) -> FakeIOCounters:
+        self._check()
+        return FakeIOCounters(0, 0, self.read_bytes, self.write_bytes)
+
+    def as_dict(self, attrs: Optional[List[str]] = None) -> Dict[str, Any]:
+        """指定された属性を辞書で取得（``psutil.Process.as_dict`` と同様）
+
+        Args:
+            attrs: 属性名のリスト。省略時は ``info`` の属性
+
+        Returns:
+            属性名と値の辞書
+        """
+        self._check()
+        result: Dict[str, Any] = {}
+        for attr in attrs or list(self.info):
+            method = getattr(self, attr)
+            result[attr] = method() if callable(method) else method
+        return result
+
+    def is_running(self) -> bool:
+        if self.running and self._exit_at is not None and time.monotonic() >= self._exit_at:
+            self._table.discard(self)
+        return self.running
+
+    def children(self, recursive: bool = False) -> List["FakeProcess"]:
+        return self._table.children_of(self.pid, recursive=recursive)
+
+    def terminate(self) -> None:
+        """終了要求を送信（``exit_delay`` 秒後に終了。Noneの場合は無視）"""
+        if not self.is_running():
+            raise psutil.NoSuchProcess(self.pid)
+        if self.exit_delay is not None and self._exit_at is None:
+            self._exit_at = time.monotonic() + self.exit_delay
+            self.returncode = 0
+        self.is_running()
+
+    def kill(self) -> None:
+        """強制終了（即座に終了）"""
+        if not self.is_running():
+            raise psutil.NoSuchProcess(self.pid)
+        self.returncode = -9
+        self._table.discard(self)
+
+    def __repr__(self) -> str:
+        return f"FakeProcess(pid={self.pid}, name={self.info['name']!r})"
+
+
+class FakeProcessSource(ProcessSource):
+    """メモリ上の疑似プロセステーブル
+
+    テストやベンチマークでプロセスの起動・終了を任意に発生させるために
+    使用します。スキャン回数と生存確認回数を記録します。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._procs: Dict[int, FakeProcess] = {}
+        self._next_pid = 1000
+        self.scan_count = 0
+        self.alive_checks = 0
+        self.on_exit: List[Callable[[FakeProcess], None]] = []
+        """プロセスの終了時に呼ばれる関数のリスト"""
+
+    def spawn(
+        self,
+        name: str,
+        exe: Optional[str] = None,
+        ppid: int = 0,
+        pid: Optional[int] = None,
+        exit_delay: Optional[float] = 0.0,
+        cmdline: Optional[List[str]] = None,
+    ) -> FakeProcess:
+        """疑似プロセスを起動
+
+        Args:
+            name: プロセス名
+            exe: 実行ファイルパス
+            ppid: 親プロセスID
+            pid: 使用するPID。省略時は自動採番（既存PIDの再利用も可能）
+            exit_delay: terminate() から終了までの時間（秒）。
+                Noneの場合はterminate()を無視し、kill()でのみ終了
+            cmdline: コマンドライン。省略時は実行ファイルパスのみ
+
+        Returns:
+            起動した疑似プロセス
+        """
+        with self._lock:
+            if pid is None:
+                pid = self._next_pid
+                self._next_pid += 1
+            proc = FakeProcess(
+                self, pid, name, exe=exe, ppid=ppid, exit_delay=exit_delay, cmdline=cmdline
+            )
+            self._procs[pid] = proc
+            return proc
+
+    def exit(self, pid: int) -> None:
+        """疑似プロセスを終了させる
+
+        Args:
+            pid: 終了させるプロセスID
+        """
+        with self._lock:
+            proc = self._procs.get(pid)
+        if proc:
+            self.discard(proc)
+
+    def discard(self, proc: FakeProcess) -> None:
+        """疑似プロセスをテーブルから取り除く（PID再利用後の誤削除を防止）
+
+        Args:
+            proc: 取り除くプロセス
+        """
+        with self._lock:
+            if self._procs.get(proc.pid) is proc:
+                del self._procs[proc.pid]
+        was_running, proc.running = proc.running, False
+        if was_running:
+            for callback in list(self.on_exit):
+                callback(proc)
+
+    def children_of(self, pid: int, recursive: bool = False) -> List[FakeProcess]:
+        """指定されたPIDの子プロセスを取得
+
+        Args:
+            pid: 親プロセスID
+            recursive: Trueの場合は孫以降も含める
+
+        Returns:
+            子プロセスのリスト
+        """
+        with self._lock:
+            procs = list(self._procs.values())
+        result = []
+        parents = {pid}
+        while parents:
+            direct = [p for p in procs if p.ppid_value in parents]
+            result.extend(direct)
+            if not recursive:
+                break
+            parents = {p.pid for p in direct}
+        return result
+
+    def wait_procs(
+        self,
+        procs: List[Any],
+        timeout: Optional[float] = None,
+        callback: Optional[Callable[[Any], None]] = None,
+    ) -> Tuple[List[Any], List[Any]]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        gone: List[Any] = []
+        alive = list(procs)
+        while True:
+            for proc in list(alive):
+                if not proc.is_running():
+                    alive.remove(proc)
+                    gone.append(proc)
+                    if callback:
+                        callback(proc)
+            if not alive or (deadline is not None and time.monotonic() >= deadline):
+                return gone, alive
+            time.sleep(0.001)
+
+    def iter_processes(self, attrs: Optional[List[str]] = None) -> Iterator[Any]:
+        self.scan_count += 1
+        with self._lock:
+            procs = list(self._procs.values())
+        return iter(procs)
+
+    def is_alive(self, pid: int, create_time: Optional[float] = None) -> bool:
+        self.alive_checks += 1
+        proc = self._procs.get(pid)
+        if proc is None or not proc.is_running():
+            return False
+        if create_time is not None and proc.create_time() != create_time:
+            return False
+        return True
@@ -0,0 +1,190 @@
+"""プロセス監視モジュール
+
+LINEプロセスの起動・終了をイベントとして通知するモジュールです。
+既知のPIDのみを安価に確認し、プロセステーブル全体のスキャンは
+一定間隔または要求時にのみ実行します。
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .line_manager import LineManager
+from .process_source import ProcessSource, PsutilProcessSource
+
+ProcessEventCallback = Callable[[str, int], None]
+"""イベント購読者のコールバック型 ``callback(event, pid)``"""
+
+
+class ProcessWatcher:
+    """LINEプロセスの起動・終了を監視するクラス
+
+    既知のPIDに対しては生存確認のみを行い、フルスキャンは
+    ``rescan_interval`` 秒ごと（LINE停止中は ``idle_rescan_interval`` 秒ごと）
+    または ``request_rescan()`` が呼ばれたときにのみ実行します。
+    """
+
+    EVENT_STARTED = "started"
+    """プロセス起動イベント"""
+
+    EVENT_EXITED = "exited"
+    """プロセス終了イベント"""
+
+    EVENT_READY = "ready"
+    """初回フルスキャン完了イベント（pidは0）"""
+
+    def __init__(
+        self,
+        process_name: str = LineManager.PROCESS_NAME,
+        source: Optional[ProcessSource] = None,
+        poll_interval: float = 0.5,
+        rescan_interval: float = 30.0,
+        idle_rescan_interval: float = 2.0,
+    ) -> None:
+        """監視を初期化
+
+        Args:
+            process_name: 監視対象のプロセス名
+            source: プロセスソース。省略時はpsutilを使用
+            poll_interval: 既知PIDの生存確認間隔（秒）
+            rescan_interval: LINE実行中のフルスキャン間隔（秒）
+            idle_rescan_interval: LINE停止中のフルスキャン間隔（秒）
+        """
+        self.process_name = process_name
+        self.source = source or PsutilProcessSource()
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+        self.idle_rescan_interval = idle_rescan_interval
+
+        self._known: Dict[int, Optional[float]] = {}  # pid -> create_time
+        self._subscribers: List[ProcessEventCallback] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._rescan_requested = True
+        self._last_rescan = 0.0
+        self._ready = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pids(self) -> List[int]:
+        """現在把握しているLINEプロセスのPIDリスト"""
+        with self._lock:
+            return sorted(self._known)
+
+    def is_running(self) -> bool:
+        """LINEが実行中かどうか（最後の確認結果）
+
+        Returns:
+            既知のLINEプロセスが1つ以上あればTrue
+        """
+        with self._lock:
+            return bool(self._known)
+
+    def subscribe(self, callback: ProcessEventCallback) -> None:
+        """イベントを購読
+
+        Args:
+            callback: ``(event, pid)`` を受け取るコールバック
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: ProcessEventCallback) -> None:
+        """イベントの購読を解除
+
+        Args:
+            callback: 登録済みのコールバック
+        """
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def request_rescan(self) -> None:
+        """次回のポーリングでフルスキャンを実行するよう要求
+
+        起動・終了操作の直後に呼ぶと、状態変化を即座に検出できます。
+        """
+        self._rescan_requested = True
+        self._wake.set()
+
+    def poll(self) -> List[Tuple[str, int]]:
+        """1回分の監視処理を実行
+
+        既知PIDの生存確認を行い、必要であればフルスキャンを行います。
+
+        Returns:
+            発生したイベント ``(event, pid)`` のリスト
+        """
+        events: List[Tuple[str, int]] = []
+
+        with self._lock:
+            known = dict(self._known)
+
+        # 既知PIDの安価な生存確認
+        for pid, create_time in list(known.items()):
+            if not self.source.is_alive(pid, create_time):
+                events.append((self.EVENT_EXITED, pid))
+                known.pop(pid)
+
+        now = time.monotonic()
+        interval = self.rescan_interval if known else self.idle_rescan_interval
+        if self._rescan_requested or now - self._last_rescan >= interval:
+            self._rescan_requested = False
+            self._last_rescan = now
+            current = {}
+            for proc in self.source.find_by_name(self.process_name):
+                current[proc.pid] = proc.info.get("create_time")
+
+            for pid in known:
+                if pid not in current:
+                    events.append((self.EVENT_EXITED, pid))
+            for pid in current:
+                if pid not in known:
+                    events.append((self.EVENT_STARTED, pid))
+            known = current
+
+            if not self._ready:
+                self._ready = True
+                events.append((self.EVENT_READY, 0))
+
+        with self._lock:
+            self._known = known
+            subscribers = list(self._subscribers)
+
+        for event, pid in events:
+            for callback in subscribers:
+                try:
+                    callback(event, pid)
+                except Exception:
+                    pass
+        return events
+
+    def start(self) -> None:
+        """バックグラウンドスレッドで監視を開始"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ProcessWatcher")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        """監視を停止
+
+        Args:
+            timeout: スレッド終了を待つ最大時間（秒）
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.poll()
+            except Exception:
+                pass
+            self._wake.wait(self.poll_interval)
@@ -0,0 +1,485 @@
+"""リソースサンプラーモジュール
+
+LINEプロセスのCPU使用率、メモリ（RSS）、スレッド数、ハンドル数、I/Oカウンタを
+一定間隔で記録するモジュールです。サンプルは ``array`` を使った
+固定長のリングバッファに格納されるため、長期間動作させても
+メモリ使用量は一定です。
+"""
+import csv
+import itertools
+import math
+import operator
+import threading
+import time
+from array import array
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, Union
+
+import psutil
+
+from .line_manager import LineManager
+
+METRICS = ("cpu_percent", "rss", "num_threads", "handles", "read_bytes", "write_bytes")
+"""記録するメトリクス名（``handles`` はWindowsではハンドル数、それ以外ではFD数）
+
+取得できなかった値はNaNとして記録し、集計や最新値からは除外します。
+"""
+
+
+class RingBuffer:
+    """``array('d')`` を使った固定長のリングバッファ"""
+
+    def __init__(self, capacity: int) -> None:
+        """バッファを初期化
+
+        Args:
+            capacity: 保持するサンプル数の上限
+        """
+        self.capacity = max(1, capacity)
+        self._data = array("d", bytes(8 * self.capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float) -> None:
+        """値を追加（上限を超えた場合は最も古い値を上書き）
+
+        Args:
+            value: 追加する値
+        """
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def values(self) -> array:
+        """古い順に並べた値を取得
+
+        Returns:
+            値を格納したarray
+        """
+        if self._count < self.capacity:
+            return self._data[: self._count]
+        return self._data[self._next :] + self._data[: self._next]
+
+    def last(self) -> Optional[float]:
+        """最新の値を取得
+
+        Returns:
+            最新の値。空の場合はNone
+        """
+        if not self._count:
+            return None
+        return self._data[(self._next - 1) % self.capacity]
+
+
+class ProcessSeries:
+    """1プロセス分の時系列データ"""
+
+    def __init__(self, pid: int, name: str, capacity: int) -> None:
+        self.pid = pid
+        self.name = name
+        self.times = RingBuffer(capacity)
+        self.buffers: Dict[str, RingBuffer] = {m: RingBuffer(capacity) for m in METRICS}
+
+    def append(self, timestamp: float, sample: Dict[str, float]) -> None:
+        self.times.append(timestamp)
+        for metric, buffer in self.buffers.items():
+            buffer.append(sample.get(metric, math.nan))
+
+    def window(self, metric: str, seconds: Optional[float] = None) -> array:
+        """指定期間内の値を取得
+
+        Args:
+            metric: メトリクス名
+            seconds: 直近何秒分か。Noneの場合はバッファ全体
+
+        Returns:
+            古い順に並べた値
+        """
+        values = self.buffers[metric].values()
+        if seconds is None:
+            return values
+        return values[self._start(self.times.values(), seconds) :]
+
+    def samples(self, metric: str, seconds: Optional[float] = None) -> Tuple[array, array]:
+        """指定期間内の時刻と値を、同じ範囲で切り出して取得
+
+        Args:
+            metric: メトリクス名
+            seconds: 直近何秒分か。Noneの場合はバッファ全体
+
+        Returns:
+            (時刻, 値)。どちらも古い順で、同じ長さ
+        """
+        times = self.times.values()
+        values = self.buffers[metric].values()
+        if seconds is None:
+            return times, values
+        lo = self._start(times, seconds)
+        return times[lo:], values[lo:]
+
+    @staticmethod
+    def _start(times: array, seconds: float) -> int:
+        cutoff = time.time() - seconds
+        # 時刻は単調増加なので、先頭から期間外のサンプル数を二分探索する
+        lo, hi = 0, len(times)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if times[mid] < cutoff:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+def drop_missing(values: array) -> array:
+    """取得できなかった値（NaN）を除外
+
+    Args:
+        values: 値
+
+    Returns:
+        NaNを除いた値。NaNが含まれない場合は ``values`` をそのまま返す
+    """
+    if not any(map(math.isnan, values)):
+        return values
+    return array("d", itertools.filterfalse(math.isnan, values))
+
+
+def _present(value: Optional[float]) -> Optional[float]:
+    return None if value is None or math.isnan(value) else value
+
+
+def summarize(values: array) -> Dict[str, float]:
+    """値の最小・平均・最大・95パーセンタイルを計算
+
+    Args:
+        values: 集計する値（NaNは取得できなかった値として除外）
+
+    Returns:
+        ``count``、``min``、``mean``、``max``、``p95`` を含む辞書
+    """
+    values = drop_missing(values)
+    count = len(values)
+    if not count:
+        return {"count": 0, "min": 0.0, "mean": 0.0, "max": 0.0, "p95": 0.0}
+    ordered = sorted(values)
+    rank = max(0, math.ceil(0.95 * count) - 1)
+    return {
+        "count": count,
+        "min": ordered[0],
+        "mean": math.fsum(values) / count,
+        "max": ordered[-1],
+        "p95": ordered[rank],
+    }
+
+
+class ResourceSampler:
+    """LINEプロセスのリソース使用量を定期的に記録するクラス
+
+    ``psutil.Process.oneshot()`` で1回の問い合わせにまとめて値を取得します。
+    CPU使用率は前回のサンプルからの差分で計算されるため、
+    新しいプロセスは最初のサンプルでは記録されず、2回目から記録されます。
+    終了したプロセスとPIDが再利用されたプロセスの記録は破棄されるため、
+    LINEを何度再起動しても保持する時系列は実行中のプロセス分だけです。
+    """
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        capacity: int = 3600,
+        process_provider: Optional[Callable[[], List[Any]]] = None,
+    ) -> None:
+        """サンプラーを初期化
+
+        Args:
+            interval: サンプリング間隔（秒）
+            capacity: プロセスごとに保持するサンプル数
+            process_provider: 対象プロセスのリストを返す関数。
+                省略時は ``LineManager.get_line_processes``
+        """
+        self.interval = interval
+        self.capacity = capacity
+        self.process_provider = process_provider or LineManager.get_line_processes
+
+        self._lock = threading.Lock()
+        self._series: Dict[int, ProcessSeries] = {}
+        self._procs: Dict[int, Tuple[Optional[float], psutil.Process]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """バックグラウンドでサンプリング中かどうか"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def sample_once(self) -> int:
+        """全対象プロセスのサンプルを1回記録
+
+        Returns:
+            記録したサンプル数
+        """
+        timestamp = time.time()
+        recorded = 0
+        seen = set()
+
+        for found in self.process_provider():
+            pid = found.pid
+            seen.add(pid)
+            create_time = getattr(found, "info", {}).get("create_time")
+            known = self._procs.get(pid)
+            if known is None or known[0] != create_time:
+                # 新しいプロセス（またはPIDの再利用）: 以前の記録を破棄し、
+                # CPU使用率の基準値だけ取得する
+                self._forget(pid)
+                try:
+                    proc = self._own_process(found, create_time)
+                    proc.cpu_percent(None)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+                self._procs[pid] = (create_time, proc)
+                continue
+
+            proc = known[1]
+            sample = self._read(proc)
+            if sample is None:
+                continue
+
+            name = sample.pop("name", "")
+            with self._lock:
+                series = self._series.get(pid)
+                if series is None:
+                    series = ProcessSeries(pid, name, self.capacity)
+                    self._series[pid] = series
+                series.append(timestamp, sample)
+            recorded += 1
+
+        for pid in list(self._procs):
+            if pid not in seen:
+                self._forget(pid)
+        return recorded
+
+    def _forget(self, pid: int) -> None:
+        """プロセスの監視対象と記録済みのサンプルを破棄"""
+        self._procs.pop(pid, None)
+        with self._lock:
+            self._series.pop(pid, None)
+
+    @staticmethod
+    def _own_process(found: Any, create_time: Optional[float]) -> Any:
+        """サンプリング専用のプロセスオブジェクトを取得
+
+        キャッシュ上の ``psutil.Process`` は他の処理と共有され、CPU使用率の基準値が
+        変わってしまうため専用のものを作ります。作成までの間にPIDが再利用された場合は
+        起動時刻が一致しないため ``NoSuchProcess`` とします。作成したオブジェクトは
+        プロセスが終了するまで保持し、PIDから作り直すことはしません。
+        """
+        if not isinstance(found, psutil.Process):
+            return found
+        proc = psutil.Process(found.pid)
+        if create_time is not None and proc.create_time() != create_time:
+            raise psutil.NoSuchProcess(found.pid)
+        return proc
+
+    def pids(self) -> List[int]:
+        """記録済みのPIDリストを取得
+
+        Returns:
+            サンプルが記録されている実行中のプロセスのPIDリスト
+        """
+        with self._lock:
+            return sorted(self._series)
+
+    def active_pids(self) -> List[int]:
+        """現在サンプリング対象になっているPIDリストを取得
+
+        Returns:
+            前回のサンプリングで見つかったプロセスのPIDリスト
+        """
+        return sorted(self._procs)
+
+    def latest(self, pid: int) -> Optional[Dict[str, Optional[float]]]:
+        """最新のサンプルを取得
+
+        Args:
+            pid: プロセスID
+
+        Returns:
+            メトリクス名をキーとする辞書（取得できなかった値はNone）。記録がない場合はNone
+        """
+        with self._lock:
+            series = self._series.get(pid)
+            if series is None or not len(series.times):
+                return None
+            latest = {m: _present(b.last()) for m, b in series.buffers.items()}
+            latest["time"] = series.times.last()
+            return latest
+
+    def get_series(self, pid: int, metric: str, window: Optional[float] = None) -> array:
+        """メトリクスの時系列を取得
+
+        Args:
+            pid: プロセスID
+            metric: メトリクス名
+            window: 直近何秒分か。Noneの場合はバッファ全体
+
+        Returns:
+            古い順に並べた値。記録がない場合は空のarray
+        """
+        with self._lock:
+            series = self._series.get(pid)
+            if series is None:
+                return array("d")
+            return series.window(metric, window)
+
+    def get_samples(
+        self, pid: int, metric: str, window: Optional[float] = None
+    ) -> Tuple[array, array]:
+        """メトリクスの時刻と値を対応させて取得
+
+        ``get_times`` と ``get_series`` を別々に呼ぶと、間に記録されたサンプルで
+        範囲がずれるため、1回のロックで同じ範囲を切り出します。
+        取得できなかったサンプル（NaN）は時刻とともに除外します。
+
+        Args:
+            pid: プロセスID
+            metric: メトリクス名
+            window: 直近何秒分か。Noneの場合はバッファ全体
+
+        Returns:
+            (時刻, 値)。同じ長さで古い順。記録がない場合は空のarrayの組
+        """
+        with self._lock:
+            series = self._series.get(pid)
+            if series is None:
+                return array("d"), array("d")
+            times, values = series.samples(metric, window)
+        if any(map(math.isnan, values)):
+            present = list(map(operator.not_, map(math.isnan, values)))
+            times = array("d", itertools.compress(times, present))
+            values = array("d", itertools.compress(values, present))
+        return times, values
+
+    def get_times(self, pid: int, window: Optional[float] = None) -> array:
+        """サンプル時刻（UNIX時間）の時系列を取得
+
+        Args:
+            pid: プロセスID
+            window: 直近何秒分か。Noneの場合はバッファ全体
+
+        Returns:
+            古い順に並べた時刻
+        """
+        with self._lock:
+            series = self._series.get(pid)
+            if series is None:
+                return array("d")
+            times = series.times.values()
+            if window is None:
+                return times
+            count = len(series.window(METRICS[0], window))
+            return times[len(times) - count :]
+
+    def stats(
+        self, pid: int, metric: str, window: Optional[float] = None
+    ) -> Dict[str, float]:
+        """指定期間のmin/mean/max/p95を計算
+
+        Args:
+            pid: プロセスID
+            metric: メトリクス名
+            window: 直近何秒分か。Noneの場合はバッファ全体
+
+        Returns:
+            ``summarize()`` の結果
+        """
+        return summarize(self.get_series(pid, metric, window))
+
+    def export_csv(self, dest: Union[str, IO[str]]) -> int:
+        """記録済みのサンプルをCSVに書き出す
+
+        Args:
+            dest: 出力先のファイルパスまたはテキストストリーム
+
+        Returns:
+            書き出した行数
+        """
+        if isinstance(dest, str):
+            with open(dest, "w", encoding="utf-8", newline="") as f:
+                return self.export_csv(f)
+
+        writer = csv.writer(dest)
+        writer.writerow(["pid", "name", "time"] + list(METRICS))
+        rows = 0
+        with self._lock:
+            for pid in sorted(self._series):
+                series = self._series[pid]
+                columns = [series.times.values()] + [
+                    series.buffers[m].values() for m in METRICS
+                ]
+                for values in zip(*columns):
+                    writer.writerow([pid, series.name] + ["" if math.isnan(v) else v for v in values])
+                    rows += 1
+        return rows
+
+    def clear(self) -> None:
+        """記録済みのサンプルを破棄"""
+        with self._lock:
+            self._series.clear()
+
+    def start(self) -> None:
+        """バックグラウンドでサンプリングを開始"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ResourceSampler")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        """サンプリングを停止
+
+        Args:
+            timeout: スレッド終了を待つ最大時間（秒）
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sample_once()
+            except Exception:
+                pass
+            self._stop.wait(self.interval)
+
+    @staticmethod
+    def _read(proc: Any) -> Optional[Dict[str, Any]]:
+        try:
+            with proc.oneshot():
+                sample = {
+                    "name": proc.name(),
+                    "cpu_percent": proc.cpu_percent(None),
+                    "rss": float(proc.memory_info().rss),
+                    "num_threads": float(proc.num_threads()),
+                }
+                try:
+                    if hasattr(proc, "num_handles"):
+                        sample["handles"] = float(proc.num_handles())
+                    else:
+                        sample["handles"] = float(proc.num_fds())
+                except (AttributeError, psutil.AccessDenied):
+                    pass
+                try:
+                    io = proc.io_counters()
+                    sample["read_bytes"] = float(io.read_bytes)
+                    sample["write_bytes"] = float(io.write_bytes)
+                except (AttributeError, psutil.AccessDenied):
+                    pass  # I/Oカウンタが取得できない環境
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+        return sample
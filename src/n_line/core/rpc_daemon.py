@@ -0,0 +1,749 @@
+"""RPCデーモンモジュール
+
+``n_line.core`` を読み込んだ状態で常駐し、ローカルホストのTCPで
+LineManager・DebugTools・WindowManipulator・UIInspectorの機能を提供するモジュールです。
+呼び出しごとのインタープリタ起動やCOM初期化のコストを省けます。
+
+プロトコル:
+    各メッセージは4バイト（ビッグエンディアン）の長さと、UTF-8のJSON本体からなります。
+
+    要求: ``{"id": 1, "method": "line.status", "params": {}, "token": "..."}``
+    応答: ``{"id": 1, "result": ...}`` または ``{"id": 1, "error": {"type": ..., "message": ...}}``
+
+    1つの接続で応答を待たずに複数の要求を送信でき（パイプライン）、応答は
+    完了した順に返されます。``id`` で対応付けてください。
+
+認証:
+    すべての要求に ``token`` が必要です。デーモンの起動時にトークンを指定しない場合は
+    ランダムなトークンを生成し、本人だけが読めるファイル（``default_token_file()``）に
+    書き込みます。同じユーザーの ``RpcClient`` はこのファイルからトークンを読み込みます。
+
+起動例:
+    n-line daemon --port 48620
+    n-line daemon --fake --latency 0.005   # LINE・Win32 APIなしで動作
+"""
+import asyncio
+import functools
+import hmac
+import inspect
+import json
+import os
+import secrets
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .install_resolver import app_data_dir
+from .resource_sampler import RingBuffer, summarize
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 48620
+
+MAX_FRAME_SIZE = 4 * 1024 * 1024
+"""1メッセージの最大サイズ（バイト）"""
+
+HEADER = struct.Struct(">I")
+
+TOKEN_ENV_VAR = "N_LINE_RPC_TOKEN"
+"""デーモン・クライアントが使用するトークンを指定する環境変数"""
+
+Handler = Callable[..., Any]
+"""``params`` をキーワード引数として受け取るメソッド（同期関数またはコルーチン関数）"""
+
+
+class RpcError(Exception):
+    """RPC呼び出しがエラーを返した場合の例外"""
+
+    def __init__(self, error: Dict[str, Any]) -> None:
+        super().__init__(f"{error.get('type')}: {error.get('message')}")
+        self.error = error
+
+
+def default_token_file() -> str:
+    """自動生成したトークンの保存先を取得
+
+    Returns:
+        ``app_data_dir()`` 配下の ``rpc_token``
+    """
+    return os.path.join(app_data_dir(), "rpc_token")
+
+
+def write_token_file(path: Optional[str] = None, token: Optional[str] = None) -> str:
+    """トークンを本人だけが読み書きできるファイルに保存
+
+    既存のファイルは削除してから作成するため、権限の緩いファイルは引き継ぎません。
+
+    Args:
+        path: 保存先。省略時は ``default_token_file()``
+        token: 保存するトークン。省略時はランダムに生成
+
+    Returns:
+        保存したトークン
+    """
+    path = path or default_token_file()
+    token = token or secrets.token_urlsafe(32)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+
+def read_token_file(path: Optional[str] = None) -> Optional[str]:
+    """保存されたトークンを読み込む
+
+    Args:
+        path: 保存先。省略時は ``default_token_file()``
+
+    Returns:
+        トークン。ファイルが存在しない場合はNone
+    """
+    try:
+        with open(path or default_token_file(), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def client_token(token: Optional[str] = None) -> Optional[str]:
+    """クライアントが使用するトークンを決定
+
+    Args:
+        token: 明示的に指定されたトークン
+
+    Returns:
+        指定されたトークン、``N_LINE_RPC_TOKEN`` 、保存されたトークンの順で最初に見つかったもの
+    """
+    return token or os.environ.get(TOKEN_ENV_VAR) or read_token_file()
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """メッセージを長さ付きのフレームに変換
+
+    Args:
+        message: JSONに変換できる辞書
+
+    Returns:
+        送信するバイト列
+    """
+    body = json.dumps(message, ensure_ascii=False, default=_json_default).encode("utf-8")
+    return HEADER.pack(len(body)) + body
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "_asdict"):  # psutilの名前付きタプルなど
+        return value._asdict()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """フレームを1つ読み込む
+
+    Args:
+        reader: 読み込み元のストリーム
+
+    Returns:
+        受信したメッセージ。接続が閉じられた場合はNone
+
+    Raises:
+        ValueError: フレームが大きすぎる、またはJSONとして不正な場合
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame too large: {size} bytes")
+    try:
+        body = await reader.readexactly(size)
+    except asyncio.IncompleteReadError:
+        return None
+    return json.loads(body.decode("utf-8"))
+
+
+class MethodMetrics:
+    """メソッドごとの呼び出し回数とレイテンシ"""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.latencies = RingBuffer(capacity)
+
+    def record(self, latency: float, error: bool) -> None:
+        self.calls += 1
+        self.total += latency
+        if error:
+            self.errors += 1
+        self.latencies.append(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """集計結果を取得（レイテンシはミリ秒、直近の呼び出しから計算）"""
+        recent = summarize(self.latencies.values())
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": self.total / self.calls * 1000 if self.calls else 0.0,
+            "p50_ms": _percentile(self.latencies.values(), 0.50) * 1000,
+            "p95_ms": recent["p95"] * 1000,
+            "max_ms": recent["max"] * 1000,
+        }
+
+
+def _percentile(values: Any, q: float) -> float:
+    if not len(values):
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RpcDaemon:
+    """長さ付きJSONの要求を処理するasyncioサーバー
+
+    同時に実行するメソッドの数はサーバー全体で ``max_concurrency`` に制限されます。
+    同期関数のメソッドは専用のスレッドプールで実行されます。
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, Handler],
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        max_concurrency: int = 8,
+        max_pipeline: int = 64,
+        token: Optional[str] = None,
+    ) -> None:
+        """デーモンを初期化
+
+        Args:
+            handlers: メソッド名と処理関数の辞書
+            host: 待ち受けるアドレス
+            port: 待ち受けるポート（0の場合は空きポート）
+            max_concurrency: 同時に実行するメソッド数の上限
+            max_pipeline: 1接続あたりの未応答の要求数の上限（超えると読み込みを待機）
+            token: 要求に含まれている必要があるトークン。省略時はランダムに生成
+                （``token`` 属性で取得できます）
+        """
+        self.handlers: Dict[str, Handler] = dict(handlers)
+        self.handlers.setdefault("ping", lambda: "pong")
+        self.handlers.setdefault("methods", lambda: sorted(self.handlers))
+        self.handlers.setdefault("metrics", self.metrics)
+        self.host = host
+        self.port = port
+        self.max_concurrency = max_concurrency
+        self.max_pipeline = max_pipeline
+        self.token = token or secrets.token_urlsafe(32)
+
+        self.started_at = time.time()
+        self.connections = 0
+        self._metrics: Dict[str, MethodMetrics] = {}
+        self._signatures: Dict[str, Optional[inspect.Signature]] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="n-line-rpc"
+        )
+
+    def metrics(self) -> Dict[str, Any]:
+        """メソッドごとの統計を取得
+
+        Returns:
+            稼働時間・接続数と、メソッド名ごとの呼び出し回数・エラー数・レイテンシ
+        """
+        return {
+            "uptime": time.time() - self.started_at,
+            "connections": self.connections,
+            "max_concurrency": self.max_concurrency,
+            "methods": {name: m.snapshot() for name, m in sorted(self._metrics.items())},
+        }
+
+    async def start(self) -> Tuple[str, int]:
+        """待ち受けを開始
+
+        Returns:
+            実際に待ち受けている (アドレス, ポート)
+        """
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        sock = self._server.sockets[0]
+        self.host, self.port = sock.getsockname()[:2]
+        return self.host, self.port
+
+    async def serve_forever(self) -> None:
+        """待ち受けを開始し、停止されるまで処理を続ける"""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """待ち受けを終了"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._executor.shutdown(wait=False)
+
+    async def call(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """メソッドを実行（同時実行数の制限とレイテンシの記録を含む）
+
+        Args:
+            method: メソッド名
+            params: キーワード引数
+
+        Returns:
+            メソッドの戻り値
+
+        Raises:
+            KeyError: メソッドが存在しない場合
+        """
+        handler = self.handlers.get(method)
+        if handler is None:
+            raise KeyError(f"Unknown method: {method}")
+        assert self._semaphore is not None
+
+        async with self._semaphore:
+            start = time.perf_counter()
+            error = False
+            try:
+                if inspect.iscoroutinefunction(handler):
+                    return await handler(**(params or {}))
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._executor, functools.partial(handler, **(params or {}))
+                )
+            except Exception:
+                error = True
+                raise
+            finally:
+                metrics = self._metrics.get(method)
+                if metrics is None:
+                    metrics = self._metrics[method] = MethodMetrics()
+                metrics.record(time.perf_counter() - start, error)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        write_lock = asyncio.Lock()
+        pipeline = asyncio.Semaphore(self.max_pipeline)
+        tasks = set()
+
+        async def respond(request: Dict[str, Any]) -> None:
+            try:
+                response = await self._dispatch(request)
+                async with write_lock:
+                    writer.write(encode_frame(response))
+                    await writer.drain()
+            except (ConnectionError, OSError):
+                pass
+            finally:
+                pipeline.release()
+
+        try:
+            while True:
+                try:
+                    request = await read_frame(reader)
+                except ValueError as e:
+                    async with write_lock:
+                        writer.write(encode_frame(_error(None, "ProtocolError", str(e))))
+                    break
+                if request is None:
+                    break
+                await pipeline.acquire()
+                task = asyncio.ensure_future(respond(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _dispatch(self, request: Any) -> Dict[str, Any]:
+        if not isinstance(request, dict):
+            return _error(None, "ProtocolError", "Request must be an object.")
+        request_id = request.get("id")
+        token = request.get("token")
+        if not isinstance(token, str) or not hmac.compare_digest(
+            token.encode("utf-8"), self.token.encode("utf-8")
+        ):
+            return _error(request_id, "AuthError", "Invalid token.")
+        method = request.get("method")
+        params = request.get("params") or {}
+        if not isinstance(method, str) or not isinstance(params, dict):
+            return _error(request_id, "ProtocolError", "Invalid method or params.")
+        if method not in self.handlers:
+            return _error(request_id, "MethodNotFound", f"Unknown method: {method}")
+        # 引数の誤りは実行前に判定し、メソッド内で発生した例外と区別する
+        signature = self._signature(method)
+        if signature is not None:
+            try:
+                signature.bind(**params)
+            except TypeError as e:
+                return _error(request_id, "InvalidParams", str(e))
+        try:
+            result = await self.call(method, params)
+        except Exception as e:
+            return _error(request_id, type(e).__name__, str(e))
+        return {"id": request_id, "result": result}
+
+    def _signature(self, method: str) -> Optional[inspect.Signature]:
+        if method not in self._signatures:
+            try:
+                self._signatures[method] = inspect.signature(self.handlers[method])
+            except (TypeError, ValueError):
+                self._signatures[method] = None  # 引数を調べられない組み込み関数など
+        return self._signatures[method]
+
+
+def _error(request_id: Any, error_type: str, message: str) -> Dict[str, Any]:
+    return {"id": request_id, "error": {"type": error_type, "message": message}}
+
+
+class RpcClient:
+    """RPCデーモンの同期クライアント
+
+    使用例:
+        with RpcClient() as client:
+            print(client.call("line.status"))
+            results = client.call_many([("window.find", {"pid": 1234}), ("line.status", {})])
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        timeout: float = 30.0,
+        token: Optional[str] = None,
+    ) -> None:
+        """デーモンに接続
+
+        Args:
+            host: 接続先アドレス
+            port: 接続先ポート
+            timeout: 送受信のタイムアウト（秒）
+            token: デーモンに設定されたトークン。省略時は ``client_token()``
+        """
+        self.token = client_token(token)
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile("rb")
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "RpcClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """接続を閉じる"""
+        self._file.close()
+        self._sock.close()
+
+    def call(self, method: str, **params: Any) -> Any:
+        """メソッドを呼び出して結果を取得
+
+        Args:
+            method: メソッド名
+            **params: メソッドの引数
+
+        Returns:
+            メソッドの戻り値
+
+        Raises:
+            RpcError: デーモンがエラーを返した場合
+        """
+        return self.call_many([(method, params)])[0]
+
+    def call_many(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """複数の要求をまとめて送信し、すべての結果を取得（パイプライン）
+
+        Args:
+            calls: (メソッド名, 引数) のリスト
+
+        Returns:
+            要求と同じ順序の結果のリスト
+
+        Raises:
+            RpcError: いずれかの要求がエラーを返した場合
+        """
+        with self._lock:
+            ids = []
+            frames = []
+            for method, params in calls:
+                self._next_id += 1
+                ids.append(self._next_id)
+                request = {"id": self._next_id, "method": method, "params": params}
+                if self.token is not None:
+                    request["token"] = self.token
+                frames.append(encode_frame(request))
+            self._sock.sendall(b"".join(frames))
+
+            responses: Dict[Any, Dict[str, Any]] = {}
+            while len(responses) < len(ids):
+                response = self._read_frame()
+                responses[response.get("id")] = response
+
+        results = []
+        for request_id in ids:
+            response = responses[request_id]
+            if "error" in response:
+                raise RpcError(response["error"])
+            results.append(response.get("result"))
+        return results
+
+    def _read_frame(self) -> Dict[str, Any]:
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ConnectionError("Connection closed by daemon.")
+        (size,) = HEADER.unpack(header)
+        return json.loads(self._file.read(size).decode("utf-8"))
+
+
+class AsyncRpcClient:
+    """RPCデーモンのasyncioクライアント
+
+    複数のコルーチンから同時に ``call()`` でき、要求は1つの接続上で
+    パイプライン化されます。
+    """
+
+    def __init__(self, token: Optional[str] = None) -> None:
+        """クライアントを初期化
+
+        Args:
+            token: デーモンに設定されたトークン。省略時は ``client_token()``
+        """
+        self.token = client_token(token)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def connect(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """デーモンに接続
+
+        Args:
+            host: 接続先アドレス
+            port: 接続先ポート
+        """
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+
+    async def close(self) -> None:
+        """接続を閉じる"""
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+
+    async def call(self, method: str, **params: Any) -> Any:
+        """メソッドを呼び出して結果を取得
+
+        Raises:
+            RpcError: デーモンがエラーを返した場合
+        """
+        assert self._writer is not None
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        request: Dict[str, Any] = {"id": request_id, "method": method, "params": params}
+        if self.token is not None:
+            request["token"] = self.token
+        self._writer.write(encode_frame(request))
+        await self._writer.drain()
+        response = await future
+        if "error" in response:
+            raise RpcError(response["error"])
+        return response.get("result")
+
+    async def _read_loop(self) -> None:
+        assert self._reader is not None
+        try:
+            while True:
+                response = await read_frame(self._reader)
+                if response is None:
+                    break
+                future = self._pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection closed by daemon."))
+            self._pending.clear()
+
+
+def core_handlers() -> Dict[str, Handler]:
+    """実際のLINE・Win32 API・UI Automationを使用するメソッドを作成
+
+    Win32 APIとUI Automationには ``backend.get_backend()`` を使用するため、
+    ``N_LINE_BACKEND=fake`` では疑似環境に対して同じ処理を実行できます。
+
+    Returns:
+        メソッド名と処理関数の辞書
+    """
+    from .backend import get_backend
+    from .debug_tools import DebugTools
+    from .line_manager import LineManager
+
+    def status() -> Dict[str, Any]:
+        procs = LineManager.get_line_processes()
+        return {"running": bool(procs), "pids": [p.pid for p in procs]}
+
+    def find_window(pid: int, visible_only: bool = True) -> int:
+        from .window_manipulator import WindowManipulator
+
+        return WindowManipulator.find_process_window(pid, visible_only=visible_only)
+
+    def window_rect(hwnd: int) -> List[int]:
+        from .window_manipulator import WindowManipulator
+
+        return list(WindowManipulator.get_window_rect(hwnd))
+
+    def with_uia(func: Callable[..., Any]) -> Callable[..., Any]:
+        # UI AutomationはスレッドごとにCOMの初期化が必要
+        @functools.wraps(func)
+        def wrapper(**params: Any) -> Any:
+            auto = get_backend().uia
+            with auto.UIAutomationInitializerInThread(debug=False):
+                return func(**params)
+
+        return wrapper
+
+    def inspector_tree(pid: int) -> str:
+        from .ui_inspector import UIInspector
+
+        return UIInspector.get_extensive_ui_tree(pid)
+
+    def inspector_classes(pid: int) -> List[str]:
+        from .ui_inspector import UIInspector
+
+        return UIInspector.get_unique_style_classes(pid)
+
+    def inspector_summary(pid: int, max_age: float = 10.0) -> Dict[str, Any]:
+        from .ui_inspector import UIInspector
+
+        snapshot = UIInspector.get_snapshot(pid, max_age)
+        if snapshot is None:
+            raise LookupError(f"No top-level window for PID {pid}")
+        return snapshot.summary()
+
+    return {
+        "line.status": status,
+        "line.launch": LineManager.launch_line,
+        "line.kill": LineManager.shutdown_line,
+        "line.relaunch": lambda args=(), timeout=5.0: LineManager.relaunch_line(
+            list(args), timeout=timeout
+        ),
+        "line.install_path": LineManager.get_install_path,
+        "debug.process_details": DebugTools.get_line_process_details,
+        "debug.resource_stats": lambda window=60.0: DebugTools.get_resource_stats(window),
+        "window.find": find_window,
+        "window.rect": window_rect,
+        "inspector.tree": with_uia(inspector_tree),
+        "inspector.classes": with_uia(inspector_classes),
+        "inspector.summary": with_uia(inspector_summary),
+    }
+
+
+def fake_handlers(latency: float = 0.0, windows: int = 3) -> Dict[str, Handler]:
+    """疑似的なLINE・ウィンドウ・UIツリーを使用するメソッドを作成
+
+    ``FakeBackend`` を使用するバックエンドに設定し、``core_handlers()`` と同じ処理を
+    疑似環境に対して実行します。LINEやWin32 APIのない環境での負荷試験に使用します。
+
+    Args:
+        latency: 各メソッドの実行前に待機する時間（秒）。実際のAPI呼び出しの代わり
+        windows: 疑似LINEプロセスの数（プロセスごとにメインウィンドウとUIツリーを持つ）
+
+    Returns:
+        メソッド名と処理関数の辞書
+    """
+    from .backend import FakeBackend, set_backend
+
+    backend = FakeBackend()
+    for i in range(windows):
+        backend.add_line_app(nodes=200, seed=i)
+    set_backend(backend)
+
+    handlers = core_handlers()
+    if not latency:
+        return handlers
+
+    def delayed(func: Callable[..., Any]) -> Callable[..., Any]:
+        # 実際のAPI呼び出しと同様に、実行スレッドを待機させる
+        @functools.wraps(func)
+        def wrapper(**params: Any) -> Any:
+            time.sleep(latency)
+            return func(**params)
+
+        return wrapper
+
+    return {name: delayed(func) for name, func in handlers.items()}
+
+
+def run(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    max_concurrency: int = 8,
+    fake: bool = False,
+    latency: float = 0.0,
+    token: Optional[str] = None,
+    on_ready: Optional[Callable[[str, int], None]] = None,
+) -> None:
+    """デーモンを起動し、中断されるまで処理を続ける
+
+    Args:
+        host: 待ち受けるアドレス
+        port: 待ち受けるポート
+        max_concurrency: 同時に実行するメソッド数の上限
+        fake: Trueの場合は ``fake_handlers()`` を使用
+        latency: ``fake`` の場合の疑似レイテンシ（秒）
+        token: 要求に必要なトークン。省略時は生成して ``default_token_file()`` に保存し、
+            終了時に削除
+        on_ready: 待ち受け開始時に (アドレス, ポート) を受け取る関数
+    """
+    handlers = fake_handlers(latency) if fake else core_handlers()
+    daemon = RpcDaemon(
+        handlers, host=host, port=port, max_concurrency=max_concurrency, token=token
+    )
+    token_file = None if token else default_token_file()
+
+    async def main() -> None:
+        address = await daemon.start()
+        # 待ち受けを開始できた場合のみ、実行中のデーモンのトークンを上書きする
+        if token_file:
+            write_token_file(token_file, daemon.token)
+        if on_ready:
+            on_ready(*address)
+        try:
+            await daemon.serve_forever()
+        finally:
+            await daemon.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # 別のデーモンが上書きしたファイルは削除しない
+        if token_file and read_token_file(token_file) == daemon.token:
+            os.unlink(token_file)
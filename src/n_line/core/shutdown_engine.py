@@ -0,0 +1,149 @@
+"""シャットダウンエンジンモジュール
+
+プロセスツリー（子プロセスを含む）をまとめて終了させるモジュールです。
+すべてのプロセスに一斉に終了要求を送り、共通の期限で終了を待ち、
+残ったプロセスを強制終了して、PIDごとの結果と所要時間を報告します。
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+from .process_source import ProcessSource, PsutilProcessSource
+
+
+class ShutdownEngine:
+    """プロセスツリーを並列に終了させるクラス
+
+    逐次的に terminate() して待つのではなく、ツリー全体に一斉に
+    シグナルを送り、1回の待機で終了を確認します。
+    """
+
+    OUTCOME_TERMINATED = "terminated"
+    """terminate() により終了"""
+
+    OUTCOME_KILLED = "killed"
+    """kill() により強制終了"""
+
+    OUTCOME_GONE = "gone"
+    """シグナル送信前に既に終了していた"""
+
+    OUTCOME_FAILED = "failed"
+    """期限内に終了しなかった"""
+
+    def __init__(self, source: Optional[ProcessSource] = None) -> None:
+        """エンジンを初期化
+
+        Args:
+            source: プロセスソース。省略時はpsutilを使用
+        """
+        self.source = source or PsutilProcessSource()
+
+    def collect_tree(self, roots: List[Any]) -> List[Any]:
+        """ルートプロセスとその子孫を重複なく収集
+
+        Args:
+            roots: ルートとなるプロセスのリスト
+
+        Returns:
+            子孫を含むプロセスのリスト（ルートが先頭）
+        """
+        procs: Dict[int, Any] = {}
+        for root in roots:
+            procs.setdefault(root.pid, root)
+        for root in roots:
+            try:
+                for child in root.children(recursive=True):
+                    procs.setdefault(child.pid, child)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return list(procs.values())
+
+    def shutdown(
+        self,
+        roots: List[Any],
+        timeout: float = 5.0,
+        kill_timeout: float = 2.0,
+        include_children: bool = True,
+    ) -> Dict[str, Any]:
+        """プロセスツリーを終了
+
+        Args:
+            roots: 終了させるプロセスのリスト
+            timeout: terminate後の共通待機期限（秒）
+            kill_timeout: kill後の待機期限（秒）
+            include_children: Trueの場合は子孫プロセスも終了対象にする
+
+        Returns:
+            フェーズ別の所要時間 ``timings``、PIDごとの結果 ``processes``、
+            および ``terminated`` / ``killed`` / ``remaining`` のPIDリストを含む辞書
+        """
+        procs = self.collect_tree(roots) if include_children else list(roots)
+        timings = {"terminate": 0.0, "wait": 0.0, "kill": 0.0}
+        report: Dict[int, Dict[str, Any]] = {}
+        for proc in procs:
+            report[proc.pid] = {
+                "pid": proc.pid,
+                "name": self._safe_name(proc),
+                "outcome": None,
+                "latency": None,
+            }
+
+        start = time.perf_counter()
+        phase = {"outcome": self.OUTCOME_TERMINATED}
+
+        def on_exit(proc: Any) -> None:
+            entry = report[proc.pid]
+            if entry["outcome"] is None:
+                entry["outcome"] = phase["outcome"]
+                entry["latency"] = time.perf_counter() - start
+
+        # 1. ツリー全体に一斉に終了要求
+        signaled = []
+        for proc in procs:
+            try:
+                proc.terminate()
+                signaled.append(proc)
+            except psutil.NoSuchProcess:
+                report[proc.pid]["outcome"] = self.OUTCOME_GONE
+                report[proc.pid]["latency"] = 0.0
+            except psutil.AccessDenied:
+                signaled.append(proc)  # kill() で再試行
+        timings["terminate"] = time.perf_counter() - start
+
+        # 2. 共通の期限で待機
+        wait_start = time.perf_counter()
+        _, alive = self.source.wait_procs(signaled, timeout=timeout, callback=on_exit)
+        timings["wait"] = time.perf_counter() - wait_start
+
+        # 3. 残ったプロセスを強制終了
+        if alive:
+            kill_start = time.perf_counter()
+            phase["outcome"] = self.OUTCOME_KILLED
+            for proc in alive:
+                try:
+                    proc.kill()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+            _, alive = self.source.wait_procs(alive, timeout=kill_timeout, callback=on_exit)
+            timings["kill"] = time.perf_counter() - kill_start
+
+        for proc in alive:
+            report[proc.pid]["outcome"] = self.OUTCOME_FAILED
+
+        timings["total"] = time.perf_counter() - start
+        entries = list(report.values())
+        return {
+            "timings": timings,
+            "processes": entries,
+            "terminated": [e["pid"] for e in entries if e["outcome"] == self.OUTCOME_TERMINATED],
+            "killed": [e["pid"] for e in entries if e["outcome"] == self.OUTCOME_KILLED],
+            "remaining": [e["pid"] for e in entries if e["outcome"] == self.OUTCOME_FAILED],
+        }
+
+    @staticmethod
+    def _safe_name(proc: Any) -> Optional[str]:
+        try:
+            return proc.name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
@@ -0,0 +1,213 @@
+"""単一インスタンスモジュール
+
+N-LINEのGUIを1プロセスに制限し、2つ目以降の起動からコマンドを
+実行中のインスタンスへ転送するモジュールです。通信には
+``multiprocessing.connection`` を使用し、Windowsでは名前付きパイプ、
+それ以外ではUnixドメインソケットで待ち受けます。
+
+メッセージは ``{"command": str, "args": list}`` 、応答は ``{"success": bool, ...}`` の
+JSONです（pickleは他プロセスから任意のオブジェクトを受け取れるため使用しません）。
+"""
+import getpass
+import json
+import os
+import re
+import sys
+import threading
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .install_resolver import app_data_dir
+
+CommandHandler = Callable[[str, List[str]], Dict[str, Any]]
+"""コマンド名と引数を受け取り、応答の辞書を返す関数"""
+
+FORWARD_TIMEOUT = 2.0
+"""転送したコマンドの応答を待つ最大時間（秒）"""
+
+OPERATION_TIMEOUT = 60.0
+"""LINEの起動・終了を転送した場合に完了を待つ最大時間（秒）"""
+
+FORWARDED_COMMANDS = ("status", "launch", "kill", "show")
+"""実行中のインスタンスに転送するコマンド
+
+``show`` 以外は実行中のインスタンスが ``n_line.cli`` と同じ処理を完了まで実行し、
+単独で実行した場合と同じ形式の結果を返します。
+"""
+
+MAX_MESSAGE_SIZE = 64 * 1024
+"""受け付けるメッセージの最大サイズ（バイト）"""
+
+
+def _send(conn: Connection, message: Dict[str, Any]) -> None:
+    conn.send_bytes(json.dumps(message, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def _recv(conn: Connection) -> Any:
+    return json.loads(conn.recv_bytes(MAX_MESSAGE_SIZE).decode("utf-8"))
+
+
+def default_address() -> Tuple[str, str]:
+    """ユーザーごとの待ち受けアドレスを取得
+
+    Returns:
+        (アドレス, ファミリー)。Windowsでは名前付きパイプ、それ以外ではソケットファイル
+    """
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "default"
+    user = re.sub(r"[^A-Za-z0-9_.-]", "_", user)
+    if sys.platform == "win32":
+        return rf"\\.\pipe\n-line-{user}", "AF_PIPE"
+    return os.path.join(app_data_dir(), f"n-line-{user}.sock"), "AF_UNIX"
+
+
+def send_command(
+    command: str,
+    args: Optional[List[str]] = None,
+    address: Optional[str] = None,
+    family: Optional[str] = None,
+    timeout: float = FORWARD_TIMEOUT,
+) -> Optional[Dict[str, Any]]:
+    """実行中のインスタンスにコマンドを送信
+
+    Args:
+        command: コマンド名
+        args: コマンドの引数
+        address: 接続先。省略時は ``default_address()``
+        family: アドレスファミリー
+        timeout: 応答を待つ最大時間（秒）
+
+    Returns:
+        インスタンスからの応答。インスタンスが実行されていない場合はNone
+    """
+    if address is None:
+        address, family = default_address()
+    try:
+        conn = Client(address, family=family)
+    except (OSError, EOFError):
+        return None
+
+    with conn:
+        try:
+            _send(conn, {"command": command, "args": list(args or [])})
+            if not conn.poll(timeout):
+                return {"success": False, "message": "Error: Instance did not respond."}
+            return _recv(conn)
+        except (OSError, EOFError, ValueError) as e:
+            return {"success": False, "message": f"Error: {e}"}
+
+
+class InstanceServer:
+    """実行中のインスタンス側でコマンドを受け付けるクラス
+
+    ハンドラーは受付スレッドから呼ばれるため、UIの更新はハンドラー側で
+    メインスレッドに委譲してください。
+    """
+
+    def __init__(
+        self,
+        handler: CommandHandler,
+        address: Optional[str] = None,
+        family: Optional[str] = None,
+    ) -> None:
+        """サーバーを初期化
+
+        Args:
+            handler: コマンドを処理する関数
+            address: 待ち受けアドレス。省略時は ``default_address()``
+            family: アドレスファミリー
+        """
+        if address is None:
+            address, family = default_address()
+        self.handler = handler
+        self.address = address
+        self.family = family
+        self._listener: Optional[Listener] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+
+    def start(self) -> bool:
+        """待ち受けを開始
+
+        既に別のインスタンスが待ち受けている場合は開始しません。
+        応答のない古いソケットファイルは削除して再作成します。
+
+        Returns:
+            待ち受けを開始した場合はTrue、別のインスタンスが実行中の場合はFalse
+        """
+        if self.family == "AF_UNIX":
+            if os.path.exists(self.address):
+                if send_command("ping", address=self.address, family=self.family) is not None:
+                    return False
+                try:
+                    os.unlink(self.address)  # 異常終了したインスタンスの残骸
+                except OSError:
+                    pass
+            os.makedirs(os.path.dirname(self.address), exist_ok=True)
+
+        try:
+            self._listener = Listener(self.address, family=self.family)
+        except OSError:
+            # Windowsでは2つ目の名前付きパイプの作成が拒否される
+            return False
+
+        self._closed.clear()
+        self._thread = threading.Thread(target=self._serve, name="InstanceServer")
+        self._thread.daemon = True
+        self._thread.start()
+        return True
+
+    def close(self) -> None:
+        """待ち受けを終了"""
+        if self._listener is None:
+            return
+        self._closed.set()
+        # accept()で待機中のスレッドを起こしてから閉じる
+        try:
+            Client(self.address, family=self.family).close()
+        except (OSError, EOFError):
+            pass
+        listener = self._listener
+        self._listener = None
+        try:
+            listener.close()
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _serve(self) -> None:
+        while not self._closed.is_set():
+            listener = self._listener
+            if listener is None:
+                break
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError):
+                if self._closed.is_set():
+                    break
+                continue
+            with conn:
+                self._handle(conn)
+
+    def _handle(self, conn: Connection) -> None:
+        try:
+            message = _recv(conn)
+        except (OSError, EOFError, ValueError):
+            return
+        if not isinstance(message, dict) or "command" not in message:
+            reply: Dict[str, Any] = {"success": False, "message": "Error: Invalid message."}
+        elif message["command"] == "ping":
+            reply = {"success": True, "message": "pong", "pid": os.getpid()}
+        else:
+            try:
+                reply = self.handler(str(message["command"]), list(message.get("args", [])))
+            except Exception as e:
+                reply = {"success": False, "message": f"Error: {e}"}
+        try:
+            _send(conn, reply)
+        except (OSError, EOFError):
+            pass
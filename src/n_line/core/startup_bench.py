@@ -0,0 +1,304 @@
+"""起動ベンチマークモジュール
+
+LINEの起動から終了までを繰り返し、起動の各フェーズにかかった時間を
+計測するモジュールです。キャッシュをクリアしてコールドスタートを
+計測することもできます。
+
+実行例:
+    python -m n_line.core.startup_bench --runs 10
+    python -m n_line.core.startup_bench --runs 10 --cold
+    python -m n_line.core.startup_bench --runs 50 --simulate
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from .line_manager import LineManager
+from .resource_sampler import summarize
+
+PHASES = ("spawn", "first_window", "visible")
+"""計測するフェーズ（起動要求からの経過時間）
+
+- ``spawn``: LINEのプロセスが見つかるまで
+- ``first_window``: メインウィンドウが作成されるまで（非表示を含む）
+- ``visible``: メインウィンドウが表示されるまで
+"""
+
+
+class Launcher:
+    """ベンチマーク対象の起動・検出・終了を行うインターフェース"""
+
+    def launch(self) -> None:
+        """起動を要求"""
+        raise NotImplementedError
+
+    def find_pids(self) -> List[int]:
+        """起動済みのプロセスのPIDリストを取得"""
+        raise NotImplementedError
+
+    def find_window(self, pid: int, visible_only: bool) -> int:
+        """プロセスのメインウィンドウを検索
+
+        Args:
+            pid: プロセスID
+            visible_only: Trueの場合は表示済みのウィンドウのみ対象
+
+        Returns:
+            ウィンドウハンドル。見つからない場合は0
+        """
+        raise NotImplementedError
+
+    def kill(self) -> None:
+        """プロセスを終了し、終了を待つ"""
+        raise NotImplementedError
+
+    def clear_cache(self) -> None:
+        """キャッシュをクリア（コールドスタート計測用）"""
+        raise NotImplementedError
+
+
+class LineLauncher(Launcher):
+    """実際のLINEを操作するLauncher"""
+
+    def launch(self) -> None:
+        message = LineManager.launch_line()
+        # "LINE is already running." も起動していないため失敗として扱う
+        if not message.startswith("Success"):
+            raise RuntimeError(message)
+
+    def find_pids(self) -> List[int]:
+        return [p.pid for p in LineManager.get_line_processes(use_cache=False)]
+
+    def find_window(self, pid: int, visible_only: bool) -> int:
+        from .window_manipulator import WindowManipulator
+
+        return WindowManipulator.find_process_window(pid, visible_only=visible_only)
+
+    def kill(self) -> None:
+        LineManager.kill_line()
+
+    def clear_cache(self) -> None:
+        LineManager.clear_cache()
+
+
+class SimulatedLauncher(Launcher):
+    """起動時間を模擬するLauncher
+
+    LINEやWin32 APIのない環境でベンチマーク自体を検証するために使用します。
+    各フェーズの時間は起動要求からの経過時間で、``jitter`` の範囲でばらつきます。
+    """
+
+    def __init__(
+        self,
+        spawn_delay: float = 0.05,
+        window_delay: float = 0.3,
+        visible_delay: float = 0.4,
+        cold_penalty: float = 0.2,
+        jitter: float = 0.1,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Launcherを初期化
+
+        Args:
+            spawn_delay: プロセスが見つかるまでの時間（秒）
+            window_delay: ウィンドウが作成されるまでの時間（秒）
+            visible_delay: ウィンドウが表示されるまでの時間（秒）
+            cold_penalty: キャッシュクリア直後の起動で追加される時間（秒）
+            jitter: 各時間に掛けるばらつきの割合
+            seed: 乱数のシード
+        """
+        self.delays = (spawn_delay, window_delay, visible_delay)
+        self.cold_penalty = cold_penalty
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._cold = False
+        self._started: Optional[float] = None
+        self._schedule = (0.0, 0.0, 0.0)
+
+    def launch(self) -> None:
+        penalty = self.cold_penalty if self._cold else 0.0
+        self._cold = False
+        scale = 1.0 + self._random.uniform(-self.jitter, self.jitter)
+        spawn, window, visible = (d * scale for d in self.delays)
+        self._schedule = (spawn, window + penalty, visible + penalty)
+        self._started = time.perf_counter()
+
+    def _elapsed(self) -> float:
+        if self._started is None:
+            return -1.0
+        return time.perf_counter() - self._started
+
+    def find_pids(self) -> List[int]:
+        return [1] if self._elapsed() >= self._schedule[0] else []
+
+    def find_window(self, pid: int, visible_only: bool) -> int:
+        ready_at = self._schedule[2] if visible_only else self._schedule[1]
+        return 0x1000 if self._elapsed() >= ready_at else 0
+
+    def kill(self) -> None:
+        self._started = None
+
+    def clear_cache(self) -> None:
+        self._cold = True
+
+
+class StartupBenchmark:
+    """起動→表示→終了のサイクルを繰り返して起動時間を計測するクラス"""
+
+    def __init__(
+        self,
+        launcher: Optional[Launcher] = None,
+        runs: int = 5,
+        cold: bool = False,
+        timeout: float = 60.0,
+        poll_interval: float = 0.02,
+        settle: float = 1.0,
+    ) -> None:
+        """ベンチマークを初期化
+
+        Args:
+            launcher: 使用するLauncher。省略時は ``LineLauncher``
+            runs: 計測回数
+            cold: Trueの場合は各回の前にキャッシュをクリア
+            timeout: 1回の起動を待つ最大時間（秒）
+            poll_interval: プロセス・ウィンドウの確認間隔（秒）
+            settle: 終了後、次の起動までの待機時間（秒）
+        """
+        self.launcher = launcher or LineLauncher()
+        self.runs = runs
+        self.cold = cold
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.settle = settle
+
+    def run_once(self) -> Dict[str, Any]:
+        """1回分の起動を計測
+
+        Returns:
+            フェーズごとの経過時間（秒）と ``success``、失敗時は ``error`` を含む辞書
+        """
+        result: Dict[str, Any] = {phase: None for phase in PHASES}
+        result["success"] = False
+
+        # 起動済みのプロセスを計測したり、使用中のキャッシュを削除したりしない
+        if self.launcher.find_pids():
+            result["error"] = "LINE is already running."
+            return result
+
+        if self.cold:
+            self.launcher.clear_cache()
+
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        try:
+            self.launcher.launch()
+            pids: List[int] = []
+            while time.perf_counter() < deadline:
+                now = time.perf_counter() - start
+                if result["spawn"] is None:
+                    pids = self.launcher.find_pids()
+                    if pids:
+                        result["spawn"] = now
+                elif result["first_window"] is None:
+                    # ランチャー経由の場合は後からプロセスが増えるため毎回取得する
+                    pids = self.launcher.find_pids() or pids
+                    if any(self.launcher.find_window(pid, False) for pid in pids):
+                        result["first_window"] = now
+                if result["first_window"] is not None and any(
+                    self.launcher.find_window(pid, True) for pid in pids
+                ):
+                    result["visible"] = time.perf_counter() - start
+                    result["success"] = True
+                    break
+                time.sleep(self.poll_interval)
+            else:
+                pending = [p for p in PHASES if result[p] is None]
+                result["error"] = f"Timed out waiting for: {', '.join(pending)}"
+        except Exception as e:
+            result["error"] = str(e)
+        finally:
+            self.launcher.kill()
+        return result
+
+    def run(self) -> Dict[str, Any]:
+        """指定回数の計測を実行
+
+        計測前から起動しているLINEは終了させ、終了を確認してから開始します。
+
+        Returns:
+            各回の結果 ``runs``、フェーズごとの集計 ``summary``、失敗回数 ``failures``
+        """
+        if self.launcher.find_pids():
+            self.launcher.kill()
+            time.sleep(self.settle)
+
+        runs = []
+        for i in range(self.runs):
+            if i:
+                time.sleep(self.settle)
+            runs.append(self.run_once())
+
+        succeeded = [r for r in runs if r["success"]]
+        return {
+            "runs": runs,
+            "cold": self.cold,
+            "failures": len(runs) - len(succeeded),
+            "summary": {phase: summarize_phase([r[phase] for r in succeeded]) for phase in PHASES},
+        }
+
+
+def summarize_phase(values: List[float]) -> Dict[str, float]:
+    """フェーズの計測値を集計
+
+    Args:
+        values: 経過時間（秒）のリスト
+
+    Returns:
+        ``count``、``min``、``median``、``mean``、``p95``、``max`` を含む辞書
+    """
+    summary = summarize(values)
+    summary["median"] = statistics.median(values) if values else 0.0
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """コマンドラインからベンチマークを実行
+
+    Args:
+        argv: コマンドライン引数。省略時は ``sys.argv[1:]``
+
+    Returns:
+        終了コード（すべての回が失敗した場合は1）
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m n_line.core.startup_bench",
+        description="Measure LINE startup time over repeated launch/kill cycles.",
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--cold", action="store_true", help="clear the cache before each run")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--settle", type=float, default=1.0, help="pause between runs")
+    parser.add_argument(
+        "--simulate", action="store_true", help="use a simulated launcher instead of LINE"
+    )
+    args = parser.parse_args(argv)
+
+    launcher: Launcher = SimulatedLauncher() if args.simulate else LineLauncher()
+    bench = StartupBenchmark(
+        launcher,
+        runs=args.runs,
+        cold=args.cold,
+        timeout=args.timeout,
+        settle=0.0 if args.simulate else args.settle,
+    )
+    result = bench.run()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 1 if result["runs"] and result["failures"] == len(result["runs"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
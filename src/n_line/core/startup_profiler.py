@@ -0,0 +1,285 @@
+"""起動プロファイラーモジュール
+
+アプリケーション起動時のモジュール読み込みのタイムライン（``-X importtime`` 相当）と、
+最初のTkフレーム描画・最初のステータス更新までの時間を記録し、
+JSONレポートとして保存するモジュールです。
+
+環境変数 ``N_LINE_PROFILE_STARTUP`` を設定するか、``--profile-startup`` を
+付けて起動すると有効になります::
+
+    n-line --profile-startup
+    n-line --profile-startup=startup.json
+    set N_LINE_PROFILE_STARTUP=1 && n-line
+"""
+import atexit
+import importlib.abc
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+ENV_VAR = "N_LINE_PROFILE_STARTUP"
+"""有効化に使用する環境変数（値が ``1`` 以外の場合はレポートの保存先）"""
+
+DEFAULT_REPORT = "n-line-startup.json"
+"""レポートの既定の保存先（カレントディレクトリ）"""
+
+REQUIRED_MARKS = ("first_frame", "first_status")
+"""すべて記録された時点でレポートを保存するマーク"""
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """``exec_module`` の実行時間を記録するローダーのラッパー"""
+
+    def __init__(self, loader: Any, profiler: "StartupProfiler") -> None:
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: Any) -> Any:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: Any) -> None:
+        self._profiler._begin_import(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._end_import()
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """他のFinderが見つけたモジュールのローダーを ``_TimedLoader`` で包むFinder"""
+
+    def __init__(self, profiler: "StartupProfiler") -> None:
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname: str, path: Optional[Sequence[str]], target: Any = None) -> Any:
+        if getattr(self._local, "busy", False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.busy = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """起動時のタイムラインを記録するクラス
+
+    時刻はすべてプロファイラー作成時点からの経過時間（ミリ秒）で記録します。
+    """
+
+    def __init__(self, report_path: str = DEFAULT_REPORT) -> None:
+        """プロファイラーを初期化
+
+        Args:
+            report_path: レポートの保存先
+        """
+        self.report_path = report_path
+        self.start = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+        self.imports: List[Dict[str, Any]] = []
+        self.written = False
+
+        self._lock = threading.Lock()
+        # インポート中のモジュールのスタック（スレッドごと）
+        self._local = threading.local()
+        self._finder: Optional[_ImportTimer] = None
+        self._main_thread = threading.get_ident()
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def install(self) -> None:
+        """インポートの計測を開始"""
+        if self._finder is None:
+            self._finder = _ImportTimer(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        """インポートの計測を終了"""
+        if self._finder is not None:
+            if self._finder in sys.meta_path:
+                sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def _stack(self) -> List[List[Any]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _begin_import(self, name: str) -> None:
+        # 別スレッドのインポートはタイムラインに含めず、メインスレッドのみ記録する
+        if threading.get_ident() != self._main_thread:
+            return
+        self._stack().append([name, self._elapsed_ms(), 0.0])
+
+    def _end_import(self) -> None:
+        if threading.get_ident() != self._main_thread:
+            return
+        stack = self._stack()
+        name, started, children = stack.pop()
+        cumulative = self._elapsed_ms() - started
+        if stack:
+            stack[-1][2] += cumulative
+        with self._lock:
+            self.imports.append(
+                {
+                    "module": name,
+                    "start_ms": round(started, 3),
+                    "self_ms": round(cumulative - children, 3),
+                    "cumulative_ms": round(cumulative, 3),
+                    "depth": len(stack),
+                }
+            )
+
+    def mark(self, name: str) -> None:
+        """イベントの時刻を記録（同じ名前は最初の1回のみ）
+
+        ``REQUIRED_MARKS`` がすべて揃った時点でレポートを保存します。
+
+        Args:
+            name: イベント名
+        """
+        with self._lock:
+            if name in self.marks:
+                return
+            self.marks[name] = round(self._elapsed_ms(), 3)
+            complete = all(m in self.marks for m in REQUIRED_MARKS)
+        if complete and not self.written:
+            self.write()
+
+    def report(self) -> Dict[str, Any]:
+        """レポートを作成
+
+        Returns:
+            マーク、インポートのタイムライン、読み込み時間の上位モジュールを含む辞書
+        """
+        with self._lock:
+            imports = sorted(self.imports, key=lambda i: i["start_ms"])
+            marks = dict(self.marks)
+        top_level = [i for i in imports if i["depth"] == 0]
+        return {
+            "python": sys.version.split()[0],
+            "argv": sys.argv,
+            "marks": marks,
+            "import_total_ms": round(sum(i["cumulative_ms"] for i in top_level), 3),
+            "import_count": len(imports),
+            "slowest_self": sorted(imports, key=lambda i: i["self_ms"], reverse=True)[:20],
+            "imports": imports,
+        }
+
+    def write(self, path: Optional[str] = None) -> Optional[str]:
+        """レポートをJSONファイルに保存
+
+        Args:
+            path: 保存先。省略時は ``report_path``
+
+        Returns:
+            保存したパス。保存に失敗した場合はNone
+        """
+        path = path or self.report_path
+        self.uninstall()
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        except OSError:
+            return None
+        self.written = True
+        return path
+
+
+_profiler: Optional[StartupProfiler] = None
+
+
+def enable(report_path: Optional[str] = None) -> StartupProfiler:
+    """起動プロファイリングを有効化
+
+    以降のモジュール読み込みが記録されるため、できるだけ早く呼び出してください。
+    ``REQUIRED_MARKS`` が揃わないまま終了した場合（CLIなど）は終了時に保存します。
+
+    Args:
+        report_path: レポートの保存先。省略時は ``DEFAULT_REPORT``
+
+    Returns:
+        StartupProfilerインスタンス
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler(report_path or DEFAULT_REPORT)
+        _profiler.install()
+        atexit.register(_write_at_exit)
+    return _profiler
+
+
+def enable_from_args(argv: List[str]) -> List[str]:
+    """引数または環境変数に応じてプロファイリングを有効化
+
+    Args:
+        argv: コマンドライン引数
+
+    Returns:
+        ``--profile-startup`` を取り除いた引数
+    """
+    remaining = []
+    report_path: Optional[str] = None
+    requested = False
+    for arg in argv:
+        if arg == "--profile-startup":
+            requested = True
+        elif arg.startswith("--profile-startup="):
+            requested = True
+            report_path = arg.split("=", 1)[1]
+        else:
+            remaining.append(arg)
+
+    env = os.environ.get(ENV_VAR, "")
+    if env and env != "0":
+        requested = True
+        if env != "1" and report_path is None:
+            report_path = env
+
+    if requested:
+        enable(report_path)
+    return remaining
+
+
+def _write_at_exit() -> None:
+    if _profiler is not None and not _profiler.written:
+        _profiler.write()
+
+
+def get_profiler() -> Optional[StartupProfiler]:
+    """有効なプロファイラーを取得
+
+    Returns:
+        StartupProfilerインスタンス。無効な場合はNone
+    """
+    return _profiler
+
+
+def mark(name: str) -> None:
+    """プロファイリングが有効な場合のみイベントの時刻を記録
+
+    Args:
+        name: イベント名
+    """
+    if _profiler is not None:
+        _profiler.mark(name)
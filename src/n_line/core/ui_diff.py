@@ -0,0 +1,306 @@
+"""UIツリー差分モジュール
+
+2つの ``UISnapshot`` を比較し、追加・削除・移動・プロパティが変化した要素を
+求めるモジュールです。QSSの調整やLINEの更新の前後で取得したスナップショットの
+違いを確認するために使用します。
+
+要素はルートから順に、対応付けた親の子のうちClassName・AutomationId・
+同じClassNameとAutomationIdを持つ兄弟の中での順番が一致するものを対応付けます
+（親からのパスとこれらの組をキーとするのと同じです）。各要素は1回ずつしか
+処理しないため、比較は要素数にほぼ比例した時間で完了します。
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .ui_snapshot import UISnapshot
+
+
+class UIDiff:
+    """2つのスナップショットの差分
+
+    要素は各スナップショットの番号で表します（``old_index`` は比較元、
+    ``new_index`` は比較先の番号）。追加・削除された部分木はすべての要素を含みます。
+    """
+
+    def __init__(self, old: UISnapshot, new: UISnapshot) -> None:
+        self.old = old
+        self.new = new
+        # 比較先にのみ存在する要素（new の番号、走査順）
+        self.added: List[int] = []
+        # 比較元にのみ存在する要素（old の番号、走査順）
+        self.removed: List[int] = []
+        # 別の親の下へ移動した部分木のルート (old_index, new_index)
+        self.moved: List[Tuple[int, int]] = []
+        # プロパティ（ControlType・Name・Rect）が変化した要素 (old_index, new_index, プロパティ名)
+        self.changed: List[Tuple[int, int, List[str]]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.moved or self.changed)
+
+    def summary(self) -> Dict[str, int]:
+        """種類ごとの件数を取得
+
+        Returns:
+            ``added``・``removed``・``moved``・``changed``・``old_nodes``・``new_nodes`` を含む辞書
+        """
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "moved": len(self.moved),
+            "changed": len(self.changed),
+            "old_nodes": len(self.old),
+            "new_nodes": len(self.new),
+        }
+
+    def to_text(self, limit: Optional[int] = 500) -> str:
+        """差分をテキストに変換
+
+        追加・削除された部分木はルート要素のみを表示し、子孫の数を併記します。
+
+        Args:
+            limit: 種類ごとに表示する最大件数。Noneの場合は無制限
+
+        Returns:
+            ``+``（追加）・``-``（削除）・``>``（移動）・``~``（変化）で始まる行のテキスト
+        """
+        s = self.summary()
+        lines = [
+            f"{s['old_nodes']} -> {s['new_nodes']} elements: "
+            f"+{s['added']} -{s['removed']} >{s['moved']} ~{s['changed']}"
+        ]
+        if not self:
+            lines.append("No changes.")
+            return "\n".join(lines)
+
+        # 追加・削除は親と一緒に追加・削除された子孫を除き、部分木のルートのみを表示する
+        added = set(self.added)
+        removed = set(self.removed)
+        sections: Tuple[Tuple[str, List[Any], Callable[[Any], str]], ...] = (
+            (
+                "Added",
+                [b for b in self.added if self.new.parents[b] not in added],
+                lambda b: self._subtree_line(self.new, b, "+"),
+            ),
+            (
+                "Removed",
+                [a for a in self.removed if self.old.parents[a] not in removed],
+                lambda a: self._subtree_line(self.old, a, "-"),
+            ),
+            (
+                "Moved",
+                self.moved,
+                lambda m: f"> {node_path(self.old, m[0])}  ->  {node_path(self.new, m[1])}",
+            ),
+            ("Changed", self.changed, lambda c: self._change_line(*c)),
+        )
+        for title, entries, format_entry in sections:
+            if not entries:
+                continue
+            lines.append(f"\n[{title}]")
+            lines.extend(format_entry(entry) for entry in entries[:limit])
+            if limit is not None and len(entries) > limit:
+                lines.append(f"... ({len(entries) - limit} more)")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _subtree_line(snapshot: UISnapshot, index: int, mark: str) -> str:
+        # 行きがけ順では部分木の要素が連続するため、深さが戻るまでを数える
+        depths = snapshot.depths
+        depth = depths[index]
+        end = index + 1
+        while end < len(snapshot) and depths[end] > depth:
+            end += 1
+        line = f"{mark} {node_path(snapshot, index)}"
+        if end - index > 1:
+            line += f"  (+{end - index - 1} descendants)"
+        return line
+
+    def _change_line(self, a: int, b: int, fields: List[str]) -> str:
+        old, new = self.old.node(a), self.new.node(b)
+        changes = ", ".join(f"{f} {old[f]!r} -> {new[f]!r}" for f in fields)
+        return f"~ {node_path(self.new, b)}: {changes}"
+
+
+def node_path(snapshot: UISnapshot, index: int) -> str:
+    """要素のルートからのパスを取得
+
+    Args:
+        snapshot: スナップショット
+        index: 要素の番号
+
+    Returns:
+        ``ClassName#AutomationId`` （ClassNameが空の場合はControlType）を ``/`` で連結した文字列
+    """
+    parts = []
+    for i in [index] + snapshot.ancestors(index):
+        part = snapshot.class_name(i) or snapshot.control_type(i)
+        automation_id = snapshot.automation_id(i)
+        if automation_id:
+            part += f"#{automation_id}"
+        parts.append(part)
+    return "/".join(reversed(parts))
+
+
+def _match_subtrees(
+    old: UISnapshot,
+    new: UISnapshot,
+    pairs: List[Tuple[int, int]],
+    old_match: List[int],
+    new_match: List[int],
+) -> None:
+    """対応付けた要素の組から子孫を順に対応付け
+
+    子要素をClassNameとAutomationIdでグループ化し、グループ内では兄弟の中での
+    順番で対応付けます。グループの要素数が変わった場合（兄弟の追加・削除）は、
+    順番がずれて別の要素と対応付かないようにNameとRect、次にNameが一致するものを
+    順に対応付けます。
+
+    Args:
+        old: 比較元のスナップショット
+        new: 比較先のスナップショット
+        pairs: 対応付け済みの要素の組 ``(old_index, new_index)``
+        old_match: 比較元の要素に対応する比較先の番号（未対応は-1、更新されます）
+        new_match: 比較先の要素に対応する比較元の番号（未対応は-1、更新されます）
+    """
+    stack = list(pairs)
+    while stack:
+        a, b = stack.pop()
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for child in old.children(a):
+            if old_match[child] < 0:
+                key = (old.class_name(child), old.automation_id(child))
+                groups.setdefault(key, []).append(child)
+        new_groups: Dict[Tuple[str, str], List[int]] = {}
+        for child in new.children(b):
+            if new_match[child] < 0:
+                key = (new.class_name(child), new.automation_id(child))
+                new_groups.setdefault(key, []).append(child)
+
+        for key, new_children in new_groups.items():
+            old_children = groups.get(key)
+            if not old_children:
+                continue
+            if len(old_children) == len(new_children):
+                matches: Iterable[Tuple[int, int]] = zip(old_children, new_children)
+            else:
+                matches = _align_by_name(old, new, old_children, new_children)
+            for x, y in matches:
+                old_match[x] = y
+                new_match[y] = x
+                stack.append((x, y))
+
+
+def _align_by_name(
+    old: UISnapshot, new: UISnapshot, old_children: List[int], new_children: List[int]
+) -> List[Tuple[int, int]]:
+    """NameとRectが一致する兄弟、次にNameが一致する兄弟を先頭から順に対応付け"""
+    matches = []
+    remaining_old, remaining_new = old_children, new_children
+    for with_rect in (True, False):
+        by_key: Dict[Any, List[int]] = {}
+        for x in reversed(remaining_old):
+            key = (old.name(x), old.rect(x)) if with_rect else old.name(x)
+            by_key.setdefault(key, []).append(x)
+        unmatched = []
+        for y in remaining_new:
+            candidates = by_key.get((new.name(y), new.rect(y)) if with_rect else new.name(y))
+            if candidates:
+                matches.append((candidates.pop(), y))
+            else:
+                unmatched.append(y)
+        matched_old = {x for x, _ in matches}
+        remaining_old = [x for x in remaining_old if x not in matched_old]
+        remaining_new = unmatched
+    return matches
+
+
+def _identifiable(snapshot: UISnapshot, index: int) -> bool:
+    return bool(snapshot.names[index] or snapshot.automation_ids[index])
+
+
+def _changed_fields(
+    old: UISnapshot, a: int, new: UISnapshot, b: int, compare_rect: bool
+) -> List[str]:
+    fields = []
+    if old.control_type(a) != new.control_type(b):
+        fields.append("ControlType")
+    if old.name(a) != new.name(b):
+        fields.append("Name")
+    if compare_rect and old.rect(a) != new.rect(b):
+        fields.append("Rect")
+    return fields
+
+
+def diff_snapshots(old: UISnapshot, new: UISnapshot, compare_rect: bool = True) -> UIDiff:
+    """2つのスナップショットを比較
+
+    1. ルートから順に、親・ClassName・AutomationId・兄弟の中での順番で要素を対応付けます。
+    2. 対応しなかった部分木のルートのうち、ControlType・ClassName・AutomationId・
+       Nameが一致するもの（NameかAutomationIdが空でないもの）を移動として対応付け、
+       その子孫も同様に対応付けます。
+    3. 対応付けた要素のプロパティ（ControlType・Name・Rect）の変化を検出し、
+       残った要素を追加・削除とします。
+
+    Args:
+        old: 比較元のスナップショット
+        new: 比較先のスナップショット
+        compare_rect: Falseの場合は矩形の変化を無視
+
+    Returns:
+        UIDiffインスタンス
+    """
+    diff = UIDiff(old, new)
+    if not len(old) or not len(new):
+        diff.added = list(range(len(new)))
+        diff.removed = list(range(len(old)))
+        return diff
+
+    old_match: List[int] = [-1] * len(old)
+    new_match: List[int] = [-1] * len(new)
+    if (old.class_name(0), old.automation_id(0)) == (new.class_name(0), new.automation_id(0)):
+        old_match[0] = 0
+        new_match[0] = 0
+        _match_subtrees(old, new, [(0, 0)], old_match, new_match)
+
+    # 対応しなかった部分木のルートを、ControlType・ClassName・AutomationId・Nameで
+    # 移動として対応付ける（NameとAutomationIdがどちらも空の要素は区別できないため除く）
+    def signature(snapshot: UISnapshot, i: int) -> Tuple[str, str, str, str]:
+        return (
+            snapshot.control_type(i),
+            snapshot.class_name(i),
+            snapshot.automation_id(i),
+            snapshot.name(i),
+        )
+
+    candidates: Dict[Tuple[str, str, str, str], List[int]] = {}
+    for a in range(len(old)):
+        parent = old.parents[a]
+        if old_match[a] < 0 and parent >= 0 and old_match[parent] >= 0 and _identifiable(old, a):
+            candidates.setdefault(signature(old, a), []).append(a)
+    for group in candidates.values():
+        group.reverse()  # pop() で走査順に取り出す
+
+    for b in range(len(new)):
+        parent = new.parents[b]
+        if new_match[b] >= 0 or parent < 0 or new_match[parent] < 0 or not _identifiable(new, b):
+            continue
+        group = candidates.get(signature(new, b))
+        while group and old_match[group[-1]] >= 0:
+            group.pop()
+        if not group:
+            continue
+        a = group.pop()
+        old_match[a] = b
+        new_match[b] = a
+        diff.moved.append((a, b))
+        # 子孫は走査順で後に現れるため、この時点で対応付けておく
+        _match_subtrees(old, new, [(a, b)], old_match, new_match)
+
+    for b, a in enumerate(new_match):
+        if a < 0:
+            diff.added.append(b)
+            continue
+        fields = _changed_fields(old, a, new, b, compare_rect)
+        if fields:
+            diff.changed.append((a, b, fields))
+    diff.removed = [a for a, b in enumerate(old_match) if b < 0]
+    return diff
@@ -2,14 +2,54 @@
 
 UI Automationを使用してアプリケーションのUI要素を検索、分析する
 モジュールです。ウィンドウ構造の取得、要素の詳細情報取得、スタイルクラス
-の抽出などの機能を提供します。
+の抽出などの機能を提供します。UI AutomationとWin32 APIへのアクセスは
+``backend.get_backend()`` を経由します。
 """
+import itertools
 import threading
-from typing import Any, Dict, List, Optional
-
-import uiautomation as auto
-import win32gui
-import win32process
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from .backend import ElementInfo, get_backend
+from .ui_snapshot import UISnapshot
+
+TRUNCATE_REASONS = ("cancelled", "timeout", "max_nodes", "max_depth")
+"""走査を打ち切った理由（優先度の高い順）"""
+
+
+class _ScanBudget:
+    """UIツリー走査の要素数・時間・キャンセルの上限（複数スレッドで共有）"""
+
+    def __init__(
+        self,
+        max_nodes: Optional[int],
+        timeout: Optional[float],
+        cancel_event: Optional[threading.Event],
+    ) -> None:
+        self.max_nodes = max_nodes
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.cancel_event = cancel_event
+        self._count = itertools.count()
+
+    def check(self) -> Optional[str]:
+        """要素を1つ記録する前に呼び出し、上限に達していれば理由を返す"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            return "cancelled"
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "timeout"
+        # itertools.count の next() はGILの下でアトミックに番号を払い出す
+        if self.max_nodes is not None and next(self._count) >= self.max_nodes:
+            return "max_nodes"
+        return None
+
+
+def _merge_truncated(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    """2つの打ち切り理由のうち優先度の高い方を返す"""
+    if a is None or b is None:
+        return a or b
+    return a if TRUNCATE_REASONS.index(a) <= TRUNCATE_REASONS.index(b) else b
 
 
 class UIInspector:
@@ -19,13 +59,37 @@ class UIInspector:
     アプリケーションのUI要素を検索・分析します。
     """
 
+    SNAPSHOT_MAX_AGE = 10.0
+    """``get_snapshot`` が直前の走査結果を再利用する期間（秒）"""
+
+    SCAN_MAX_DEPTH = 256
+    """UIツリー走査の既定の深さの上限"""
+
+    SCAN_MAX_NODES = 200_000
+    """UIツリー走査の既定の要素数の上限"""
+
+    SCAN_TIMEOUT = 120.0
+    """UIツリー走査の既定の時間の上限（秒）"""
+
+    SCAN_WORKERS = 4
+    """UIツリー走査に使用する既定のスレッド数"""
+
+    SCAN_SPLIT_FACTOR = 4
+    """並列走査でスレッド1つあたりに割り当てる部分木の数の目安"""
+
+    _snapshots: Dict[int, UISnapshot] = {}
+    _snapshot_lock = threading.Lock()
+
     @staticmethod
-    def get_element_at_cursor() -> Optional[auto.Control]:
+    def get_element_at_cursor() -> Optional[Any]:
         """マウスカーソル位置のUI要素を取得
 
         Returns:
             見つかったControlオブジェクト。見つからない場合はNone
         """
+        backend = get_backend()
+        win32gui = backend.win32gui
+        auto = backend.uia
         try:
             x, y = win32gui.GetCursorPos()
             element = auto.ControlFromPoint(x, y)
@@ -34,7 +98,7 @@ class UIInspector:
             return None
 
     @staticmethod
-    def highlight_element(element: auto.Control, duration: float = 1.0) -> None:
+    def highlight_element(element: Any, duration: float = 1.0) -> None:
         """要素の周りに赤い矩形を一時的に表示
 
         透明なオーバーレイウィンドウを使用して、指定された要素の周りに
@@ -90,7 +154,7 @@ class UIInspector:
             pass
 
     @staticmethod
-    def get_detailed_info(element: auto.Control) -> Dict[str, Any]:
+    def get_detailed_info(element: Any) -> Dict[str, Any]:
         """UI要素の詳細情報を取得
 
         要素の名前、型、クラス名、パターン、祖先要素などの詳細情報を
@@ -105,47 +169,10 @@ class UIInspector:
         if not element:
             return {}
 
-        info = {
-            "Name": element.Name,
-            "ControlType": element.ControlTypeName,
-            "ClassName": element.ClassName,
-            "AutomationId": element.AutomationId,
-            "Rect": element.BoundingRectangle,
-            "ProcessId": element.ProcessId,
-            "Value": "",
-            "Patterns": [],
-        }
-
-        # Check patterns for editing capabilities
-        if element.GetPattern(auto.PatternId.ValuePattern):
-            info["Patterns"].append("Value")
-            try:
-                p = element.GetValuePattern()
-                if p:
-                    info["Value"] = p.Value
-            except Exception:
-                pass
-
-        if element.GetPattern(auto.PatternId.InvokePattern):
-            info["Patterns"].append("Invoke (Clickable)")
-
-        if element.GetPattern(auto.PatternId.TogglePattern):
-            info["Patterns"].append("Toggle")
-
-        # --- Advanced: Retrieve LegacyIAccessible (Crucial for Qt Apps) ---
+        # プロパティと対応パターン（Value・Invoke・Toggle・LegacyIAccessible）を一括で読み取る。
         # Qt often hides real object names in LegacyIAccessible properties
-        if element.GetPattern(auto.PatternId.LegacyIAccessiblePattern):
-            info["Patterns"].append("LegacyIAccessible")
-            try:
-                legacy = element.GetLegacyIAccessiblePattern()
-                if legacy:
-                    info["LegacyName"] = legacy.Name
-                    info["LegacyDescription"] = legacy.Description
-                    info["LegacyValue"] = legacy.Value
-                    info["LegacyRole"] = legacy.Role
-                    # Sometimes Description holds the objectName or class info
-            except Exception:
-                pass
+        backend = get_backend()
+        info = backend.read_details(element)
 
         # --- Hierarchy: Ancestors ---
         # Walk up to find the container context (e.g. ChatPanel -> LcWidget)
@@ -154,12 +181,13 @@ class UIInspector:
             parent = element.GetParentControl()
             depth = 0
             while parent and depth < 5:  # Limit depth
-                name = parent.Name if parent.Name else "NoName"
-                cls = parent.ClassName if parent.ClassName else "NoClass"
+                parent_info = backend.read_element(parent)
+                name = parent_info.name or "NoName"
+                cls = parent_info.class_name or "NoClass"
                 ancestors.append(f"{cls}('{name}')")
 
                 # Check for PID mismatch (hit desktop)
-                if parent.ProcessId != element.ProcessId:
+                if parent_info.process_id != info["ProcessId"]:
                     break
 
                 parent = parent.GetParentControl()
@@ -172,50 +200,355 @@ class UIInspector:
         return info
 
     @staticmethod
-    def get_unique_style_classes(pid: int) -> List[str]:
-        """UIツリー全体をスキャンしてユニークなクラス名のリストを取得
+    def find_app_window(pid: int) -> Optional[Any]:
+        """指定されたPIDのトップレベルウィンドウのUI要素を取得
 
-        QSSセレクタの特定に有用です。
+        Args:
+            pid: プロセスID
+
+        Returns:
+            見つかったControlオブジェクト。見つからない場合はNone
+        """
+        auto = get_backend().uia
+        root = auto.GetRootControl()
+        # Walk top level windows to find one belonging to our PID
+        for attempt in root.GetChildren():
+            if attempt.ProcessId == pid:
+                return attempt
+        return None
+
+    @staticmethod
+    def take_snapshot(
+        pid: int,
+        app_window: Optional[Any] = None,
+        max_depth: Optional[int] = SCAN_MAX_DEPTH,
+        max_nodes: Optional[int] = SCAN_MAX_NODES,
+        timeout: Optional[float] = SCAN_TIMEOUT,
+        cancel_event: Optional[threading.Event] = None,
+        workers: int = SCAN_WORKERS,
+    ) -> Optional[UISnapshot]:
+        """指定されたPIDのUIツリー全体を走査してスナップショットを作成
+
+        要素ごとのプロパティは1回ずつだけ読み取り、テキスト表示やクラス名一覧は
+        作成したスナップショットから求めます。走査は再帰を使わずスタックで行い、
+        上限に達した場合やキャンセルされた場合は途中までの結果を返します
+        （``snapshot.truncated`` に理由が設定されます）。
+
+        ``workers`` が2以上の場合は、上位の階層を展開して得た部分木を複数の
+        スレッドで並列に走査し、走査順を保ったまま1つのツリーにまとめます。
 
         Args:
             pid: プロセスID
+            app_window: 走査するルート要素。省略時は ``find_app_window(pid)``
+            max_depth: 走査する深さの上限（ルートは0）。Noneの場合は無制限
+            max_nodes: 記録する要素数の上限。Noneの場合は無制限
+            timeout: 走査時間の上限（秒）。Noneの場合は無制限
+            cancel_event: セットされると走査を中断するイベント
+            workers: 走査に使用するスレッド数（1の場合は呼び出し元のスレッドのみ）
 
         Returns:
-            見つかったクラス名のリスト
+            UISnapshotインスタンス。ウィンドウが見つからない場合はNone
         """
-        classes = set()
+        if app_window is None:
+            app_window = UIInspector.find_app_window(pid)
+            if app_window is None:
+                return None
+
+        snapshot = UISnapshot(pid, taken_at=time.time())
+        budget = _ScanBudget(max_nodes, timeout, cancel_event)
+        root = get_backend().read_element(app_window)
+        if workers > 1:
+            snapshot.truncated = UIInspector._walk_parallel(
+                snapshot, root, max_depth, budget, workers
+            )
+        else:
+            for _ in UIInspector._iter_walk(snapshot, root, -1, 0, max_depth, budget):
+                pass
+        return snapshot
 
-        try:
-            root = auto.GetRootControl()
-            app_window = None
-
-            # Find window for PID
-            for attempt in root.GetChildren():
-                if attempt.ProcessId == pid:
-                    app_window = attempt
-                    classes.add(app_window.ClassName)  # Add root class
+    @staticmethod
+    def iter_snapshot(
+        snapshot: UISnapshot,
+        app_window: Optional[Any] = None,
+        max_depth: Optional[int] = SCAN_MAX_DEPTH,
+        max_nodes: Optional[int] = SCAN_MAX_NODES,
+        timeout: Optional[float] = SCAN_TIMEOUT,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[int]:
+        """UIツリーを走査しながら、追加した要素の番号を走査順に返すジェネレーター
+
+        ``take_snapshot`` と同じ走査を1つのスレッドで行い、要素を ``snapshot`` に
+        追加するたびにその番号を返します。走査の完了を待たずに結果を表示する
+        場合に使用します（行きがけ順を保つため並列走査は行いません）。
+        打ち切った場合は ``snapshot.truncated`` に理由が設定されます。
+
+        Args:
+            snapshot: 要素を追加する空のスナップショット（``snapshot.pid`` を走査）
+            app_window: 走査するルート要素。省略時は ``find_app_window(snapshot.pid)``
+            max_depth: 走査する深さの上限（ルートは0）。Noneの場合は無制限
+            max_nodes: 記録する要素数の上限。Noneの場合は無制限
+            timeout: 走査時間の上限（秒）。Noneの場合は無制限
+            cancel_event: セットされると走査を中断するイベント
+
+        Yields:
+            追加した要素の番号。ウィンドウが見つからない場合は何も返しません
+        """
+        if app_window is None:
+            app_window = UIInspector.find_app_window(snapshot.pid)
+            if app_window is None:
+                return
+
+        budget = _ScanBudget(max_nodes, timeout, cancel_event)
+        root = get_backend().read_element(app_window)
+        yield from UIInspector._iter_walk(snapshot, root, -1, 0, max_depth, budget)
+
+    @staticmethod
+    def _iter_walk(
+        snapshot: UISnapshot,
+        root: ElementInfo,
+        parent: int,
+        depth: int,
+        max_depth: Optional[int],
+        budget: "_ScanBudget",
+    ) -> Iterator[int]:
+        """``root`` 以下の部分木を行きがけ順に走査してスナップショットに追加
+
+        子要素は ``Backend.read_children`` でプロパティとまとめて読み取るため、
+        プロセス間の呼び出しは要素ごとに1回で済みます。走査を打ち切った場合は
+        ``snapshot.truncated`` に理由を設定します。
+
+        Args:
+            snapshot: 要素を追加するスナップショット
+            root: 部分木のルート要素（読み取り済みのプロパティ）
+            parent: ``root`` の親要素の番号（ルートの場合は-1）
+            depth: ``root`` の深さ
+            max_depth: 走査する深さの上限。Noneの場合は無制限
+            budget: 要素数・時間・キャンセルの上限
+
+        Yields:
+            追加した要素の番号
+        """
+        backend = get_backend()
+        # (要素, 親の番号, 深さ)。子要素を逆順に積むことで行きがけ順に取り出す
+        stack = [(root, parent, depth)]
+        while stack:
+            reason = budget.check()
+            if reason is not None:
+                snapshot.truncated = _merge_truncated(snapshot.truncated, reason)
+                return
+
+            info, parent, depth = stack.pop()
+            index = UIInspector._add_element(snapshot, info, parent, depth)
+            yield index
+
+            if max_depth is not None and depth >= max_depth:
+                # 子要素がある場合のみ打ち切りとして記録する
+                if snapshot.truncated is None and info.control.GetChildren():
+                    snapshot.truncated = "max_depth"
+                continue
+            children = backend.read_children(info.control)
+            stack.extend((child, index, depth + 1) for child in reversed(children))
+
+    @staticmethod
+    def _add_element(snapshot: UISnapshot, info: ElementInfo, parent: int, depth: int) -> int:
+        return snapshot.add(
+            parent,
+            depth,
+            info.control_type,
+            info.class_name,
+            info.name,
+            info.automation_id,
+            info.rect,
+        )
+
+    @staticmethod
+    def _walk_parallel(
+        snapshot: UISnapshot,
+        root_info: ElementInfo,
+        max_depth: Optional[int],
+        budget: "_ScanBudget",
+        workers: int,
+    ) -> Optional[str]:
+        """部分木を複数のスレッドで走査してスナップショットに追加
+
+        ルートから1階層ずつ展開し、部分木の数がスレッド数の ``SCAN_SPLIT_FACTOR``
+        倍以上になった階層で分割します。各スレッドは ``UIAutomationInitializerInThread``
+        でCOMを初期化し、未処理の部分木を順に取り出して個別のスナップショットに
+        走査します。最後に展開した上位の要素と部分木を走査順に連結します。
+
+        Returns:
+            走査を打ち切った理由。最後まで走査した場合はNone
+        """
+        # [要素のプロパティ, 深さ, 子ノードのリスト（部分木として走査する場合はNone）, 部分木の走査結果]
+        backend = get_backend()
+        root: List[Any] = [root_info, 0, None, None]
+        frontier = [root]
+        truncated = None
+        while len(frontier) < workers * UIInspector.SCAN_SPLIT_FACTOR:
+            if max_depth is not None and frontier[0][1] >= max_depth:
+                break
+            expanded = []
+            for node in frontier:
+                reason = budget.check()
+                if reason is not None:
+                    truncated = reason
                     break
+                node[2] = [
+                    [child, node[1] + 1, None, None]
+                    for child in backend.read_children(node[0].control)
+                ]
+                expanded.extend(node[2])
+            if truncated is not None or not expanded:
+                break
+            frontier = expanded
+
+        tasks = deque(node for node in frontier if node[2] is None)
+        if tasks:
+            uia = backend.uia
+
+            def worker() -> None:
+                with uia.UIAutomationInitializerInThread(debug=False):
+                    while True:
+                        try:
+                            node = tasks.popleft()
+                        except IndexError:
+                            return
+                        fragment = UISnapshot(snapshot.pid)
+                        walk = UIInspector._iter_walk(
+                            fragment, node[0], -1, node[1], max_depth, budget
+                        )
+                        for _ in walk:
+                            pass
+                        node[3] = fragment
+
+            count = min(workers, len(tasks))
+            with ThreadPoolExecutor(max_workers=count, thread_name_prefix="n-line-uia") as pool:
+                futures = [pool.submit(worker) for _ in range(count)]
+            for future in futures:
+                future.result()
+
+        # 上位の要素を行きがけ順に追加し、部分木の位置で走査結果を連結する
+        stack = [(root, -1)]
+        while stack:
+            node, parent = stack.pop()
+            info, depth, children, fragment = node
+            if children is None:
+                if fragment is not None:
+                    snapshot.extend(fragment, parent)
+                    truncated = _merge_truncated(truncated, fragment.truncated)
+                continue
+            index = UIInspector._add_element(snapshot, info, parent, depth)
+            stack.extend((child, index) for child in reversed(children))
+        return truncated
 
-            if not app_window:
-                return ["Error: Could not find main window."]
+    @staticmethod
+    def get_snapshot(
+        pid: int,
+        max_age: float = SNAPSHOT_MAX_AGE,
+        cancel_event: Optional[threading.Event] = None,
+        **limits: Any,
+    ) -> Optional[UISnapshot]:
+        """スナップショットを取得（直近の走査結果があれば再利用）
+
+        ツリーのテキスト表示・クラス名一覧・統計は同じスナップショットから求めるため、
+        続けて呼び出した場合でも走査は1回で済みます。キャンセルされた走査の結果は
+        再利用しません。
+
+        Args:
+            pid: プロセスID
+            max_age: 再利用するスナップショットの経過時間の上限（秒）。0の場合は常に走査
+            cancel_event: セットされると走査を中断するイベント
+            **limits: ``take_snapshot`` の ``max_depth`` / ``max_nodes`` / ``timeout`` / ``workers``
+
+        Returns:
+            UISnapshotインスタンス。ウィンドウが見つからない場合はNone
+        """
+        cached = UIInspector.cached_snapshot(pid, max_age)
+        if cached is not None:
+            return cached
+
+        snapshot = UIInspector.take_snapshot(pid, cancel_event=cancel_event, **limits)
+        if snapshot is not None:
+            UIInspector.store_snapshot(snapshot)
+        else:
+            UIInspector.clear_snapshots(pid)
+        return snapshot
+
+    @staticmethod
+    def cached_snapshot(pid: int, max_age: float = SNAPSHOT_MAX_AGE) -> Optional[UISnapshot]:
+        """保存したスナップショットを走査せずに取得
+
+        Args:
+            pid: プロセスID
+            max_age: 取得するスナップショットの経過時間の上限（秒）
 
-            # Recursive scan
-            def walk(control):
-                children = control.GetChildren()
-                for child in children:
-                    if child.ClassName:
-                        classes.add(child.ClassName)
-                    walk(child)
+        Returns:
+            ``max_age`` 秒以内のスナップショット。ない場合はNone
+        """
+        with UIInspector._snapshot_lock:
+            cached = UIInspector._snapshots.get(pid)
+        if cached is not None and time.time() - cached.taken_at <= max_age:
+            return cached
+        return None
+
+    @staticmethod
+    def store_snapshot(snapshot: UISnapshot) -> None:
+        """スナップショットを ``get_snapshot`` で再利用できるように保存
 
-            walk(app_window)
+        保存済みの結果は「Rescan Changes Only」の比較元にもなるため、途中までの結果で
+        完全な結果を置き換えません。
 
+        - キャンセルされたスナップショットは保存しません（保存済みの結果はそのまま）
+        - 打ち切られたスナップショットは、保存済みの結果が完全な場合は保存しません
+
+        Args:
+            snapshot: 保存するスナップショット
+        """
+        if snapshot.truncated == "cancelled":
+            return
+        with UIInspector._snapshot_lock:
+            current = UIInspector._snapshots.get(snapshot.pid)
+            if snapshot.truncated and current is not None and not current.truncated:
+                return
+            UIInspector._snapshots[snapshot.pid] = snapshot
+
+    @staticmethod
+    def clear_snapshots(pid: Optional[int] = None) -> None:
+        """保存したスナップショットを破棄
+
+        Args:
+            pid: 破棄するプロセスID。省略時はすべて
+        """
+        with UIInspector._snapshot_lock:
+            if pid is None:
+                UIInspector._snapshots.clear()
+            else:
+                UIInspector._snapshots.pop(pid, None)
+
+    @staticmethod
+    def get_unique_style_classes(pid: int, max_age: float = 0.0) -> List[str]:
+        """UIツリー全体をスキャンしてユニークなクラス名のリストを取得
+
+        QSSセレクタの特定に有用です。
+
+        Args:
+            pid: プロセスID
+            max_age: この秒数以内のスナップショットがあれば再利用
+
+        Returns:
+            見つかったクラス名のリスト
+        """
+        try:
+            snapshot = UIInspector.get_snapshot(pid, max_age)
+            if snapshot is None:
+                return ["Error: Could not find main window."]
         except Exception as e:
             return [f"Scan Error: {str(e)}"]
 
-        return sorted(list(classes))
+        return snapshot.unique_classes()
 
     @staticmethod
-    def get_extensive_ui_tree(pid: int) -> str:
+    def get_extensive_ui_tree(pid: int, max_age: float = 0.0) -> str:
         """指定されたPIDのアプリケーションのUIツリー全体をスキャン
 
         UI Automationを使用してコントロールツリー全体を走査し、
@@ -223,62 +556,22 @@ class UIInspector:
 
         Args:
             pid: プロセスID
+            max_age: この秒数以内のスナップショットがあれば再利用
 
         Returns:
             UIツリーのフォーマットされた文字列表現
         """
-        output = []
         try:
-            # Find the main window element for the PID
-            # We search for the first window element that matches the PID
-            root = auto.GetRootControl()
-            app_window = None
-
-            # Walk top level windows to find one belonging to our PID
-            for attempt in root.GetChildren():
-                if attempt.ProcessId == pid:
-                    app_window = attempt
-                    break
-
-            if not app_window:
-                # Try finding by process explicitly if top-level walk failed
-                # This is slower but maybe necessary
-                # Actually, let's just use a walker if simple loop fails
-                pass
-
-            if not app_window:
+            snapshot = UIInspector.get_snapshot(pid, max_age)
+            if snapshot is None:
                 return "Could not find a top-level window for this process via UI Automation."
-
-            output.append(
-                f"Root Window: {app_window.Name} (ClassName: {app_window.ClassName})"
-            )
-
-            # Recursive walker
-            def walk(control, depth):
-                children = control.GetChildren()
-                for child in children:
-                    indent = "  " * depth
-                    info = f"{indent}- {child.ControlTypeName} "
-                    if child.Name:
-                        info += f"Name='{child.Name}' "
-                    if child.AutomationId:
-                        info += f"ID='{child.AutomationId}' "
-                    if child.ClassName:
-                        info += f"Class='{child.ClassName}' "
-
-                    # Add rect info for more detail
-                    r = child.BoundingRectangle
-                    info += f"Rect=({r.left}, {r.top}, {r.right}, {r.bottom})"
-
-                    output.append(info)
-                    walk(child, depth + 1)
-
-            walk(app_window, 1)
-
         except Exception as e:
             return f"Error during UI Automation scan: {str(e)}"
 
-        return "\n".join(output)
+        text = snapshot.to_text()
+        if snapshot.truncated:
+            text += f"\n... (truncated: {snapshot.truncated}, {len(snapshot)} elements)"
+        return text
 
     @staticmethod
     def get_window_structure(target_pid: int) -> List[Dict[str, Any]]:
@@ -290,6 +583,9 @@ class UIInspector:
         Returns:
             ウィンドウ情報のリスト
         """
+        backend = get_backend()
+        win32gui = backend.win32gui
+        win32process = backend.win32process
         windows = []
 
         def enum_window_callback(hwnd, _):
@@ -306,6 +602,7 @@ class UIInspector:
 
     @staticmethod
     def _get_child_windows(parent_hwnd) -> List[Dict[str, Any]]:
+        win32gui = get_backend().win32gui
         children = []
 
         def enum_child_callback(hwnd, _):
@@ -345,6 +642,7 @@ class UIInspector:
 
     @staticmethod
     def _get_window_info(hwnd) -> Dict[str, Any]:
+        win32gui = get_backend().win32gui
         title = win32gui.GetWindowText(hwnd)
         class_name = win32gui.GetClassName(hwnd)
         rect = win32gui.GetWindowRect(hwnd)
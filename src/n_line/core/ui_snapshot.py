@@ -0,0 +1,419 @@
+"""UIスナップショットモジュール
+
+UIツリーを1回の走査で記録し、テキスト表示・クラス名一覧・検索などを
+記録済みのデータから求めるためのモジュールです。
+
+要素は走査順（行きがけ順）に番号付けされ、親の番号・深さ・文字列の番号・
+矩形をそれぞれ ``array`` に格納します。クラス名・コントロール型・名前は
+文字列テーブルで共有するため、10万要素のツリーでも数MBで保持できます。
+"""
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+Rect = Tuple[int, int, int, int]
+
+
+class StringTable:
+    """文字列を番号で共有するテーブル（番号0は空文字列）"""
+
+    def __init__(self) -> None:
+        self._strings: List[str] = [""]
+        self._index: Dict[str, int] = {"": 0}
+
+    def intern(self, value: Optional[str]) -> int:
+        """文字列を登録して番号を取得
+
+        Args:
+            value: 登録する文字列（Noneは空文字列として扱う）
+
+        Returns:
+            文字列の番号
+        """
+        if not value:
+            return 0
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def lookup(self, value: str) -> Optional[int]:
+        """登録済みの文字列の番号を取得（未登録の場合はNone）"""
+        return self._index.get(value)
+
+    def __getitem__(self, index: int) -> str:
+        return self._strings[index]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._strings)
+
+    @property
+    def nbytes(self) -> int:
+        """文字列と索引が使用するおおよそのメモリ量（バイト）"""
+        size = sys.getsizeof(self._strings) + sys.getsizeof(self._index)
+        return size + sum(sys.getsizeof(s) for s in self._strings)
+
+
+class UISnapshot:
+    """UIツリーのコンパクトなスナップショット
+
+    番号0がルート要素（アプリケーションのトップレベルウィンドウ）です。
+    要素は行きがけ順に追加する必要があり、各要素の子孫は
+    その要素の直後に連続して並びます。
+    """
+
+    def __init__(self, pid: int, taken_at: float = 0.0) -> None:
+        """スナップショットを初期化
+
+        Args:
+            pid: 対象のプロセスID
+            taken_at: 走査を開始した時刻（``time.time()``）
+        """
+        self.pid = pid
+        self.taken_at = taken_at
+        # 走査を打ち切った理由（max_depth / max_nodes / timeout / cancelled）
+        self.truncated: Optional[str] = None
+
+        self.parents = array("i")
+        self.depths = array("H")
+        self.control_types = array("H")
+        self.class_names = array("I")
+        self.names = array("I")
+        self.automation_ids = array("I")
+        self.rects = array("i")
+
+        self.types = StringTable()
+        self.classes = StringTable()
+        self.strings = StringTable()  # Name と AutomationId で共有
+
+        self._child_offsets: Optional[array] = None
+        self._child_list: Optional[array] = None
+
+    def add(
+        self,
+        parent: int,
+        depth: int,
+        control_type: str,
+        class_name: str,
+        name: str,
+        automation_id: str,
+        rect: Rect,
+    ) -> int:
+        """要素を追加
+
+        Args:
+            parent: 親要素の番号（ルートの場合は-1）
+            depth: 深さ（ルートは0）
+            control_type: ControlTypeName
+            class_name: ClassName
+            name: Name
+            automation_id: AutomationId
+            rect: (left, top, right, bottom)
+
+        Returns:
+            追加した要素の番号
+        """
+        index = len(self.parents)
+        self.parents.append(parent)
+        self.depths.append(depth)
+        self.control_types.append(self.types.intern(control_type))
+        self.class_names.append(self.classes.intern(class_name))
+        self.names.append(self.strings.intern(name))
+        self.automation_ids.append(self.strings.intern(automation_id))
+        self.rects.extend(rect)
+        self._child_offsets = None
+        return index
+
+    def extend(self, other: "UISnapshot", parent: int) -> int:
+        """別のスナップショットの要素を末尾に追加
+
+        並列走査で作成した部分木を1つのツリーにまとめるために使用します。
+        ``other`` の深さはそのまま保持し、ルート要素の親を ``parent`` に付け替えます。
+
+        Args:
+            other: 追加する部分木のスナップショット
+            parent: ``other`` のルート要素の親となる要素の番号
+
+        Returns:
+            追加した要素数
+        """
+        offset = len(self.parents)
+        for index in range(len(other)):
+            p = other.parents[index]
+            self.add(
+                p + offset if p >= 0 else parent,
+                other.depths[index],
+                other.control_type(index),
+                other.class_name(index),
+                other.name(index),
+                other.automation_id(index),
+                other.rect(index),
+            )
+        return len(other)
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    # --- 要素の参照 ---
+
+    def control_type(self, index: int) -> str:
+        return self.types[self.control_types[index]]
+
+    def class_name(self, index: int) -> str:
+        return self.classes[self.class_names[index]]
+
+    def name(self, index: int) -> str:
+        return self.strings[self.names[index]]
+
+    def automation_id(self, index: int) -> str:
+        return self.strings[self.automation_ids[index]]
+
+    def rect(self, index: int) -> Rect:
+        base = index * 4
+        r = self.rects
+        return (r[base], r[base + 1], r[base + 2], r[base + 3])
+
+    def node(self, index: int) -> Dict[str, Any]:
+        """要素の情報を辞書で取得
+
+        Args:
+            index: 要素の番号
+
+        Returns:
+            ``index``、``parent``、``depth``、``ControlType``、``ClassName``、
+            ``Name``、``AutomationId``、``Rect`` を含む辞書
+        """
+        return {
+            "index": index,
+            "parent": self.parents[index],
+            "depth": self.depths[index],
+            "ControlType": self.control_type(index),
+            "ClassName": self.class_name(index),
+            "Name": self.name(index),
+            "AutomationId": self.automation_id(index),
+            "Rect": self.rect(index),
+        }
+
+    def children(self, index: int) -> List[int]:
+        """子要素の番号を取得
+
+        初回呼び出し時に全要素分の子要素リスト（CSR形式）を作成します。
+
+        Args:
+            index: 親要素の番号
+
+        Returns:
+            子要素の番号のリスト（走査順）
+        """
+        if self._child_offsets is None:
+            self._build_children()
+        offsets, items = self._child_offsets, self._child_list
+        return list(items[offsets[index] : offsets[index + 1]])
+
+    def _build_children(self) -> None:
+        count = len(self.parents)
+        offsets = array("i", bytes(4 * (count + 1)))
+        for parent in self.parents:
+            if parent >= 0:
+                offsets[parent + 1] += 1
+        for i in range(count):
+            offsets[i + 1] += offsets[i]
+        items = array("i", bytes(4 * max(offsets[count], 0)))
+        fill = array("i", offsets[:count])
+        for index, parent in enumerate(self.parents):
+            if parent >= 0:
+                items[fill[parent]] = index
+                fill[parent] += 1
+        self._child_offsets = offsets
+        self._child_list = items
+
+    def ancestors(self, index: int) -> List[int]:
+        """祖先要素の番号を親から順に取得
+
+        Args:
+            index: 要素の番号
+
+        Returns:
+            親、祖父母…ルートの順の番号のリスト
+        """
+        result = []
+        parent = self.parents[index]
+        while parent >= 0:
+            result.append(parent)
+            parent = self.parents[parent]
+        return result
+
+    # --- 集計と検索 ---
+
+    def unique_classes(self) -> List[str]:
+        """ツリーに含まれるクラス名の一覧を取得
+
+        Returns:
+            空文字列を除いたクラス名のソート済みリスト
+        """
+        return sorted(s for s in self.classes if s)
+
+    def class_counts(self) -> Dict[str, int]:
+        """クラス名ごとの要素数を取得
+
+        Returns:
+            クラス名と要素数の辞書（空のクラス名を除く）
+        """
+        counts = [0] * len(self.classes)
+        for index in self.class_names:
+            counts[index] += 1
+        return {self.classes[i]: n for i, n in enumerate(counts) if i and n}
+
+    def class_stats(self) -> Dict[str, Dict[str, int]]:
+        """クラス名ごとの要素数と深さの範囲を取得（1回の走査で集計）
+
+        Returns:
+            クラス名をキー、``count``・``min_depth``・``max_depth`` を値とする辞書
+            （空のクラス名を除く）
+        """
+        size = len(self.classes)
+        counts = [0] * size
+        min_depths = [0xFFFF] * size
+        max_depths = [0] * size
+        for key, depth in zip(self.class_names, self.depths):
+            counts[key] += 1
+            if depth < min_depths[key]:
+                min_depths[key] = depth
+            if depth > max_depths[key]:
+                max_depths[key] = depth
+        return {
+            self.classes[i]: {
+                "count": counts[i],
+                "min_depth": min_depths[i],
+                "max_depth": max_depths[i],
+            }
+            for i in range(1, size)
+            if counts[i]
+        }
+
+    def depth_stats(self) -> Dict[str, Any]:
+        """ツリーの深さの統計を取得
+
+        Returns:
+            ``max``（最大の深さ）、``mean``（平均の深さ）、
+            ``histogram``（深さごとの要素数のリスト）を含む辞書
+        """
+        if not len(self):
+            return {"max": 0, "mean": 0.0, "histogram": []}
+        histogram = [0] * (max(self.depths) + 1)
+        for depth in self.depths:
+            histogram[depth] += 1
+        return {
+            "max": len(histogram) - 1,
+            "mean": sum(d * n for d, n in enumerate(histogram)) / len(self),
+            "histogram": histogram,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """要素数・クラス名ごとの統計・深さの統計をまとめて取得
+
+        Returns:
+            ``pid``、``taken_at``、``truncated``、``nodes``、``nbytes``、
+            ``classes``（``class_stats()``）、``depth``（``depth_stats()``）を含む辞書
+        """
+        return {
+            "pid": self.pid,
+            "taken_at": self.taken_at,
+            "truncated": self.truncated,
+            "nodes": len(self),
+            "nbytes": self.nbytes,
+            "classes": self.class_stats(),
+            "depth": self.depth_stats(),
+        }
+
+    def find(
+        self,
+        class_name: Optional[str] = None,
+        control_type: Optional[str] = None,
+        name: Optional[str] = None,
+        automation_id: Optional[str] = None,
+    ) -> List[int]:
+        """条件に一致する要素を検索
+
+        文字列は番号に変換してから比較するため、要素ごとの文字列比較は発生しません。
+
+        Args:
+            class_name: ClassName
+            control_type: ControlTypeName
+            name: Name
+            automation_id: AutomationId
+
+        Returns:
+            すべての条件に一致する要素の番号のリスト
+        """
+        conditions = []
+        for table, column, value in (
+            (self.classes, self.class_names, class_name),
+            (self.types, self.control_types, control_type),
+            (self.strings, self.names, name),
+            (self.strings, self.automation_ids, automation_id),
+        ):
+            if value is None:
+                continue
+            key = table.lookup(value)
+            if key is None:
+                return []
+            conditions.append((column, key))
+        if not conditions:
+            return list(range(len(self)))
+
+        column, key = conditions[0]
+        matches = [i for i, v in enumerate(column) if v == key]
+        for column, key in conditions[1:]:
+            matches = [i for i in matches if column[i] == key]
+        return matches
+
+    # --- 出力 ---
+
+    def format_node(self, index: int) -> str:
+        """要素を1行のテキストに変換（ルート以外）"""
+        line = f"{'  ' * self.depths[index]}- {self.control_type(index)} "
+        name = self.name(index)
+        if name:
+            line += f"Name='{name}' "
+        automation_id = self.automation_id(index)
+        if automation_id:
+            line += f"ID='{automation_id}' "
+        class_name = self.class_name(index)
+        if class_name:
+            line += f"Class='{class_name}' "
+        left, top, right, bottom = self.rect(index)
+        return line + f"Rect=({left}, {top}, {right}, {bottom})"
+
+    def format_line(self, index: int) -> str:
+        """要素を ``to_text()`` の1行に変換（ルートは見出し行）"""
+        if index == 0:
+            return f"Root Window: {self.name(0)} (ClassName: {self.class_name(0)})"
+        return self.format_node(index)
+
+    def to_text(self) -> str:
+        """ツリー全体をインデント付きのテキストに変換
+
+        Returns:
+            ``UIInspector.get_extensive_ui_tree`` と同じ形式の文字列
+        """
+        return "\n".join(self.format_line(i) for i in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        """スナップショットが使用するおおよそのメモリ量（バイト）"""
+        columns = (
+            self.parents,
+            self.depths,
+            self.control_types,
+            self.class_names,
+            self.names,
+            self.automation_ids,
+            self.rects,
+        )
+        size = sum(c.buffer_info()[1] * c.itemsize for c in columns)
+        return size + self.types.nbytes + self.classes.nbytes + self.strings.nbytes
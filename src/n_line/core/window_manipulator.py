@@ -1,13 +1,11 @@
 """ウィンドウ操作モジュール
 
 Win32 APIを使用してウィンドウの検索、操作（透明度、最前面表示、タイトル変更など）
-を行うモジュールです。
+を行うモジュールです。Win32 APIへのアクセスは ``backend.get_backend()`` を経由します。
 """
-from typing import Optional
+from typing import Tuple
 
-import win32con
-import win32gui
-import win32process
+from .backend import get_backend
 
 
 class WindowManipulator:
@@ -18,7 +16,7 @@ class WindowManipulator:
     """
 
     @staticmethod
-    def find_process_window(pid: int) -> int:
+    def find_process_window(pid: int, visible_only: bool = True) -> int:
         """指定されたPIDのメインウィンドウを検索
 
         PIDに属する可視ウィンドウを列挙し、最大のウィンドウを返します。
@@ -27,16 +25,20 @@ class WindowManipulator:
 
         Args:
             pid: プロセスID
+            visible_only: Falseの場合は表示前のウィンドウも対象にする
 
         Returns:
             見つかったウィンドウハンドル。見つからない場合は0
         """
+        backend = get_backend()
+        win32gui = backend.win32gui
+        win32process = backend.win32process
         found_hwnd = 0
         max_area = 0
 
         def enum_handler(hwnd, _):
             nonlocal found_hwnd, max_area
-            if not win32gui.IsWindowVisible(hwnd):
+            if visible_only and not win32gui.IsWindowVisible(hwnd):
                 return
 
             _, window_pid = win32process.GetWindowThreadProcessId(hwnd)
@@ -73,6 +75,7 @@ class WindowManipulator:
         Returns:
             見つかったウィンドウハンドル。見つからない場合は0
         """
+        win32gui = get_backend().win32gui
         found_hwnd = 0
 
         def enum_handler(hwnd, _):
@@ -100,6 +103,32 @@ class WindowManipulator:
         win32gui.EnumWindows(enum_handler, None)
         return found_hwnd
 
+    @staticmethod
+    def is_window_visible(hwnd: int) -> bool:
+        """ウィンドウが表示されているかどうかを確認
+
+        Args:
+            hwnd: ウィンドウハンドル
+
+        Returns:
+            表示されている場合はTrue
+        """
+        win32gui = get_backend().win32gui
+        return bool(win32gui.IsWindow(hwnd) and win32gui.IsWindowVisible(hwnd))
+
+    @staticmethod
+    def get_window_rect(hwnd: int) -> Tuple[int, int, int, int]:
+        """ウィンドウの位置とサイズを取得
+
+        Args:
+            hwnd: ウィンドウハンドル
+
+        Returns:
+            (left, top, right, bottom) のスクリーン座標
+        """
+        win32gui = get_backend().win32gui
+        return tuple(win32gui.GetWindowRect(hwnd))
+
     @staticmethod
     def set_always_on_top(hwnd: int, enable: bool) -> None:
         """ウィンドウを常に最前面に表示する設定を変更
@@ -108,6 +137,9 @@ class WindowManipulator:
             hwnd: ウィンドウハンドル
             enable: Trueの場合は最前面に、Falseの場合は通常表示に
         """
+        backend = get_backend()
+        win32gui = backend.win32gui
+        win32con = backend.win32con
         hwnd_insert_after = (
             win32con.HWND_TOPMOST if enable else win32con.HWND_NOTOPMOST
         )
@@ -129,6 +161,9 @@ class WindowManipulator:
             hwnd: ウィンドウハンドル
             alpha: 透明度（0=完全に透明、255=完全不透明）
         """
+        backend = get_backend()
+        win32gui = backend.win32gui
+        win32con = backend.win32con
         # WS_EX_LAYEREDスタイルが設定されていることを確認
         ex_style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
         if not (ex_style & win32con.WS_EX_LAYERED):
@@ -147,6 +182,7 @@ class WindowManipulator:
             width: 新しい幅
             height: 新しい高さ
         """
+        win32gui = get_backend().win32gui
         rect = win32gui.GetWindowRect(hwnd)
         x = rect[0]
         y = rect[1]
@@ -160,4 +196,5 @@ class WindowManipulator:
             hwnd: ウィンドウハンドル
             text: 新しいタイトルテキスト
         """
+        win32gui = get_backend().win32gui
         win32gui.SetWindowText(hwnd, text)
@@ -4,17 +4,22 @@ N-LINEのメインウィンドウを提供するモジュールです。
 LINEプロセスの起動・終了、キャッシュクリア、デバッグツールの起動などの
 基本機能を提供します。
 """
+import asyncio
 import os
-import time
-from threading import Thread
-from typing import Optional
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
 
 import customtkinter
 
 from n_line import __version__
+from n_line.core import startup_profiler
+from n_line.core.aio import AsyncLineManager
+from n_line.core.cache_cleaner import format_bytes
 from n_line.core.line_manager import LineManager
-from n_line.core.updater import Updater, UpdateDialog
-from n_line.gui.debug_window import DebugWindow
+from n_line.core.process_watcher import ProcessWatcher
+from n_line.core.single_instance import InstanceServer
+from n_line.gui.async_bridge import AsyncBridge
 
 customtkinter.set_appearance_mode("Dark")
 customtkinter.set_default_color_theme("blue")
@@ -27,8 +32,12 @@ class NLineApp(customtkinter.CTk):
     メインウィンドウです。
     """
 
-    def __init__(self) -> None:
-        """アプリケーションを初期化"""
+    def __init__(self, single_instance: bool = True) -> None:
+        """アプリケーションを初期化
+
+        Args:
+            single_instance: Trueの場合は他のN-LINEからのコマンドを受け付ける
+        """
         super().__init__()
 
         # Window Setup
@@ -114,6 +123,8 @@ class NLineApp(customtkinter.CTk):
             hover_color="#e67e22",
         )
         self.cache_btn.grid(row=2, column=1, padx=10, pady=(0, 20), sticky="ew")
+        self.cache_future: Optional[Future] = None
+        self.cache_cancel: Optional[threading.Event] = None
 
         # Debug Tools
         self.debug_btn = customtkinter.CTkButton(
@@ -155,11 +166,23 @@ class NLineApp(customtkinter.CTk):
         )
         self.update_btn.grid(row=0, column=1, padx=10, sticky="e")
 
-        # Start Monitor Thread
-        self.monitor_running = True
-        self.monitor_thread = Thread(target=self.monitor_status)
-        self.monitor_thread.daemon = True  # Kill when app closes
-        self.monitor_thread.start()
+        # Tk <-> asyncio bridge for blocking core operations
+        self.bridge = AsyncBridge.get()
+
+        # Start Process Watcher
+        self.watcher = ProcessWatcher()
+        self.watcher.subscribe(self.on_process_event)
+        self.watcher.start()
+
+        # Accept commands forwarded from later launches of N-LINE
+        self.instance_server: Optional[InstanceServer] = None
+        if single_instance:
+            server = InstanceServer(self.handle_remote_command)
+            if server.start():
+                self.instance_server = server
+
+        # Runs once the main loop has drawn the first frame
+        self.after(0, startup_profiler.mark, "first_frame")
 
     def log(self, message: str) -> None:
         """ログメッセージをテキストボックスに追加
@@ -172,47 +195,210 @@ class NLineApp(customtkinter.CTk):
         self.log_textbox.configure(state="disabled")
         self.log_textbox.see("end")
 
-    def monitor_status(self) -> None:
-        """LINEプロセスの状態を監視するスレッド関数
+    def on_process_event(self, event: str, pid: int) -> None:
+        """プロセス監視イベントの受信処理
+
+        監視スレッドから呼ばれるため、UI更新はメインスレッドに委譲します。
+
+        Args:
+            event: イベント種別（started / exited / ready）
+            pid: 対象プロセスID
+        """
+        self.after(0, self.update_status)
+
+    def handle_remote_command(self, command: str, args: List[str]) -> Dict[str, Any]:
+        """他のN-LINEから転送されたコマンドを処理
+
+        受付スレッドから呼ばれます。``status`` / ``launch`` / ``kill`` は
+        ``n_line.cli`` と同じ処理を同じ引数で完了まで実行し、単独で実行した場合と
+        同じ形式の結果を返します。UI操作はメインスレッドに委譲します。
+
+        Args:
+            command: コマンド名（status / launch / kill / show）
+            args: コマンドの引数
+
+        Returns:
+            応答の辞書
+        """
+        if command == "show":
+            self.after(0, self.bring_to_front)
+            return {"success": True, "message": "Window activated."}
+        if command not in ("status", "launch", "kill"):
+            return {"success": False, "message": f"Error: Unknown command: {command}"}
+
+        from n_line import cli
+
+        try:
+            parsed = cli.build_parser().parse_args([command] + args)
+        except SystemExit:
+            return {"success": False, "message": f"Error: Invalid arguments for {command}."}
+        result = cli.run(parsed)
+        if command != "status":
+            self.after(0, self._on_remote_command_done, command, result)
+        return result
+
+    def _on_remote_command_done(self, command: str, result: Dict[str, Any]) -> None:
+        """転送されたコマンドの結果をログに表示
 
-        2秒ごとにLINEプロセスの実行状態をチェックし、
-        ステータスラベルを更新します。
+        Args:
+            command: コマンド名
+            result: ``n_line.cli`` の結果
         """
-        while self.monitor_running:
-            try:
-                is_running = LineManager.is_line_running()
-                status_text = (
-                    "LINE Status: APP RUNNING" if is_running else "LINE Status: STOPPED"
-                )
-                color = "#2ecc71" if is_running else "#e74c3c"  # Green or Red
-
-                # Update UI thread-safely (mostly works in CTk, strictly should us after)
-                self.status_label.configure(text=status_text, text_color=color)
-            except Exception:
-                pass
-            time.sleep(2)
+        status = result.get("message") or ("Success" if result.get("success") else "Failed")
+        self.log(f"[{command}] {status}")
+        self.watcher.request_rescan()
+
+    def bring_to_front(self) -> None:
+        """ウィンドウを復元して前面に表示"""
+        self.deiconify()
+        self.lift()
+        self.focus_force()
+
+    def update_status(self) -> None:
+        """LINEプロセスの状態をステータスラベルに反映"""
+        is_running = self.watcher.is_running()
+        status_text = (
+            "LINE Status: APP RUNNING" if is_running else "LINE Status: STOPPED"
+        )
+        color = "#2ecc71" if is_running else "#e74c3c"  # Green or Red
+        self.status_label.configure(text=status_text, text_color=color)
+        startup_profiler.mark("first_status")
 
     def kill_line_action(self) -> None:
         """LINEプロセスを終了するアクション"""
         self.log("Attempting to kill LINE process...")
-        if LineManager.kill_line():
-            self.log("Success: LINE process terminated.")
+        self.bridge.submit(
+            self,
+            AsyncLineManager.shutdown_line(),
+            on_done=self._on_line_killed,
+            on_error=self._on_action_error,
+        )
+
+    def _on_line_killed(self, report: Optional[Dict[str, Any]]) -> None:
+        """LINEプロセス終了の完了処理
+
+        Args:
+            report: ShutdownEngineの結果。LINEが実行中でなかった場合はNone
+        """
+        if report is not None:
+            self.log(
+                f"Success: LINE process terminated "
+                f"({len(report['processes'])} processes, "
+                f"{report['timings']['total']:.2f}s)."
+            )
+            if report["remaining"]:
+                self.log(f"WARNING: Could not stop PIDs: {report['remaining']}")
         else:
             self.log("Info: LINE was not running or could not be killed.")
+        self.watcher.request_rescan()
 
     def launch_line_action(self) -> None:
         """LINEを起動するアクション"""
-        self.log(LineManager.launch_line())
+        self.bridge.submit(
+            self,
+            AsyncLineManager.launch_line(),
+            on_done=self._on_line_launched,
+            on_error=self._on_action_error,
+        )
+
+    def _on_line_launched(self, message: str) -> None:
+        """LINE起動の完了処理
+
+        Args:
+            message: 処理結果を示すメッセージ
+        """
+        self.log(message)
+        self.watcher.request_rescan()
+
+    def _on_action_error(self, error: BaseException) -> None:
+        """非同期アクションの例外を表示
+
+        Args:
+            error: 発生した例外
+        """
+        if isinstance(error, asyncio.TimeoutError):
+            self.log("Error: Operation timed out.")
+        else:
+            self.log(f"Error: {error}")
 
     def clear_cache_action(self) -> None:
-        """LINEキャッシュをクリアするアクション"""
+        """LINEキャッシュをクリアするアクション
+
+        削除はバックグラウンドで行い、実行中にもう一度押すと
+        キャンセルします。削除スレッドが実際に止まるまでボタンは無効のままです。
+        """
+        if self.cache_future is not None:
+            if self.cache_cancel is not None:
+                self.log("Cancelling cache clear...")
+                self.cache_cancel.set()
+                self.cache_btn.configure(text="Cancelling…", state="disabled")
+            return
+
         self.log("Clearing LINE cache...")
-        if LineManager.is_line_running():
+        self.cache_cancel = threading.Event()
+        self.cache_btn.configure(text="Cancel Clear")
+        self.cache_future = self.bridge.submit(
+            self,
+            self._clear_cache_if_stopped(),
+            on_done=self._on_cache_cleared,
+            on_error=self._on_cache_error,
+        )
+
+    async def _clear_cache_if_stopped(self) -> Optional[str]:
+        """LINEが停止していることを確認してからキャッシュをクリア
+
+        ウォッチャーの状態は最大 ``poll_interval`` 秒古く、初回スキャン前は
+        空のため、削除の直前にプロセステーブルを走査して確認します。
+
+        Returns:
+            処理結果を示すメッセージ。LINEが実行中の場合はNone
+        """
+        if await AsyncLineManager.is_line_running():
+            return None
+        return await AsyncLineManager.clear_cache(
+            progress_callback=lambda r: self.after(0, self._on_cache_progress, r),
+            cancel_event=self.cache_cancel,
+        )
+
+    def _on_cache_progress(self, progress: Dict[str, Any]) -> None:
+        """キャッシュクリアの進捗を表示
+
+        Args:
+            progress: 削除済みのファイル数とバイト数を含む辞書
+        """
+        self.status_label.configure(
+            text=(
+                f"Clearing cache: {progress['files']} files "
+                f"({format_bytes(progress['bytes'])})"
+            )
+        )
+
+    def _on_cache_cleared(self, message: Optional[str]) -> None:
+        """キャッシュクリアの完了処理
+
+        Args:
+            message: 処理結果を示すメッセージ。LINEが実行中だった場合はNone
+        """
+        self.cache_future = None
+        self.cache_cancel = None
+        self.cache_btn.configure(text="Clear Cache", state="normal")
+        if message is None:
             self.log("WARNING: Please close LINE before clearing cache.")
-            return
+            self.watcher.request_rescan()
+        else:
+            self.log(message)
+        self.update_status()
 
-        result = LineManager.clear_cache()
-        self.log(result)
+    def _on_cache_error(self, error: BaseException) -> None:
+        """キャッシュクリアの例外を表示し、ボタンを元に戻す
+
+        Args:
+            error: 発生した例外
+        """
+        self.cache_future = None
+        self.cache_cancel = None
+        self.cache_btn.configure(text="Clear Cache", state="normal")
+        self._on_action_error(error)
 
     def open_folder_action(self) -> None:
         """LINEインストールフォルダを開くアクション"""
@@ -236,11 +422,15 @@ class NLineApp(customtkinter.CTk):
         ):
             self.debug_window.focus()
         else:
+            from n_line.gui.debug_window import DebugWindow
+
             self.debug_window = DebugWindow(self)
             self.debug_window.focus()
 
     def check_for_updates(self) -> None:
         """アップデートを確認"""
+        from n_line.core.updater import UpdateDialog, Updater
+
         updater = Updater(__version__)
         if not hasattr(self, "update_dialog") or not self.update_dialog.winfo_exists():
             self.update_dialog = UpdateDialog(self, updater)
@@ -251,7 +441,9 @@ class NLineApp(customtkinter.CTk):
 
         監視スレッドを停止してからウィンドウを破棄します。
         """
-        self.monitor_running = False
+        self.watcher.stop()
+        if self.instance_server:
+            self.instance_server.close()
         self.destroy()
 
 
@@ -0,0 +1,93 @@
+"""Tk⇔asyncioブリッジモジュール
+
+専用スレッドで動作するasyncioイベントループにコルーチンを投入し、
+結果をTkのメインスレッドで ``after()`` を使ってコールバックする
+モジュールです。
+"""
+import asyncio
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, Coroutine, Optional
+
+
+class AsyncBridge:
+    """Tkとasyncioイベントループを仲介するクラス
+
+    イベントループはアプリケーション全体で1つを共有します。
+    ``get()`` で取得してください。
+    """
+
+    _instance: Optional["AsyncBridge"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        """イベントループとそのスレッドを起動"""
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="AsyncBridge", daemon=True
+        )
+        self._thread.start()
+
+    @classmethod
+    def get(cls) -> "AsyncBridge":
+        """共有のブリッジを取得（初回呼び出し時に作成）
+
+        Returns:
+            AsyncBridgeインスタンス
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def submit(
+        self,
+        widget: Any,
+        coro: Coroutine[Any, Any, Any],
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> Future:
+        """コルーチンを投入し、完了時にTkスレッドでコールバック
+
+        Args:
+            widget: ``after()`` を呼び出すTkウィジェット
+            coro: 実行するコルーチン
+            on_done: 結果を受け取るコールバック
+            on_error: 例外を受け取るコールバック
+
+        Returns:
+            ``cancel()`` で中断できるFuture
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+        def _dispatch(f: Future) -> None:
+            try:
+                result = f.result()
+            except CancelledError:
+                return
+            except BaseException as e:
+                if on_error:
+                    self._call_in_tk(widget, on_error, e)
+                return
+            if on_done:
+                self._call_in_tk(widget, on_done, result)
+
+        future.add_done_callback(_dispatch)
+        return future
+
+    def close(self) -> None:
+        """イベントループを停止"""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(1.0)
+
+    @staticmethod
+    def _call_in_tk(widget: Any, callback: Callable[[Any], None], value: Any) -> None:
+        try:
+            if widget.winfo_exists():
+                widget.after(0, callback, value)
+        except Exception:
+            pass  # ウィジェットが既に破棄されている
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
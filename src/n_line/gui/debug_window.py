@@ -2,14 +2,20 @@
 
 各種デバッグツールをタブ形式で提供するウィンドウを提供するモジュールです。
 """
+import importlib
+from typing import Dict, List, Optional, Tuple
+
 import customtkinter
 
-from n_line.gui.tabs.automation_tab import AutomationTab
-from n_line.gui.tabs.files_tab import FilesTab
-from n_line.gui.tabs.inspector_tab import InspectorTab
-from n_line.gui.tabs.mods_tab import ModsTab
-from n_line.gui.tabs.process_tab import ProcessTab
-from n_line.gui.tabs.qss_tab import QSSTab
+# (タブ名, 属性名, モジュール, クラス名)
+TABS: List[Tuple[str, str, str, str]] = [
+    ("Process Info", "process_content", "n_line.gui.tabs.process_tab", "ProcessTab"),
+    ("File Structure", "files_content", "n_line.gui.tabs.files_tab", "FilesTab"),
+    ("UI Inspector", "inspector_content", "n_line.gui.tabs.inspector_tab", "InspectorTab"),
+    ("Window Mods", "mods_content", "n_line.gui.tabs.mods_tab", "ModsTab"),
+    ("Styles (QSS)", "qss_content", "n_line.gui.tabs.qss_tab", "QSSTab"),
+    ("Automation", "automation_content", "n_line.gui.tabs.automation_tab", "AutomationTab"),
+]
 
 
 class DebugWindow(customtkinter.CTkToplevel):
@@ -17,6 +23,8 @@ class DebugWindow(customtkinter.CTkToplevel):
 
     プロセス情報、ファイル構造、UI Inspector、ウィンドウ操作、
     QSS編集、自動化などのデバッグツールをタブ形式で提供します。
+
+    各タブのモジュール読み込みと構築は、タブが最初に選択されたときに行います。
     """
 
     def __init__(self, *args, **kwargs) -> None:
@@ -30,50 +38,54 @@ class DebugWindow(customtkinter.CTkToplevel):
         self.grid_rowconfigure(0, weight=1)
 
         # Tab View for Debug Categories
-        self.tab_view = customtkinter.CTkTabview(self)
+        self.tab_view = customtkinter.CTkTabview(self, command=self.on_tab_changed)
         self.tab_view.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
 
-        # Create Tabs
-        self.tab_view.add("Process Info")
-        self.tab_view.add("File Structure")
-        self.tab_view.add("UI Inspector")
-        self.tab_view.add("Window Mods")
-        self.tab_view.add("Styles (QSS)")
-        self.tab_view.add("Automation")
+        # Create empty tabs; content is built on first selection
+        self.contents: Dict[str, customtkinter.CTkFrame] = {}
+        for name, attr, _, _ in TABS:
+            self.tab_view.add(name)
+            setattr(self, attr, None)
 
-        # Initialize Tab Content classes
-        # Process Tab
-        self.process_content = ProcessTab(self.tab_view.tab("Process Info"))
-        self.process_content.pack(fill="both", expand=True)
+        # Build the initially selected tab once the window has been drawn
+        self.after_idle(self.on_tab_changed)
 
-        # Files Tab
-        self.files_content = FilesTab(self.tab_view.tab("File Structure"))
-        self.files_content.pack(fill="both", expand=True)
-
-        # UI Inspector Tab
-        self.inspector_content = InspectorTab(self.tab_view.tab("UI Inspector"))
-        self.inspector_content.pack(fill="both", expand=True)
+        # Bind close event to cleanup resources (like hotkeys)
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
-        # Mods Tab
-        self.mods_content = ModsTab(self.tab_view.tab("Window Mods"))
-        self.mods_content.pack(fill="both", expand=True)
+    def on_tab_changed(self) -> None:
+        """選択されたタブが未構築の場合は構築"""
+        self.ensure_tab(self.tab_view.get())
 
-        # QSS Tab
-        self.qss_content = QSSTab(self.tab_view.tab("Styles (QSS)"))
-        self.qss_content.pack(fill="both", expand=True)
+    def ensure_tab(self, name: str) -> Optional[customtkinter.CTkFrame]:
+        """タブの内容を取得（未構築の場合は構築）
 
-        # Automation Tab
-        self.automation_content = AutomationTab(self.tab_view.tab("Automation"))
-        self.automation_content.pack(fill="both", expand=True)
+        Args:
+            name: タブ名
 
-        # Bind close event to cleanup resources (like hotkeys)
-        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        Returns:
+            タブの内容。不明なタブ名の場合はNone
+        """
+        if name in self.contents:
+            return self.contents[name]
+
+        for tab_name, attr, module_name, class_name in TABS:
+            if tab_name != name:
+                continue
+            tab_class = getattr(importlib.import_module(module_name), class_name)
+            content = tab_class(self.tab_view.tab(name))
+            content.pack(fill="both", expand=True)
+            self.contents[name] = content
+            setattr(self, attr, content)
+            return content
+        return None
 
     def on_closing(self) -> None:
         """ウィンドウクローズ時の処理
 
         タブのリソースをクリーンアップしてからウィンドウを破棄します。
         """
-        if hasattr(self.inspector_content, "cleanup"):
-            self.inspector_content.cleanup()
+        for content in self.contents.values():
+            if hasattr(content, "cleanup"):
+                content.cleanup()
         self.destroy()
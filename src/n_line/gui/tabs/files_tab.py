@@ -2,15 +2,20 @@
 
 LINE関連のディレクトリとファイル構造を表示するタブを提供するモジュールです。
 """
+from typing import Any, Dict, List
+
 import customtkinter
 
-from n_line.core.debug_tools import DebugTools
+from n_line.core.aio import AsyncDebugTools
+from n_line.core.cache_cleaner import format_bytes
+from n_line.gui.async_bridge import AsyncBridge
 
 
 class FilesTab(customtkinter.CTkFrame):
     """Filesタブクラス
 
     LINE関連のディレクトリとファイルをスキャンして表示します。
+    スキャンはバックグラウンドで実行されます。
     """
 
     def __init__(self, master, **kwargs) -> None:
@@ -28,15 +33,83 @@ class FilesTab(customtkinter.CTkFrame):
         )
         self.scan_btn.grid(row=1, column=0, pady=(10, 5), padx=5, sticky="ew")
 
-        # Initial Load
+        self.usage_btn = customtkinter.CTkButton(
+            self,
+            text="Disk Usage (Changes Since Last Scan)",
+            command=self.scan_disk_usage,
+            fg_color="#34495e",
+            hover_color="#2c3e50",
+        )
+        self.usage_btn.grid(row=2, column=0, pady=(0, 5), padx=5, sticky="ew")
+
+        # Initial Load (runs in the background)
         self.scan_files()
 
     def scan_files(self) -> None:
-        """ディレクトリをスキャンしてファイル一覧を表示"""
+        """ディレクトリを非同期にスキャンしてファイル一覧を表示"""
+        self._begin("Scanning directories...")
+        AsyncBridge.get().submit(
+            self,
+            AsyncDebugTools.scan_line_directories(),
+            on_done=self._show_files,
+            on_error=self._show_error,
+        )
+
+    def scan_disk_usage(self) -> None:
+        """データディレクトリのディスク使用量と前回からの増加量を非同期に表示"""
+        self._begin("Scanning disk usage...")
+        AsyncBridge.get().submit(
+            self,
+            AsyncDebugTools.scan_disk_usage(),
+            on_done=self._show_disk_usage,
+            on_error=self._show_error,
+        )
+
+    def _begin(self, message: str) -> None:
+        """スキャン中の表示に切り替え
+
+        Args:
+            message: 表示するメッセージ
+        """
+        self.scan_btn.configure(state="disabled")
+        self.usage_btn.configure(state="disabled")
+        self._set_report(f"{message}\n")
+
+    def _set_report(self, report: str) -> None:
+        """テキストボックスの内容を置き換え
+
+        Args:
+            report: 表示する文字列
+        """
         self.files_textbox.configure(state="normal")
         self.files_textbox.delete("0.0", "end")
+        self.files_textbox.insert("0.0", report)
+        self.files_textbox.configure(state="disabled")
 
-        paths = DebugTools.scan_line_directories()
+    def _finish(self, report: str) -> None:
+        """スキャン結果を表示してボタンを有効化
+
+        Args:
+            report: 表示する文字列
+        """
+        self.scan_btn.configure(state="normal")
+        self.usage_btn.configure(state="normal")
+        self._set_report(report)
+
+    def _show_error(self, error: BaseException) -> None:
+        """スキャンエラーを表示
+
+        Args:
+            error: 発生した例外
+        """
+        self._finish(f"Error: {error}\n")
+
+    def _show_files(self, paths: Dict[str, List[str]]) -> None:
+        """ディレクトリのスキャン結果を表示
+
+        Args:
+            paths: DebugTools.scan_line_directories() の結果
+        """
         report = "--- Directory Scan ---\n\n"
 
         for name, files in paths.items():
@@ -45,5 +118,38 @@ class FilesTab(customtkinter.CTkFrame):
                 report += f"  - {f}\n"
             report += "\n"
 
-        self.files_textbox.insert("0.0", report)
-        self.files_textbox.configure(state="disabled")
+        self._finish(report)
+
+    def _show_disk_usage(self, result: Dict[str, Any]) -> None:
+        """ディスク使用量のスキャン結果を表示
+
+        Args:
+            result: DebugTools.scan_disk_usage() の結果
+        """
+        if "error" in result:
+            report = f"Error: {result['error']}\n"
+        else:
+            report = "--- Disk Usage ---\n\n"
+            report += f"Root: {result['root']}\n"
+            report += (
+                f"Total: {format_bytes(result['total_size'])} "
+                f"in {result['total_files']} files "
+                f"({format_bytes(result['total_delta'])} since last scan)\n"
+            )
+            report += (
+                f"Scanned {result['dirs_scanned']} dirs, "
+                f"reused {result['dirs_reused']} unchanged "
+                f"({result['elapsed']:.2f}s)\n"
+            )
+
+            report += "\n[Grew Since Last Scan]\n"
+            if not result["growth"]:
+                report += "  (no changes)\n"
+            for item in result["growth"]:
+                report += f"  {format_bytes(item['delta']):>10}  {item['path']}\n"
+
+            report += "\n[Largest Directories]\n"
+            for item in result["largest"]:
+                report += f"  {format_bytes(item['size']):>10}  {item['path']}\n"
+
+        self._finish(report)
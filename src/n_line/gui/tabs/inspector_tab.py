@@ -6,13 +6,23 @@ UI要素の検査と分析を行うタブを提供するモジュールです。
 """
 import datetime
 import threading
-from typing import Any, Dict, List
+import time
+from collections import deque
+from typing import Any, Callable, Coroutine, Deque, Dict, Iterable, List, Optional, Tuple
 
 import customtkinter
 import keyboard
 
+from n_line.core.aio import AsyncUIInspector, run_blocking
+from n_line.core.backend import get_backend
 from n_line.core.line_manager import LineManager
+from n_line.core.ui_diff import diff_snapshots
 from n_line.core.ui_inspector import UIInspector
+from n_line.core.ui_snapshot import UISnapshot
+from n_line.gui.async_bridge import AsyncBridge
+
+ScanResult = Tuple[int, str, Optional[UISnapshot], str]
+"""(PID, プロセス名, スナップショット, エラーメッセージ)"""
 
 
 class InspectorTab(customtkinter.CTkFrame):
@@ -21,6 +31,15 @@ class InspectorTab(customtkinter.CTkFrame):
     UI要素の検査と分析を行うタブです。
     """
 
+    STREAM_FRAME_MS = 33
+    """Deep Scanの結果をテキストボックスへ反映する間隔（ミリ秒、約30fps）"""
+
+    STREAM_CHUNK_LINES = 500
+    """走査スレッドが1つの文字列にまとめる最大行数"""
+
+    STREAM_CHUNKS_PER_FRAME = 8
+    """1回の反映で追加する文字列の最大数（1フレームあたり最大4000行）"""
+
     def __init__(self, master, **kwargs) -> None:
         """タブを初期化"""
         super().__init__(master, **kwargs)
@@ -60,6 +79,28 @@ class InspectorTab(customtkinter.CTkFrame):
             row=1, column=2, pady=10, padx=(10, 10), sticky="w"
         )
 
+        self.rescan_changes_btn = customtkinter.CTkButton(
+            self,
+            text="Rescan Changes Only",
+            command=self.rescan_changes,
+            fg_color="#16a085",
+            hover_color="#1abc9c",
+        )
+        self.rescan_changes_btn.grid(row=1, column=3, pady=10, padx=(0, 10), sticky="w")
+
+        self.cancel_btn = customtkinter.CTkButton(
+            self,
+            text="Cancel",
+            command=self.cancel_scan,
+            state="disabled",
+            fg_color="#7f8c8d",
+            hover_color="#95a5a6",
+            width=80,
+        )
+        self.cancel_btn.grid(row=1, column=4, pady=10, padx=(0, 10), sticky="w")
+        self._cancel_event: Optional[threading.Event] = None
+        self._scan_started = 0.0
+
         # --- Point-to-Inspect Features ---
         self.inspector_frame = customtkinter.CTkFrame(self)
         self.inspector_frame.grid(
@@ -148,7 +189,7 @@ class InspectorTab(customtkinter.CTkFrame):
 
         カーソル位置の要素を取得し、詳細情報を表示します。
         """
-        import uiautomation as auto
+        auto = get_backend().uia
 
         try:
             # Need to initialize COM for this thread
@@ -211,65 +252,322 @@ class InspectorTab(customtkinter.CTkFrame):
     def inspect_deep_ui(self) -> None:
         """UI Automationを使用した深いスキャンを実行
 
-        内部コントロールを検索するため、時間がかかります。
+        走査はバックグラウンドスレッドで行い、見つかった要素から順に
+        ``STREAM_FRAME_MS`` ごとにまとめてテキストボックスへ追加します。
+        Cancelボタンで中断でき、それまでに表示した結果はそのまま残ります。
         """
-        self.ui_textbox.configure(state="normal")
-        self.ui_textbox.delete("0.0", "end")
-        self.ui_textbox.insert("end", "Performing Deep Scan (SLOW)... wait...\n")
-        self.update()
-
+        self._set_text("Performing Deep Scan...\n")
         procs = LineManager.get_line_processes()
         if not procs:
-            self.ui_textbox.insert("end", "Error: LINE process not running.\n")
-            self.ui_textbox.configure(state="disabled")
+            self._set_text("Error: LINE process not running.\n")
             return
 
-        report = ""
-        for proc in procs:
-            pid = proc.pid
-            report += f"\n--- Deep Scan for PID: {pid} ({proc.name()}) ---\n"
-            tree = UIInspector.get_extensive_ui_tree(pid)
-            report += tree + "\n"
+        self._cancel_event = threading.Event()
+        self._set_scanning(True)
+        pending: Deque[Optional[str]] = deque()
+        threading.Thread(
+            target=self._stream_scan,
+            args=([(p.pid, p.name()) for p in procs], self._cancel_event, pending),
+            daemon=True,
+        ).start()
+        self.after(self.STREAM_FRAME_MS, self._drain_stream, pending)
+
+    @staticmethod
+    def _stream_scan(
+        procs: List[Tuple[int, str]],
+        cancel_event: threading.Event,
+        pending: Deque[Optional[str]],
+    ) -> None:
+        """各プロセスのUIツリーを走査し、表示する行をまとめて ``pending`` に追加
+
+        バックグラウンドスレッドで実行します。``STREAM_CHUNK_LINES`` 行ごと、または
+        前回の追加から ``STREAM_FRAME_MS`` 経過するごとに1つの文字列として追加し、
+        終了時に ``None`` を追加します。完了した走査結果は ``UIInspector`` に保存し、
+        Extract Style Classesで再利用します。
 
-        if not report.strip():
-            report = "No accessible UI elements found via UIA."
+        Args:
+            procs: (PID, プロセス名) のリスト
+            cancel_event: 走査を中断するイベント
+            pending: Tkスレッドへ渡す文字列のキュー
+        """
+        interval = InspectorTab.STREAM_FRAME_MS / 1000
+        started = time.time()
+        try:
+            with get_backend().uia.UIAutomationInitializerInThread(debug=False):
+                for pid, name in procs:
+                    if cancel_event.is_set():
+                        break
+                    pending.append(f"\n--- Deep Scan for PID: {pid} ({name}) ---\n")
+
+                    snapshot = UIInspector.cached_snapshot(pid)
+                    if snapshot is not None:
+                        indices: Iterable[int] = range(len(snapshot))
+                    else:
+                        snapshot = UISnapshot(pid, taken_at=time.time())
+                        indices = UIInspector.iter_snapshot(snapshot, cancel_event=cancel_event)
+
+                    lines: List[str] = []
+                    flushed = 0.0  # 最初の要素はすぐに表示する
+                    for index in indices:
+                        lines.append(snapshot.format_line(index))
+                        if (
+                            len(lines) >= InspectorTab.STREAM_CHUNK_LINES
+                            or time.monotonic() - flushed >= interval
+                        ):
+                            pending.append("\n".join(lines) + "\n")
+                            lines = []
+                            flushed = time.monotonic()
+                    if lines:
+                        pending.append("\n".join(lines) + "\n")
+
+                    if not len(snapshot):
+                        if not cancel_event.is_set():
+                            pending.append(
+                                "Could not find a top-level window for this process "
+                                "via UI Automation.\n"
+                            )
+                        continue
+                    UIInspector.store_snapshot(snapshot)
+                    depth = snapshot.depth_stats()
+                    pending.append(
+                        f"--- {len(snapshot)} elements, max depth {depth['max']}"
+                        f"{InspectorTab._snapshot_note(snapshot, started)} ---\n"
+                    )
+        except Exception as e:
+            pending.append(f"Error during UI Automation scan: {e}\n")
+        finally:
+            pending.append(None)
 
-        self.ui_textbox.insert("end", report)
-        self.ui_textbox.configure(state="disabled")
+    def _drain_stream(self, pending: Deque[Optional[str]]) -> None:
+        """走査スレッドが追加した行をテキストボックスへ反映（Tkスレッド）
+
+        1回あたり最大 ``STREAM_CHUNKS_PER_FRAME`` 個の文字列を1回の ``insert`` で追加し、
+        走査が続いていれば ``STREAM_FRAME_MS`` 後に再度呼び出します。
+
+        Args:
+            pending: 走査スレッドから渡される文字列のキュー
+        """
+        if not self.winfo_exists():
+            return
+
+        chunks = []
+        done = False
+        while pending and len(chunks) < self.STREAM_CHUNKS_PER_FRAME:
+            chunk = pending.popleft()
+            if chunk is None:
+                done = True
+                break
+            chunks.append(chunk)
+
+        if chunks:
+            self.ui_textbox.configure(state="normal")
+            self.ui_textbox.insert("end", "".join(chunks))
+            self.ui_textbox.configure(state="disabled")
+
+        if done:
+            self._set_scanning(False)
+        else:
+            self.after(self.STREAM_FRAME_MS, self._drain_stream, pending)
 
     def extract_style_classes(self) -> None:
         """LINE UIツリーをスキャンしてQSSスタイリング用のクラス名を抽出"""
-        self.ui_textbox.configure(state="normal")
-        self.ui_textbox.delete("0.0", "end")
-        self.ui_textbox.insert("end", "Scanning for potential QSS classes... wait...\n")
-        self.update()
+        self._start_scan("Scanning for potential QSS classes...", self._show_style_classes)
+
+    def rescan_changes(self) -> None:
+        """LINE UIツリーを再走査し、前回の走査結果からの変化のみを表示
 
+        前回のDeep Scan・Extract Style Classes・Rescan Changes Onlyの結果を比較元とし、
+        追加・削除・移動・プロパティが変化した要素を表示します。比較元がない場合は
+        今回の結果を比較元として保存します。
+        """
+        self._start_scan("Rescanning for changes...", self._show_changes, self._scan_changes)
+
+    def _start_scan(
+        self,
+        message: str,
+        on_done: Callable[[List[Any]], None],
+        scan: Optional[Callable[..., Coroutine[Any, Any, List[Any]]]] = None,
+    ) -> None:
+        """LINEプロセスのスナップショットをバックグラウンドで取得
+
+        Args:
+            message: 走査中に表示するメッセージ
+            on_done: 走査結果を受け取るコールバック
+            scan: (PID, プロセス名) のリストと中断イベントを受け取るコルーチン関数。
+                省略時は ``_scan_processes``
+        """
+        self._set_text(f"{message}\n")
         procs = LineManager.get_line_processes()
         if not procs:
-            self.ui_textbox.insert("end", "Error: LINE process not running.\n")
-            self.ui_textbox.configure(state="disabled")
+            self._set_text("Error: LINE process not running.\n")
             return
 
-        report = ""
-        all_classes = set()
+        self._cancel_event = threading.Event()
+        self._scan_started = time.time()
+        self._set_scanning(True)
+        scan = scan or self._scan_processes
+        AsyncBridge.get().submit(
+            self,
+            scan([(p.pid, p.name()) for p in procs], self._cancel_event),
+            on_done=on_done,
+            on_error=self._show_scan_error,
+        )
+
+    @staticmethod
+    async def _scan_processes(
+        procs: List[Tuple[int, str]], cancel_event: threading.Event
+    ) -> List[ScanResult]:
+        """各プロセスのスナップショットを取得（Deep Scanの走査結果があれば再利用）
+
+        Args:
+            procs: (PID, プロセス名) のリスト
+            cancel_event: 走査を中断するイベント
+
+        Returns:
+            (PID, プロセス名, スナップショット, エラーメッセージ) のリスト
+        """
+        results: List[ScanResult] = []
+        for pid, name in procs:
+            try:
+                snapshot = await AsyncUIInspector.get_snapshot(pid, cancel_event=cancel_event)
+            except Exception as e:
+                results.append((pid, name, None, f"Error during UI Automation scan: {e}"))
+                continue
+            if snapshot is None:
+                error = "Could not find a top-level window for this process via UI Automation."
+                results.append((pid, name, None, error))
+            else:
+                results.append((pid, name, snapshot, ""))
+        return results
+
+    @staticmethod
+    async def _scan_changes(
+        procs: List[Tuple[int, str]], cancel_event: threading.Event
+    ) -> List[Tuple[int, str, str, str]]:
+        """各プロセスを再走査し、保存済みのスナップショットとの差分を求める
+
+        打ち切られた走査の結果は、保存済みの完全なスナップショットを置き換えません
+        （``UIInspector.store_snapshot`` を参照）。
+
+        Args:
+            procs: (PID, プロセス名) のリスト
+            cancel_event: 走査を中断するイベント
+
+        Returns:
+            (PID, プロセス名, 表示するテキスト, 打ち切りの理由) のリスト
+        """
+        results = []
+        for pid, name in procs:
+            baseline = UIInspector.cached_snapshot(pid, max_age=float("inf"))
+            try:
+                snapshot = await AsyncUIInspector.get_snapshot(
+                    pid, max_age=0.0, cancel_event=cancel_event
+                )
+            except Exception as e:
+                results.append((pid, name, f"Error during UI Automation scan: {e}", ""))
+                continue
+
+            if snapshot is None:
+                text = "Could not find a top-level window for this process via UI Automation."
+            elif snapshot.truncated == "cancelled":
+                text = "Cancelled."
+            elif baseline is None:
+                text = (
+                    f"{'Partial baseline' if snapshot.truncated else 'Baseline'} captured: "
+                    f"{len(snapshot)} elements. "
+                    "Run again to show changes."
+                )
+            else:
+                diff = await run_blocking(diff_snapshots, baseline, snapshot)
+                text = diff.to_text()
+                if snapshot.truncated:
+                    # 完全な比較元は store_snapshot が置き換えない
+                    kept = UIInspector.cached_snapshot(pid, max_age=float("inf")) is baseline
+                    text = (
+                        "Elements outside the scanned range are reported as removed"
+                        + ("; the previous baseline is kept.\n" if kept else ".\n")
+                        + text
+                    )
+            truncated = snapshot.truncated if snapshot is not None else ""
+            results.append((pid, name, text, truncated or ""))
+        return results
+
+    def cancel_scan(self) -> None:
+        """実行中の走査を中断"""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self.cancel_btn.configure(state="disabled")
+
+    def _set_scanning(self, scanning: bool) -> None:
+        """走査中はスキャンボタンを無効化し、Cancelボタンを有効化"""
+        state = "disabled" if scanning else "normal"
+        self.inspect_deep_btn.configure(state=state)
+        self.extract_classes_btn.configure(state=state)
+        self.rescan_changes_btn.configure(state=state)
+        self.cancel_btn.configure(state="normal" if scanning else "disabled")
+
+    def _set_text(self, text: str) -> None:
+        """テキストボックスの内容を置き換え"""
+        self.ui_textbox.configure(state="normal")
+        self.ui_textbox.delete("0.0", "end")
+        self.ui_textbox.insert("end", text)
+        self.ui_textbox.configure(state="disabled")
 
-        for proc in procs:
-            pid = proc.pid
-            classes = UIInspector.get_unique_style_classes(pid)
-            for cls in classes:
-                all_classes.add(cls)
+    def _show_scan_error(self, error: BaseException) -> None:
+        """走査エラーを表示"""
+        self._set_scanning(False)
+        self._set_text(f"Error: {error}\n")
+
+    def _show_changes(self, results: List[Tuple[int, str, str, str]]) -> None:
+        """Rescan Changes Onlyの結果を表示（打ち切られた走査は見出しに表示）"""
+        self._set_scanning(False)
+        report = ""
+        for pid, name, text, truncated in results:
+            note = f" [PARTIAL: {truncated}]" if truncated and truncated != "cancelled" else ""
+            report += f"\n--- Changes for PID: {pid} ({name}){note} ---\n{text}\n"
+        self._set_text(report)
+
+    def _show_style_classes(self, results: List[ScanResult]) -> None:
+        """Extract Style Classesの結果を表示"""
+        self._set_scanning(False)
+        report = ""
+        all_classes: Dict[str, int] = {}
+        notes = []
+
+        for pid, _, snapshot, error in results:
+            if snapshot is None:
+                notes.append(f"PID {pid}: {error}")
+                continue
+            if snapshot.truncated:
+                notes.append(f"PID {pid}:{self._snapshot_note(snapshot, self._scan_started)}")
+            for cls, count in snapshot.class_counts().items():
+                all_classes[cls] = all_classes.get(cls, 0) + count
 
         if all_classes:
             report = "\n--- Found Potential QSS Selectors ---\n"
             report += "Note: Valid QSS selectors usually match C++ Class Names (e.g. LcWidget).\n\n"
-            for cls in sorted(list(all_classes)):
-                if cls:  # Skip empty
-                    report += f"{cls}\n"
+            for cls in sorted(all_classes):
+                report += f"{cls:<40} x{all_classes[cls]}\n"
         else:
-            report = "No classes found or scan failed."
+            report = "No classes found or scan failed.\n"
+        for note in notes:
+            report += note + "\n"
+        self._set_text(report)
 
-        self.ui_textbox.insert("end", report)
-        self.ui_textbox.configure(state="disabled")
+    @staticmethod
+    def _snapshot_note(snapshot: UISnapshot, started: float) -> str:
+        """打ち切り・再利用したスナップショットの注記を返す
+
+        Args:
+            snapshot: 表示するスナップショット
+            started: 走査を要求した時刻（これより前のスナップショットは再利用とみなす）
+        """
+        note = ""
+        if snapshot.truncated:
+            note += f" [PARTIAL: {snapshot.truncated}]"
+        if snapshot.taken_at < started:
+            note += f" (cached {time.time() - snapshot.taken_at:.1f}s ago)"
+        return note
 
     def _format_windows(
         self, windows: List[Dict[str, Any]], depth: int
@@ -299,8 +597,10 @@ class InspectorTab(customtkinter.CTkFrame):
     def cleanup(self) -> None:
         """リソースをクリーンアップ
 
-        ホットキーを削除します。
+        ホットキーを削除し、実行中の走査を中断します。
         """
+        if self._cancel_event is not None:
+            self._cancel_event.set()
         try:
             keyboard.remove_hotkey("ctrl+shift")
         except Exception:
@@ -166,17 +166,21 @@ class ModsTab(customtkinter.CTkFrame):
             )
 
             # Execute
-            success = LineManager.relaunch_with_params(arg_list)
+            result = LineManager.relaunch_line(arg_list)
 
-            if success:
+            if result["success"]:
                 self.status_mod_label.configure(
-                    text="Exploit Successful: Process Relaunched", text_color="green"
+                    text=(
+                        "Exploit Successful: Process Relaunched "
+                        f"({result['timings']['total']:.2f}s)"
+                    ),
+                    text_color="green",
                 )
                 # Reset state
                 self.target_hwnd = 0
             else:
                 self.status_mod_label.configure(
-                    text="Exploit Failed: Could not relaunch", text_color="red"
+                    text=f"Exploit Failed: {result['message']}", text_color="red"
                 )
         except Exception as e:
             self.status_mod_label.configure(text=f"Error: {e}", text_color="red")
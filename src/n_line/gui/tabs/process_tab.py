@@ -2,19 +2,28 @@
 
 LINEプロセスの詳細情報とシステム情報を表示するタブを提供するモジュールです。
 """
+import asyncio
 import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
 import customtkinter
 
+from n_line.core.aio import AsyncDebugTools
 from n_line.core.debug_tools import DebugTools
+from n_line.gui.async_bridge import AsyncBridge
+
+ProcessInfo = Tuple[List[Dict[str, Any]], Dict[str, str], Dict[int, Dict[str, Any]]]
 
 
 class ProcessTab(customtkinter.CTkFrame):
     """Processタブクラス
 
     LINEプロセスの詳細情報とシステム情報を表示します。
+    CPU使用率とメモリはリソースサンプラーの直近の記録から集計します。
     """
 
+    STATS_WINDOW = 60.0
+
     def __init__(self, master, **kwargs) -> None:
         """タブを初期化"""
         super().__init__(master, **kwargs)
@@ -32,16 +41,61 @@ class ProcessTab(customtkinter.CTkFrame):
         )
         self.refresh_btn.grid(row=1, column=0, pady=10)
 
+        # Start sampling so the first refresh already has CPU figures to show
+        DebugTools.get_resource_sampler()
+
         # Initial Load
         self.refresh_process_info()
 
     def refresh_process_info(self) -> None:
-        """プロセス情報を更新して表示"""
+        """プロセス情報を非同期に取得して表示"""
+        self.refresh_btn.configure(state="disabled", text="Refreshing...")
+        AsyncBridge.get().submit(
+            self,
+            self._collect_info(self.STATS_WINDOW),
+            on_done=self._show_process_info,
+            on_error=self._show_error,
+        )
+
+    @staticmethod
+    async def _collect_info(window: float) -> ProcessInfo:
+        """プロセス詳細・システム情報・リソース統計を並行して取得
+
+        Args:
+            window: リソース統計の集計期間（秒）
+
+        Returns:
+            (プロセス詳細のリスト, システム情報, PIDごとのリソース統計)
+        """
+        details, system_info, stats = await asyncio.gather(
+            AsyncDebugTools.get_line_process_details(),
+            AsyncDebugTools.get_system_info(),
+            AsyncDebugTools.get_resource_stats(window),
+        )
+        return details, system_info, stats
+
+    def _show_error(self, error: BaseException) -> None:
+        """取得エラーを表示
+
+        Args:
+            error: 発生した例外
+        """
+        self.refresh_btn.configure(state="normal", text="Refresh Process Info")
         self.process_textbox.configure(state="normal")
         self.process_textbox.delete("0.0", "end")
+        self.process_textbox.insert("0.0", f"Error: {error}\n")
+        self.process_textbox.configure(state="disabled")
 
-        details = DebugTools.get_line_process_details()
-        system_info = DebugTools.get_system_info()
+    def _show_process_info(self, info: ProcessInfo) -> None:
+        """取得したプロセス情報を表示
+
+        Args:
+            info: (プロセス詳細のリスト, システム情報, PIDごとのリソース統計)
+        """
+        details, system_info, stats = info
+        self.refresh_btn.configure(state="normal", text="Refresh Process Info")
+        self.process_textbox.configure(state="normal")
+        self.process_textbox.delete("0.0", "end")
 
         report = "--- System Info ---\n"
         for k, v in system_info.items():
@@ -57,8 +111,42 @@ class ProcessTab(customtkinter.CTkFrame):
                 report += (
                     f"  Memory: {proc.get('memory_info').rss / 1024 / 1024:.2f} MB\n"
                 )
-                report += f"  CPU: {proc.get('cpu_percent')}%\n"
+                pid_stats = stats.get(proc.get("pid"))
+                if pid_stats:
+                    report += self._format_stats(pid_stats)
+                else:
+                    report += "  CPU: (sampling...)\n"
                 report += f"  Cmdline: {proc.get('cmdline')}\n"
 
         self.process_textbox.insert("0.0", report)
         self.process_textbox.configure(state="disabled")
+
+    def _format_stats(self, stats: Dict[str, Any]) -> str:
+        """リソース統計を表示用の文字列に整形
+
+        Args:
+            stats: DebugTools.get_resource_stats() の1プロセス分
+
+        Returns:
+            整形済みの文字列
+        """
+        cpu = stats["cpu_percent"]
+        rss = stats["rss"]
+        latest = stats["latest"]
+        mb = 1024 * 1024
+        window = int(self.STATS_WINDOW)
+
+        def fmt(value: Optional[float], scale: float = 1, spec: str = ".0f") -> str:
+            # 取得できなかった値（None）は n/a と表示する
+            return "n/a" if value is None else format(value / scale, spec)
+
+        lines = [
+            f"  CPU ({window}s): mean {cpu['mean']:.1f}% / p95 {cpu['p95']:.1f}% "
+            f"/ max {cpu['max']:.1f}% ({cpu['count']} samples)",
+            f"  RSS ({window}s): min {rss['min'] / mb:.1f} / mean {rss['mean'] / mb:.1f} "
+            f"/ max {rss['max'] / mb:.1f} MB",
+            f"  Threads: {fmt(latest['num_threads'])} / Handles: {fmt(latest['handles'])}",
+            f"  I/O: read {fmt(latest['read_bytes'], mb, '.1f')} MB"
+            f" / write {fmt(latest['write_bytes'], mb, '.1f')} MB",
+        ]
+        return "\n".join(lines) + "\n"
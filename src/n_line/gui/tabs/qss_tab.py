@@ -9,7 +9,9 @@ from tkinter import filedialog
 
 import customtkinter
 
+from n_line.core.aio import run_blocking
 from n_line.core.line_manager import LineManager
+from n_line.gui.async_bridge import AsyncBridge
 
 
 class QSSTab(customtkinter.CTkFrame):
@@ -157,22 +159,47 @@ class QSSTab(customtkinter.CTkFrame):
             self.load_to_editor()
 
     def load_to_editor(self) -> None:
-        """ファイルをエディタに読み込む"""
+        """ファイルをバックグラウンドで読み込み、エディタに表示"""
         path = self.path_entry.get().strip()
         if not path or not os.path.exists(path):
             self.status_label.configure(text="File not found.", text_color="red")
             return
 
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-            self.editor_textbox.delete("0.0", "end")
-            self.editor_textbox.insert("0.0", content)
-            self.status_label.configure(
-                text=f"Loaded: {os.path.basename(path)}", text_color="green"
-            )
-        except Exception as e:
-            self.status_label.configure(text=f"Load Error: {str(e)}", text_color="red")
+        self.status_label.configure(text="Loading...", text_color="gray")
+        AsyncBridge.get().submit(
+            self,
+            run_blocking(self._read_file, path),
+            on_done=lambda content: self._show_content(path, content),
+            on_error=lambda e: self.status_label.configure(
+                text=f"Load Error: {str(e)}", text_color="red"
+            ),
+        )
+
+    @staticmethod
+    def _read_file(path: str) -> str:
+        """ファイルを読み込む（ワーカースレッドで実行）
+
+        Args:
+            path: ファイルパス
+
+        Returns:
+            ファイルの内容
+        """
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def _show_content(self, path: str, content: str) -> None:
+        """読み込んだ内容をエディタに表示
+
+        Args:
+            path: 読み込んだファイルのパス
+            content: ファイルの内容
+        """
+        self.editor_textbox.delete("0.0", "end")
+        self.editor_textbox.insert("0.0", content)
+        self.status_label.configure(
+            text=f"Loaded: {os.path.basename(path)}", text_color="green"
+        )
 
     def save_editor_content(self) -> None:
         """エディタの内容をファイルに保存"""
@@ -250,7 +277,8 @@ class QSSTab(customtkinter.CTkFrame):
         # Call manager
         self.status_label.configure(text="Relaunching...", text_color="blue")
         self.update()
-        result = LineManager.relaunch_with_params(final_args)
+        result = LineManager.relaunch_line(final_args)
         self.status_label.configure(
-            text=result, text_color="green" if "Success" in result else "red"
+            text=result["message"],
+            text_color="green" if result["success"] else "red",
         )
@@ -0,0 +1,8 @@
+"""pytest共通設定
+
+``src`` をインポートパスに追加し、インストールせずにテストを実行できるようにします。
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
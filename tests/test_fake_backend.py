@@ -0,0 +1,63 @@
+"""疑似バックエンド上でのCLIのテスト"""
+import json
+import os
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from n_line import cli
+from n_line.core.backend import FakeBackend, set_backend
+from n_line.core.leak_detector import current_line_args
+
+
+@pytest.fixture
+def backend(tmp_path: Any) -> Iterator[FakeBackend]:
+    backend = FakeBackend(root=str(tmp_path))
+    backend.add_line_app(nodes=50, args=["--lang=ja"])
+    set_backend(backend)
+    yield backend
+    set_backend(None)
+
+
+def run_cli(capsys: Any, argv: List[str]) -> Dict[str, Any]:
+    assert cli.main(argv) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_status_reports_install_path(backend: FakeBackend, capsys: Any) -> None:
+    result = run_cli(capsys, ["status"])
+
+    assert result["running"]
+    assert result["install_path"] == os.path.dirname(backend.line_exe)
+    assert backend.line_exe.startswith(backend.root)
+    # 解決結果は疑似環境のディレクトリに保存する
+    assert os.path.isfile(backend.install_cache_file)
+
+
+def test_proc_stats_samples_fake_process(backend: FakeBackend, capsys: Any) -> None:
+    proc = backend.processes.children_of(0)[0]
+    proc.handles = 321
+
+    result = run_cli(capsys, ["proc-stats", "--duration", "0.05", "--interval", "0.02"])
+
+    (entry,) = result["processes"]
+    assert entry["pid"] == proc.pid
+    assert entry["cmdline"] == [backend.line_exe, "--lang=ja"]
+    assert entry["latest"]["handles"] == 321
+    assert entry["latest"]["rss"] == proc.rss
+
+
+def test_relaunch_starts_new_process_with_args(backend: FakeBackend, capsys: Any) -> None:
+    (old,) = backend.processes.children_of(0)
+    assert current_line_args() == ["--lang=ja"]
+
+    result = run_cli(capsys, ["relaunch", "--args=--remote-debugging-port=9222"])
+
+    assert result["success"], result["message"]
+    assert not old.is_running()
+    (new,) = backend.processes.children_of(0)
+    assert new.pid != old.pid
+    assert new.cmdline() == [backend.line_exe, "--remote-debugging-port=9222"]
+    # 終了したプロセスのウィンドウは残らない
+    assert {w.pid for w in backend.windows.values()} == {new.pid}
+    assert run_cli(capsys, ["status"])["pids"] == [new.pid]
@@ -0,0 +1,138 @@
+"""ResourceSamplerのテスト"""
+import contextlib
+import os
+from collections import namedtuple
+from typing import Any, List, Optional
+
+import psutil
+
+from n_line.core.resource_sampler import ResourceSampler
+
+MemoryInfo = namedtuple("MemoryInfo", ["rss", "vms"])
+
+
+class StubProcess:
+    """サンプラーが使用する ``psutil.Process`` のAPIだけを持つプロセス"""
+
+    def __init__(
+        self, pid: int, create_time: float, rss: int = 100, handles: Optional[int] = 10
+    ) -> None:
+        self.pid = pid
+        self.info = {"pid": pid, "name": "LINE.exe", "create_time": create_time}
+        self.rss = rss
+        if handles is not None:
+            # ハンドル数を取得できない環境では属性自体が存在しない
+            self.num_handles = lambda: handles
+
+    def oneshot(self) -> Any:
+        return contextlib.nullcontext()
+
+    def name(self) -> str:
+        return "LINE.exe"
+
+    def cpu_percent(self, interval: Any = None) -> float:
+        return 1.0
+
+    def memory_info(self) -> MemoryInfo:
+        return MemoryInfo(self.rss, self.rss)
+
+    def num_threads(self) -> int:
+        return 4
+
+
+def make_sampler(procs: List[Any]) -> ResourceSampler:
+    return ResourceSampler(interval=0, capacity=16, process_provider=lambda: list(procs))
+
+
+def test_exited_pids_release_their_series() -> None:
+    procs: List[StubProcess] = []
+    sampler = make_sampler(procs)
+
+    # LINEの再起動を繰り返しても、保持する時系列は実行中のプロセス分だけ
+    for i in range(200):
+        procs[:] = [StubProcess(1000 + i, float(i))]
+        sampler.sample_once()
+        sampler.sample_once()
+        assert sampler.pids() == [1000 + i]
+        assert sampler.active_pids() == [1000 + i]
+    assert len(sampler._series) == 1
+
+    procs.clear()
+    sampler.sample_once()
+    assert sampler.pids() == []
+    assert sampler.active_pids() == []
+
+
+def test_reused_pid_starts_a_new_series() -> None:
+    first = StubProcess(42, 1.0, rss=100)
+    procs = [first]
+    sampler = make_sampler(procs)
+    sampler.sample_once()
+    sampler.sample_once()
+    sampler.sample_once()
+    assert len(sampler.get_series(42, "rss")) == 2
+
+    # 同じPIDで起動時刻が異なるプロセスは別のプロセスとして記録し直す
+    procs[:] = [StubProcess(42, 2.0, rss=500)]
+    sampler.sample_once()
+    assert sampler.pids() == []
+    sampler.sample_once()
+    assert list(sampler.get_series(42, "rss")) == [500.0]
+
+
+def test_process_object_is_kept_and_checked_against_create_time() -> None:
+    found = psutil.Process(os.getpid())
+    found.info = {"create_time": found.create_time()}
+    sampler = make_sampler([found])
+    sampler.sample_once()
+    own = sampler._procs[found.pid][1]
+    assert own is not found  # キャッシュ上のProcessとCPU使用率の基準値を共有しない
+    sampler.sample_once()
+    assert sampler._procs[found.pid][1] is own
+    assert sampler.pids() == [found.pid]
+
+    # 起動時刻が一致しない場合はPIDが再利用されたとみなし、サンプリングしない
+    stale = psutil.Process(os.getpid())
+    stale.info = {"create_time": found.create_time() - 1.0}
+    sampler = make_sampler([stale])
+    sampler.sample_once()
+    sampler.sample_once()
+    assert sampler.active_pids() == []
+    assert sampler.pids() == []
+
+
+def test_unavailable_metric_is_not_recorded_as_zero() -> None:
+    sampler = make_sampler([StubProcess(5, 1.0, handles=None)])
+    for _ in range(4):
+        sampler.sample_once()
+
+    latest = sampler.latest(5)
+    assert latest is not None
+    assert latest["handles"] is None
+    assert latest["rss"] == 100.0
+    assert sampler.stats(5, "handles")["count"] == 0
+    assert sampler.stats(5, "rss")["count"] == 3
+
+
+def test_samples_are_aligned_and_skip_missing_values() -> None:
+    proc = StubProcess(7, 1.0, rss=0)
+    sampler = make_sampler([proc])
+    recorded = []
+    for i in range(40):  # リングバッファ（容量16）が一周した後も対応を保つ
+        proc.rss = i
+        if i % 3 == 0:
+            proc.num_handles = lambda i=i: i
+        elif hasattr(proc, "num_handles"):
+            del proc.num_handles
+        sampler.sample_once()
+        if i and i % 3 == 0:
+            recorded.append(i)
+
+    times, values = sampler.get_samples(7, "handles", window=3600.0)
+    all_times, rss = sampler.get_samples(7, "rss", window=3600.0)
+
+    assert len(all_times) == len(rss) == 16
+    assert list(rss) == list(range(24, 40))
+    # ハンドル数を取得できたサンプルの時刻と値だけが残る
+    assert list(values) == [i for i in recorded if i >= 24]
+    assert list(times) == [t for t, r in zip(all_times, rss) if r in values]
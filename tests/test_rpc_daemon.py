@@ -0,0 +1,105 @@
+"""RPCデーモンのテスト"""
+import asyncio
+import os
+import stat
+import sys
+from typing import Any, Dict, Iterator
+
+import pytest
+
+from n_line.core import rpc_daemon
+from n_line.core.backend import set_backend
+
+
+@pytest.fixture
+def handlers(tmp_path: Any, monkeypatch: Any) -> Iterator[Dict[str, rpc_daemon.Handler]]:
+    monkeypatch.setenv("N_LINE_FAKE_ROOT", str(tmp_path))
+    yield rpc_daemon.fake_handlers()
+    set_backend(None)
+
+
+def call_with_token(daemon: rpc_daemon.RpcDaemon, token: Any, method: str) -> Any:
+    async def main() -> Any:
+        _, port = await daemon.start()
+        client = rpc_daemon.AsyncRpcClient(token=daemon.token)
+        await client.connect(port=port)
+        client.token = token
+        try:
+            return await client.call(method)
+        finally:
+            await client.close()
+            await daemon.close()
+
+    return asyncio.run(main())
+
+
+def test_requests_without_token_are_rejected(handlers: Dict[str, Any]) -> None:
+    assert rpc_daemon.RpcDaemon(handlers).token
+
+    for token in (None, "", "wrong", 123):
+        daemon = rpc_daemon.RpcDaemon(handlers, port=0)
+        with pytest.raises(rpc_daemon.RpcError, match="AuthError"):
+            call_with_token(daemon, token, "line.kill")
+    daemon = rpc_daemon.RpcDaemon(handlers, port=0)
+    assert call_with_token(daemon, daemon.token, "ping") == "pong"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+def test_token_file_is_user_only(tmp_path: Any) -> None:
+    path = str(tmp_path / "rpc_token")
+    with open(path, "w") as f:
+        f.write("old")
+    os.chmod(path, 0o644)
+
+    token = rpc_daemon.write_token_file(path)
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert rpc_daemon.read_token_file(path) == token != "old"
+
+
+def test_fake_handlers_match_core_handlers(handlers: Dict[str, Any]) -> None:
+    assert set(handlers) == set(rpc_daemon.core_handlers())
+
+    pid = handlers["line.status"]()["pids"][0]
+    summary = handlers["inspector.summary"](pid=pid)
+    assert summary["nodes"] == 200
+
+
+def call_method(daemon: rpc_daemon.RpcDaemon, method: str, **params: Any) -> Any:
+    async def main() -> Any:
+        _, port = await daemon.start()
+        client = rpc_daemon.AsyncRpcClient(token=daemon.token)
+        await client.connect(port=port)
+        try:
+            return await client.call(method, **params)
+        finally:
+            await client.close()
+            await daemon.close()
+
+    return asyncio.run(main())
+
+
+def error_type(method: str, **params: Any) -> str:
+    def lookup(key: str = "x") -> Any:
+        return {}[key]
+
+    def length(value: int = 3) -> int:
+        return len(value)  # type: ignore[arg-type]
+
+    daemon = rpc_daemon.RpcDaemon({"lookup": lookup, "length": length}, port=0)
+    with pytest.raises(rpc_daemon.RpcError) as info:
+        call_method(daemon, method, **params)
+    return info.value.error["type"]
+
+
+def test_unknown_method_is_method_not_found() -> None:
+    assert error_type("missing") == "MethodNotFound"
+
+
+def test_bad_params_are_invalid_params() -> None:
+    assert error_type("lookup", nope=1) == "InvalidParams"
+
+
+def test_handler_exceptions_keep_their_type() -> None:
+    assert error_type("lookup") == "KeyError"
+    assert error_type("length") == "TypeError"
@@ -0,0 +1,28 @@
+"""StartupProfilerのテスト"""
+import threading
+
+from n_line.core.startup_profiler import StartupProfiler
+
+
+def run_in_thread(target, *args) -> None:  # type: ignore[no-untyped-def]
+    thread = threading.Thread(target=target, args=args)
+    thread.start()
+    thread.join()
+
+
+def test_worker_thread_imports_do_not_corrupt_main_timeline() -> None:
+    profiler = StartupProfiler()
+
+    # メインスレッドとワーカースレッドのインポートが交互に開始・終了する
+    profiler._begin_import("main_outer")
+    profiler._begin_import("main_inner")
+    run_in_thread(profiler._begin_import, "worker")
+    profiler._end_import()
+    run_in_thread(profiler._end_import)
+    profiler._end_import()
+
+    records = {r["module"]: r for r in profiler.imports}
+    assert set(records) == {"main_outer", "main_inner"}
+    assert records["main_inner"]["depth"] == 1
+    assert records["main_outer"]["depth"] == 0
+    assert records["main_outer"]["cumulative_ms"] >= records["main_inner"]["cumulative_ms"]
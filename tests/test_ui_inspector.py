@@ -0,0 +1,48 @@
+"""UIInspectorのスナップショット保存のテスト"""
+import threading
+from typing import Any, Iterator
+
+import pytest
+
+from n_line.core.backend import FakeBackend, set_backend
+from n_line.core.ui_inspector import UIInspector
+
+
+@pytest.fixture
+def pid(tmp_path: Any) -> Iterator[int]:
+    backend = FakeBackend(root=str(tmp_path))
+    proc, _ = backend.add_line_app(nodes=300)
+    set_backend(backend)
+    UIInspector.clear_snapshots()
+    yield proc.pid
+    UIInspector.clear_snapshots()
+    set_backend(None)
+
+
+def test_truncated_scan_keeps_complete_baseline(pid: int) -> None:
+    baseline = UIInspector.get_snapshot(pid, max_age=0.0, max_nodes=None, workers=1)
+    assert baseline is not None and not baseline.truncated
+
+    partial = UIInspector.get_snapshot(pid, max_age=0.0, max_nodes=100, workers=1)
+
+    assert partial is not None and partial.truncated == "max_nodes"
+    assert UIInspector.cached_snapshot(pid, max_age=float("inf")) is baseline
+
+
+def test_cancelled_scan_keeps_baseline(pid: int) -> None:
+    baseline = UIInspector.get_snapshot(pid, max_age=0.0, max_nodes=None, workers=1)
+    cancel = threading.Event()
+    cancel.set()
+
+    cancelled = UIInspector.get_snapshot(pid, max_age=0.0, cancel_event=cancel, workers=1)
+
+    assert cancelled is not None and cancelled.truncated == "cancelled"
+    assert UIInspector.cached_snapshot(pid, max_age=float("inf")) is baseline
+
+
+def test_truncated_scan_replaces_partial_baseline(pid: int) -> None:
+    first = UIInspector.get_snapshot(pid, max_age=0.0, max_nodes=50, workers=1)
+    second = UIInspector.get_snapshot(pid, max_age=0.0, max_nodes=100, workers=1)
+
+    assert first is not None and first.truncated
+    assert UIInspector.cached_snapshot(pid, max_age=float("inf")) is second